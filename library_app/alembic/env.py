@@ -23,7 +23,7 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-from src.models import books, users, loans, categories
+from src.models import books, users, loans, categories, stats, tokens, versions
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
@@ -0,0 +1,31 @@
+"""Add book trending score
+
+Revision ID: 09a5ecfec1b7
+Revises: 268987756cd8
+Create Date: 2026-10-19 19:03:21.153549
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '09a5ecfec1b7'
+down_revision: Union[str, None] = '268987756cd8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('book', sa.Column('trending_score', sa.Float(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_book_trending_score'), 'book', ['trending_score'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('book') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_book_trending_score'))
+        batch_op.drop_column('trending_score')
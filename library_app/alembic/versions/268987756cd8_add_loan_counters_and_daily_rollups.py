@@ -0,0 +1,93 @@
+"""Add loan counters and daily rollups
+
+Revision ID: 268987756cd8
+Revises: fa9f1c5e1b21
+Create Date: 2026-10-19 19:01:56.255157
+
+"""
+from typing import Sequence, Union
+
+from collections import Counter
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '268987756cd8'
+down_revision: Union[str, None] = 'fa9f1c5e1b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('book', sa.Column('loan_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_book_loan_count'), 'book', ['loan_count'], unique=False)
+    op.add_column('user', sa.Column('loan_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_user_loan_count'), 'user', ['loan_count'], unique=False)
+
+    book_daily_loans = op.create_table('book_daily_loans',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('loan_count', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['book_id'], ['book.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'book_id', name='uq_book_daily_loans_day_book')
+    )
+    op.create_index('idx_book_daily_loans_book_id', 'book_daily_loans', ['book_id'], unique=False)
+    op.create_index(op.f('ix_book_daily_loans_id'), 'book_daily_loans', ['id'], unique=False)
+
+    user_daily_loans = op.create_table('user_daily_loans',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('loan_count', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'user_id', name='uq_user_daily_loans_day_user')
+    )
+    op.create_index('idx_user_daily_loans_user_id', 'user_daily_loans', ['user_id'], unique=False)
+    op.create_index(op.f('ix_user_daily_loans_id'), 'user_daily_loans', ['id'], unique=False)
+
+    # Initialiser les compteurs et les agrégats à partir de l'historique existant
+    op.execute('UPDATE book SET loan_count = (SELECT COUNT(*) FROM loan WHERE loan.book_id = book.id)')
+    op.execute('UPDATE "user" SET loan_count = (SELECT COUNT(*) FROM loan WHERE loan.user_id = "user".id)')
+
+    loan = sa.table('loan', sa.column('book_id'), sa.column('user_id'), sa.column('loan_date', sa.DateTime()))
+    rows = op.get_bind().execute(sa.select(loan.c.book_id, loan.c.user_id, loan.c.loan_date)).all()
+    by_book = Counter((loan_date.date(), book_id) for book_id, _, loan_date in rows)
+    by_user = Counter((loan_date.date(), user_id) for _, user_id, loan_date in rows)
+    now = datetime.utcnow()
+    if by_book:
+        op.bulk_insert(book_daily_loans, [
+            {"day": day, "book_id": book_id, "loan_count": count, "created_at": now, "updated_at": now}
+            for (day, book_id), count in by_book.items()
+        ])
+    if by_user:
+        op.bulk_insert(user_daily_loans, [
+            {"day": day, "user_id": user_id, "loan_count": count, "created_at": now, "updated_at": now}
+            for (day, user_id), count in by_user.items()
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_daily_loans_id'), table_name='user_daily_loans')
+    op.drop_index('idx_user_daily_loans_user_id', table_name='user_daily_loans')
+    op.drop_table('user_daily_loans')
+    op.drop_index(op.f('ix_book_daily_loans_id'), table_name='book_daily_loans')
+    op.drop_index('idx_book_daily_loans_book_id', table_name='book_daily_loans')
+    op.drop_table('book_daily_loans')
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_loan_count'))
+        batch_op.drop_column('loan_count')
+    with op.batch_alter_table('book') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_book_loan_count'))
+        batch_op.drop_column('loan_count')
@@ -0,0 +1,96 @@
+"""Add soft delete, loan archive and cascading foreign keys
+
+Revision ID: ab3b516cb260
+Revises: ffe96c09fe3c
+Create Date: 2026-10-19 19:57:44.697804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ab3b516cb260'
+down_revision: Union[str, None] = 'ffe96c09fe3c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Clés étrangères remplacées : (table, colonne, table référencée)
+FOREIGN_KEYS = [
+    ('loan', 'book_id', 'book'),
+    ('loan', 'user_id', 'user'),
+    ('book_category', 'book_id', 'book'),
+    ('book_category', 'category_id', 'category'),
+]
+
+# Nomme les clés étrangères anonymes de SQLite pour pouvoir les supprimer en mode batch
+NAMING_CONVENTION = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+
+def replace_foreign_keys(ondelete: Union[str, None]) -> None:
+    """
+    Recrée les clés étrangères de FOREIGN_KEYS avec la règle `ondelete`.
+    """
+    inspector = sa.inspect(op.get_bind())
+    for table in dict.fromkeys(table for table, _, _ in FOREIGN_KEYS):
+        names = {
+            tuple(fk['constrained_columns']): fk['name']
+            for fk in inspector.get_foreign_keys(table)
+        }
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            for fk_table, column, referred in FOREIGN_KEYS:
+                if fk_table != table:
+                    continue
+                name = "fk_%s_%s_%s" % (table, column, referred)
+                batch_op.drop_constraint(names.get((column,)) or name, type_='foreignkey')
+                batch_op.create_foreign_key(name, referred, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('book') as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_book_deleted_at'), ['deleted_at'], unique=False)
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_user_deleted_at'), ['deleted_at'], unique=False)
+
+    op.create_table('loan_archive',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('book_id', sa.Integer(), nullable=False),
+    sa.Column('loan_date', sa.DateTime(), nullable=False),
+    sa.Column('return_date', sa.DateTime(), nullable=True),
+    sa.Column('due_date', sa.DateTime(), nullable=False),
+    sa.Column('extended', sa.Boolean(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_loan_archive_book_id', 'loan_archive', ['book_id'], unique=False)
+    op.create_index('idx_loan_archive_user_id', 'loan_archive', ['user_id'], unique=False)
+    op.create_index(op.f('ix_loan_archive_id'), 'loan_archive', ['id'], unique=False)
+
+    # Suppression d'un livre ou d'un utilisateur : emprunts et catégories supprimés par la base
+    replace_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    replace_foreign_keys(None)
+
+    op.drop_index(op.f('ix_loan_archive_id'), table_name='loan_archive')
+    op.drop_index('idx_loan_archive_user_id', table_name='loan_archive')
+    op.drop_index('idx_loan_archive_book_id', table_name='loan_archive')
+    op.drop_table('loan_archive')
+
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_user_deleted_at'))
+        batch_op.drop_column('deleted_at')
+    with op.batch_alter_table('book') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_book_deleted_at'))
+        batch_op.drop_column('deleted_at')
@@ -0,0 +1,38 @@
+"""Add table versions
+
+Revision ID: abcc9ad1da25
+Revises: ab3b516cb260
+Create Date: 2026-10-19 20:15:13.009085
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'abcc9ad1da25'
+down_revision: Union[str, None] = 'ab3b516cb260'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('table_version',
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('table_name')
+    )
+    op.create_index(op.f('ix_table_version_id'), 'table_version', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_table_version_id'), table_name='table_version')
+    op.drop_table('table_version')
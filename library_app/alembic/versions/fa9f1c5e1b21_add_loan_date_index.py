@@ -0,0 +1,28 @@
+"""Add loan_date index
+
+Revision ID: fa9f1c5e1b21
+Revises: f3ab8e30b8af
+Create Date: 2026-10-19 18:59:56.129892
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fa9f1c5e1b21'
+down_revision: Union[str, None] = 'f3ab8e30b8af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_loan_loan_date', 'loan', ['loan_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_loan_loan_date', table_name='loan')
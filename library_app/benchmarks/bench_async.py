@@ -0,0 +1,66 @@
+"""
+Comportement sous forte concurrence des routes de consultation, sur la pile
+synchrone (threadpool + Session) ou asynchrone (ASYNC_ROUTES=1, AsyncSession).
+
+Pour chaque pile : débit et latences de /books/, /books/search/ et
+/stats/trending, puis la latence de / (route sans base) pendant la charge,
+qui montre si la boucle d'événements ou le threadpool sature.
+
+    python -m benchmarks.bench_async [clients] [requêtes_par_client]
+"""
+import sys
+import threading
+
+import httpx
+
+from .common import login, report, run_concurrently, running_server
+
+PROFILES = {
+    "synchrone (threadpool)": {"ASYNC_ROUTES": "0"},
+    "asynchrone (aiosqlite)": {"ASYNC_ROUTES": "1"},
+}
+
+ENDPOINTS = {
+    "/books/": {"limit": 20},
+    "/books/search/": {"query": "the", "limit": 20},
+    "/stats/trending": {},
+}
+
+
+def main(clients: int = 64, requests_per_client: int = 20) -> None:
+    for name, env in PROFILES.items():
+        with running_server(env) as api_url:
+            headers = {"Authorization": f"Bearer {login(api_url)}"}
+            root_url = api_url.rsplit("/api/", 1)[0] + "/"
+
+            for path, params in ENDPOINTS.items():
+                probe_latencies = []
+                stop = threading.Event()
+
+                def probe():
+                    with httpx.Client(timeout=60) as client:
+                        while not stop.is_set():
+                            probe_latencies.append(client.get(root_url).elapsed.total_seconds())
+
+                prober = threading.Thread(target=probe)
+                prober.start()
+
+                local = threading.local()
+
+                def fetch():
+                    if not hasattr(local, "client"):
+                        local.client = httpx.Client(timeout=60, headers=headers)
+                    return local.client.get(api_url + path, params=params).status_code
+
+                result = run_concurrently(fetch, clients, requests_per_client)
+                stop.set()
+                prober.join()
+
+                statuses = result["results"]
+                errors = len(statuses) - statuses.count(200)
+                report(f"{path}, {name}", result["latencies"], result["elapsed"], extra=f"erreurs: {errors}")
+                report("  / pendant la charge", probe_latencies, result["elapsed"])
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,112 @@
+"""
+Coût de la journalisation par requête : configuration historique (FileHandler
+synchrone configuré à l'import, logs SQL de SQLAlchemy au niveau INFO,
+hooks sur tous les moteurs) contre le pipeline actuel (file en mémoire,
+thread d'écriture, rotation, échantillonnage des logs SQL).
+
+Chaque configuration est mesurée dans un processus séparé, l'application
+étant appelée en processus via TestClient.
+
+    python -m benchmarks.bench_logging [requêtes]
+"""
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from .common import LIBRARY_DIR, prepare_database, report
+
+MODES = ("aucun log", "historique", "pipeline")
+
+
+def install_legacy_logging(log_file: str) -> None:
+    """
+    Reproduit l'ancienne configuration de src/utils/logging.py.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(), logging.FileHandler(log_file)],
+    )
+    logging.getLogger("library").setLevel(logging.WARNING)
+    logger = logging.getLogger('sqlalchemy.engine')
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start_time', []).append(time.time())
+        logger.debug("SQL: %s", statement)
+        logger.debug("Parameters: %s", parameters)
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        total = time.time() - conn.info['query_start_time'].pop(-1)
+        logger.debug("Total execution time: %.3f ms", total * 1000)
+
+
+def run_mode(mode: str, requests: int) -> None:
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from src.config import settings
+    from src.db.session import get_db
+    from src.main import app
+    from src.utils.logging import instrument_engine, setup_logging, shutdown_logging
+    from src.utils.security import create_access_token
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = prepare_database(os.path.join(tmp, "bench.db"))
+        settings.LOG_FILE = os.path.join(tmp, "library.log")
+        if mode == "historique":
+            install_legacy_logging(os.path.join(tmp, "sql.log"))
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        if mode == "pipeline":
+            instrument_engine(engine)
+            setup_logging()
+        if mode == "aucun log":
+            logging.disable(logging.CRITICAL)
+        SessionLocal = sessionmaker(bind=engine)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token(1)}"}
+
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(requests):
+            request_start = time.perf_counter()
+            client.get("/api/v1/books/", headers=headers)
+            latencies.append(time.perf_counter() - request_start)
+        elapsed = time.perf_counter() - start
+        shutdown_logging()
+        report(f"GET /books/, {mode}", latencies, elapsed)
+        engine.dispose()
+
+
+def main(requests: int = 2000) -> None:
+    for mode in MODES:
+        # La console est redirigée : seul le coût d'écriture est mesuré
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_logging", "--mode", mode, str(requests)],
+            cwd=LIBRARY_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        print(output.stdout.strip())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--mode":
+        run_mode(sys.argv[2], int(sys.argv[3]))
+    else:
+        main(*(int(arg) for arg in sys.argv[1:]))
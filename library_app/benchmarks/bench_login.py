@@ -0,0 +1,59 @@
+"""
+Débit des connexions sous charge concurrente, avec bcrypt exécuté dans le
+threadpool (PASSWORD_HASH_WORKERS=0) ou dans le pool de processus borné.
+
+Mesure aussi la latence de la consultation du catalogue pendant l'afflux de
+connexions, et le nombre de réponses 429.
+
+    python -m benchmarks.bench_login [clients] [connexions_par_client]
+"""
+import sys
+import threading
+
+import httpx
+
+from .common import login, report, run_concurrently, running_server
+
+PROFILES = {
+    "inline (threadpool)": {"PASSWORD_HASH_WORKERS": "0"},
+    "pool 2 processus, file 4": {"PASSWORD_HASH_WORKERS": "2", "PASSWORD_HASH_QUEUE_SIZE": "4"},
+}
+
+
+def main(clients: int = 16, logins_per_client: int = 5) -> None:
+    for name, env in PROFILES.items():
+        with running_server(env) as api_url:
+            token = login(api_url)
+            headers = {"Authorization": f"Bearer {token}"}
+            browse_latencies = []
+            stop = threading.Event()
+
+            def browse():
+                with httpx.Client(timeout=60) as client:
+                    while not stop.is_set():
+                        response = client.get(api_url + "/books/", headers=headers)
+                        browse_latencies.append(response.elapsed.total_seconds())
+
+            browser = threading.Thread(target=browse)
+            browser.start()
+
+            def attempt():
+                return httpx.post(
+                    api_url + "/auth/login",
+                    data={"username": "user@example.com", "password": "user123"},
+                    timeout=60,
+                ).status_code
+
+            result = run_concurrently(attempt, clients, logins_per_client)
+            stop.set()
+            browser.join()
+
+            statuses = result["results"]
+            accepted = [lat for lat, code in zip(result["latencies"], statuses) if code == 200]
+            report(f"login, {name}", accepted, result["elapsed"],
+                   extra=f"429: {statuses.count(429)}/{len(statuses)}")
+            report(f"  /books/ pendant l'afflux", browse_latencies, result["elapsed"])
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,90 @@
+"""
+Coût par appel des lectures fréquentes des repositories : ancienne requête
+legacy Query (reconstruite, réécrite par le filtre de suppression logique
+et dont la clé de cache est recalculée à chaque appel) contre la méthode
+actuelle (select() construit une fois, paramètres liés à l'exécution).
+
+Mesuré en processus sur une base SQLite en mémoire (données de init_db) :
+l'écart mesuré est celui de la construction et de la compilation des
+requêtes, pas des entrées/sorties.
+
+    python -m benchmarks.bench_repositories [répétitions]
+"""
+import sys
+from datetime import datetime
+
+from .common import timeit
+
+
+def main(repeat: int = 5000) -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from src.db.init_db import init_db
+    from src.models.base import Base
+    from src.models.books import Book
+    from src.models.loans import Loan
+    from src.models.users import User
+    from src.repositories.books import BookRepository
+    from src.repositories.loans import LoanRepository
+    from src.repositories.users import UserRepository
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    init_db(db)
+    books = BookRepository(Book, db)
+    users = UserRepository(User, db)
+    loans = LoanRepository(Loan, db)
+    book = db.query(Book).first()
+    user = db.query(User).first()
+    book_id, isbn, user_id, email = book.id, book.isbn, user.id, user.email
+
+    cases = {
+        "BaseRepository.get": (
+            lambda: db.query(Book).filter(Book.id == book_id).first(),
+            lambda: books.get(id=book_id),
+        ),
+        "BaseRepository.get_multi": (
+            lambda: db.query(Book).offset(0).limit(100).all(),
+            lambda: books.get_multi(skip=0, limit=100),
+        ),
+        "UserRepository.get_by_email": (
+            lambda: db.query(User).filter(User.email == email).first(),
+            lambda: users.get_by_email(email=email),
+        ),
+        "BookRepository.get_by_isbn": (
+            lambda: db.query(Book).filter(Book.isbn == isbn).first(),
+            lambda: books.get_by_isbn(isbn=isbn),
+        ),
+        "LoanRepository.get_active_loans": (
+            lambda: db.query(Loan).filter(Loan.return_date == None).all(),
+            loans.get_active_loans,
+        ),
+        "LoanRepository.get_overdue_loans": (
+            lambda: db.query(Loan).filter(Loan.return_date == None, Loan.due_date < datetime.utcnow()).all(),
+            loans.get_overdue_loans,
+        ),
+        "LoanRepository.get_loans_by_user": (
+            lambda: db.query(Loan).filter(Loan.user_id == user_id).all(),
+            lambda: loans.get_loans_by_user(user_id=user_id),
+        ),
+        "LoanRepository.get_loans_by_book": (
+            lambda: db.query(Loan).filter(Loan.book_id == book_id).all(),
+            lambda: loans.get_loans_by_book(book_id=book_id),
+        ),
+    }
+
+    print(f"{'µs par appel':<36} {'legacy Query':>12} {'actuel':>10} {'gain':>7}")
+    for name, (legacy, current) in cases.items():
+        before = timeit(legacy, repeat)
+        after = timeit(current, repeat)
+        print(f"  {name:<34} {before:12.1f} {after:10.1f} {before / after:6.1f}x")
+
+    db.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
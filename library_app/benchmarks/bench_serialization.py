@@ -0,0 +1,94 @@
+"""
+Temps de rendu d'une page de 100 livres : chemin par défaut (objets ORM
+validés en Page[Book] avec catégories, puis module json) contre la vue
+`summary` (lignes projetées en dictionnaires, sans validation) et les
+sérialiseurs rapides (orjson, pydantic-core).
+
+Mesuré en processus sur une base SQLite en mémoire : sérialisation seule
+(page déjà chargée), puis chargement et sérialisation.
+
+    python -m benchmarks.bench_serialization [répétitions]
+"""
+import json
+import sys
+
+from .common import timeit
+
+PAGE_SIZE = 100
+
+
+def json_dumps(content) -> bytes:
+    """
+    Rendu de starlette.responses.JSONResponse.
+    """
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def main(repeat: int = 500) -> None:
+    from pydantic_core import to_json
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import selectinload, sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from src.api.schemas.books import Book, BookSummary
+    from src.models.base import Base
+    from src.models.books import Book as BookModel
+    from src.models.categories import Category
+    from src.repositories.books import BookRepository
+    from src.utils.pagination import Page, PaginationParams, paginate, paginate_rows
+    from src.utils.responses import dumps, orjson
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    categories = [Category(name=f"Catégorie {n}") for n in range(3)]
+    db.add_all(categories)
+    db.commit()
+    BookRepository(BookModel, db).create_many([
+        {"title": f"Livre {n}", "author": f"Auteur {n % 10}", "isbn": f"{9780000000000 + n}",
+         "publication_year": 1950 + n % 70, "quantity": n % 5, "description": "Résumé " * 20}
+        for n in range(PAGE_SIZE)
+    ])
+    for book in db.query(BookModel):
+        book.categories = categories[:1 + book.id % 3]
+    db.commit()
+
+    params = PaginationParams(skip=0, limit=PAGE_SIZE)
+    full_page = Page[Book]
+
+    def load_full():
+        return paginate(db.query(BookModel).options(selectinload(BookModel.categories)), params, BookModel)
+
+    def validate_full(page):
+        # Ce que fait FastAPI avec response_model=Page[Book]
+        return full_page.model_validate(page, from_attributes=True).model_dump(mode="json")
+
+    page = load_full()
+    rows = paginate_rows(db, BookModel, BookSummary, params)
+    print(f"orjson : {'installé' if orjson is not None else 'absent (pydantic-core)'}")
+
+    print(f"Sérialisation d'une page de {PAGE_SIZE} livres (µs par page) :")
+    cases = {
+        "Page[Book] validée + json": lambda: json_dumps(validate_full(page)),
+        "Page[Book] validée + dumps": lambda: dumps(validate_full(page)),
+        "summary (dicts) + json": lambda: json_dumps(rows),
+        "summary (dicts) + pydantic-core": lambda: to_json(rows),
+        "summary (dicts) + dumps": lambda: dumps(rows),
+    }
+    for name, func in cases.items():
+        print(f"  {name:<38} {timeit(func, repeat):10.1f}")
+
+    print("Chargement et sérialisation (µs par page) :")
+    cases = {
+        "vue complète (défaut)": lambda: dumps(validate_full(load_full())),
+        "view=summary": lambda: dumps(paginate_rows(db, BookModel, BookSummary, params)),
+    }
+    for name, func in cases.items():
+        print(f"  {name:<38} {timeit(func, repeat):10.1f}")
+
+    db.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
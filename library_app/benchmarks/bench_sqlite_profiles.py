@@ -0,0 +1,63 @@
+"""
+Débit d'une charge mixte lectures/écritures selon le profil SQLite
+(SQLITE_PROFILE) : lectures du catalogue par des lecteurs concurrents
+pendant que des administrateurs modifient des livres.
+
+Compte aussi les erreurs (« database is locked » remonte en 500).
+
+    python -m benchmarks.bench_sqlite_profiles [lecteurs] [écrivains] [requêtes_par_client]
+"""
+import sys
+import threading
+
+import httpx
+
+from .common import login, report, run_concurrently, running_server
+
+PROFILES = ("default", "production", "durable")
+
+
+def main(readers: int = 8, writers: int = 4, requests_per_client: int = 50) -> None:
+    for profile in PROFILES:
+        with running_server({"SQLITE_PROFILE": profile, "PASSWORD_HASH_WORKERS": "0"}) as api_url:
+            headers = {"Authorization": f"Bearer {login(api_url)}"}
+            book_ids = [book["id"] for book in httpx.get(api_url + "/books/", headers=headers).json()["items"]]
+            counter = iter(range(10 ** 9))
+            lock = threading.Lock()
+
+            def read():
+                return httpx.get(api_url + "/books/?limit=20", headers=headers, timeout=60).status_code
+
+            def write():
+                with lock:
+                    n = next(counter)
+                return httpx.put(
+                    api_url + f"/books/{book_ids[n % len(book_ids)]}",
+                    json={"description": f"Révision {n}"},
+                    headers=headers,
+                    timeout=60,
+                ).status_code
+
+            results = {}
+
+            def run(name, task, clients):
+                results[name] = run_concurrently(task, clients, requests_per_client)
+
+            threads = [
+                threading.Thread(target=run, args=("lectures", read, readers)),
+                threading.Thread(target=run, args=("écritures", write, writers)),
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            for name, result in results.items():
+                statuses = result["results"]
+                errors = len([code for code in statuses if code >= 400])
+                report(f"{profile}, {name}", result["latencies"], result["elapsed"],
+                       extra=f"erreurs: {errors}/{len(statuses)}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
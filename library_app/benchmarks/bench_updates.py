@@ -0,0 +1,86 @@
+"""
+Latence d'une mise à jour par le repository : ancien chemin (liste des
+champs obtenue par jsonable_encoder sur l'objet ORM, relations comprises)
+contre le chemin actuel (carte des colonnes mise en cache, affectation des
+seules colonnes modifiées) et l'UPDATE ciblé sans chargement.
+
+Mesuré en processus sur une base SQLite en mémoire (données de init_db) :
+sans fsync au commit, l'écart mesuré est celui du code Python et SQL.
+
+    python -m benchmarks.bench_updates [répétitions]
+"""
+import sys
+from itertools import count
+
+from .common import timeit
+
+
+def legacy_update(db, db_obj, obj_in):
+    """
+    Reproduit l'ancien BaseRepository.update.
+    """
+    from fastapi.encoders import jsonable_encoder
+
+    obj_data = jsonable_encoder(db_obj)
+    update_data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+    for field in obj_data:
+        if field in update_data:
+            setattr(db_obj, field, update_data[field])
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+
+def main(repeat: int = 2000) -> None:
+    from fastapi.encoders import jsonable_encoder
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from src.api.schemas.books import BookUpdate
+    from src.db.init_db import init_db
+    from src.models.base import Base
+    from src.models.books import Book
+    from src.repositories.base import column_values
+    from src.repositories.books import BookRepository
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    init_db(db)
+    repository = BookRepository(Book, db)
+    book = db.query(Book).first()
+    book.categories  # relation chargée, comme après un accès dans une route
+    book_id = book.id
+    quantities = count(1)
+
+    print("Liste des champs à mettre à jour (µs par appel) :")
+    fields = {
+        "jsonable_encoder(objet ORM)": lambda: list(jsonable_encoder(book)),
+        "column_values (carte en cache)": lambda: column_values(Book, BookUpdate(quantity=3), exclude_unset=True),
+    }
+    for name, func in fields.items():
+        print(f"  {name:<38} {timeit(func, repeat):8.1f}")
+
+    print("Mise à jour complète avec commit (µs par appel) :")
+    updates = {
+        "historique (jsonable_encoder)": lambda: legacy_update(
+            db, book, BookUpdate(quantity=next(quantities))
+        ),
+        "BaseRepository.update": lambda: repository.update(
+            db_obj=book, obj_in=BookUpdate(quantity=next(quantities))
+        ),
+        "BaseRepository.update_columns": lambda: repository.update_columns(
+            id=book_id, values={"quantity": Book.quantity + 1}
+        ),
+    }
+    for name, func in updates.items():
+        print(f"  {name:<38} {timeit(func, repeat):8.1f}")
+
+    db.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
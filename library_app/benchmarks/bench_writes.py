@@ -0,0 +1,82 @@
+"""
+Écritures par seconde (mises à jour de stock, PUT /books/{id}) selon le
+nombre de clients concurrents, avec une transaction par requête ou avec le thread écrivain à
+validation groupée (WRITE_COORDINATOR=1).
+
+Le profil SQLite « durable » (fsync à chaque commit) est utilisé : c'est là
+que regrouper les commits compte le plus.
+
+    python -m benchmarks.bench_writes [requêtes_par_client] [clients...]
+"""
+import os
+import sys
+import tempfile
+import threading
+
+import httpx
+
+from .common import login, prepare_database, report, run_concurrently, running_server
+
+PROFILES = {
+    "une transaction par requête": {"WRITE_COORDINATOR": "0", "SQLITE_PROFILE": "durable"},
+    "validation groupée": {"WRITE_COORDINATOR": "1", "SQLITE_PROFILE": "durable"},
+}
+
+
+def prepare_books(path: str, count: int):
+    """
+    Base de test avec `count` livres supplémentaires : chaque client met à
+    jour son propre livre, sans conflit avec les autres.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from src.models.books import Book
+
+    url = prepare_database(path)
+    engine = create_engine(url)
+    db = sessionmaker(bind=engine)()
+    books = [
+        Book(title=f"Bench {i}", author="Bench", isbn=f"97800{i:08d}", publication_year=2000, quantity=1)
+        for i in range(count)
+    ]
+    db.add_all(books)
+    db.commit()
+    book_ids = [book.id for book in books]
+    db.close()
+    engine.dispose()
+    return url, book_ids
+
+
+def main(requests_per_client: int = 50, *client_counts: int) -> None:
+    client_counts = client_counts or (1, 4, 16, 64)
+    for name, env in PROFILES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            url, book_ids = prepare_books(os.path.join(tmp, "writes.db"), max(client_counts))
+            with running_server(env, database_url=url) as api_url:
+                headers = {"Authorization": f"Bearer {login(api_url)}"}
+                for clients in client_counts:
+                    slots = iter(book_ids)
+                    slot_lock = threading.Lock()
+                    local = threading.local()
+
+                    def update_stock():
+                        if not hasattr(local, "client"):
+                            with slot_lock:
+                                local.book_id = next(slots)
+                            local.client = httpx.Client(timeout=60, headers=headers)
+                            local.quantity = 0
+                        local.quantity += 1
+                        return local.client.put(
+                            api_url + f"/books/{local.book_id}", json={"quantity": local.quantity}
+                        ).status_code
+
+                    result = run_concurrently(update_stock, clients, requests_per_client)
+                    statuses = result["results"]
+                    errors = len(statuses) - statuses.count(200)
+                    report(f"{clients:>3} clients, {name}", result["latencies"], result["elapsed"],
+                           extra=f"erreurs: {errors}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,146 @@
+"""
+Outils communs aux benchmarks : base de test, serveur uvicorn, charge concurrente.
+
+Les benchmarks se lancent depuis le répertoire library_app :
+    python -m benchmarks.bench_login
+"""
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+LIBRARY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, LIBRARY_DIR)
+
+# Une ligne de log par requête fausserait les mesures côté client
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def prepare_database(path: str) -> str:
+    """
+    Crée une base SQLite de test (schéma + données de init_db) et retourne son URL.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from src.models.base import Base
+    from src.db.init_db import init_db
+
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        init_db(db)
+    finally:
+        db.close()
+    engine.dispose()
+    return url
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def running_server(env: Optional[Dict[str, str]] = None, database_url: Optional[str] = None) -> Iterator[str]:
+    """
+    Lance l'API dans un processus uvicorn avec la configuration `env` et
+    retourne l'URL de base de l'API.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        url = database_url or prepare_database(os.path.join(tmp, "bench.db"))
+        port = _free_port()
+        # Pas de logs côté serveur (requêtes, requêtes lentes), sauf si `env` le demande
+        server_env = dict(os.environ, DATABASE_URL=url, LOG_LEVEL="ERROR", SQL_LOG_LEVEL="ERROR", LOG_FILE="")
+        server_env.update(env or {})
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=LIBRARY_DIR,
+            env=server_env,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            for _ in range(100):
+                try:
+                    httpx.get(base_url + "/", timeout=1)
+                    break
+                except httpx.HTTPError:
+                    time.sleep(0.1)
+            yield base_url + "/api/v1"
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+def login(api_url: str, email: str = "admin@example.com", password: str = "admin123") -> str:
+    """
+    Retourne un token d'accès pour l'utilisateur donné.
+    """
+    response = httpx.post(api_url + "/auth/login", data={"username": email, "password": password}, timeout=30)
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def run_concurrently(task: Callable[[], object], clients: int, requests_per_client: int) -> Dict[str, object]:
+    """
+    Exécute `task` depuis `clients` threads et mesure latences et débit.
+    """
+    latencies: List[float] = []
+    results: List[object] = []
+
+    def worker():
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            results.append(task())
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        for future in [executor.submit(worker) for _ in range(clients)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+    return {"latencies": latencies, "results": results, "elapsed": elapsed}
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def report(name: str, latencies: List[float], elapsed: float, extra: str = "") -> None:
+    """
+    Affiche une ligne de résultats : débit et percentiles de latence (ms).
+    """
+    if not latencies:
+        print(f"{name:<40} aucune mesure")
+        return
+    print(
+        f"{name:<40} {len(latencies) / elapsed:8.1f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+        f"p95 {percentile(latencies, 95) * 1000:7.1f} ms  {extra}"
+    )
+
+
+def timeit(func: Callable[[], object], repeat: int) -> float:
+    """
+    Durée moyenne d'un appel de `func` en microsecondes.
+    """
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
@@ -6,10 +6,7 @@ const Api = {
             'Content-Type': 'application/json'
         };
 
-        const token = Auth.getToken();
-        console.log("Token sent in header:", token);
-
-        if (Auth.isAuthenticated()) {
+        if (Auth.hasValidToken()) {
             headers['Authorization'] = `Bearer ${Auth.getToken()}`;
         }
 
@@ -17,9 +14,14 @@ const Api = {
     },
 
     // Appel API générique
-    call: async function(endpoint, method = 'GET', data = null) {
+    call: async function(endpoint, method = 'GET', data = null, retry = true) {
         UI.showLoading();
 
+        // Renouveler le token d'accès expiré avant l'appel
+        if (!Auth.hasValidToken() && Auth.getRefreshToken()) {
+            await this.refreshToken();
+        }
+
         const url = `${CONFIG.API_URL}${endpoint}`;
         const options = {
             method: method,
@@ -32,6 +34,15 @@ const Api = {
 
         try {
             const response = await fetch(url, options);
+
+            // Token refusé (révoqué ou expiré côté serveur) : un seul nouvel essai
+            if (response.status === 401 && retry && Auth.getRefreshToken()) {
+                UI.hideLoading();
+                if (await this.refreshToken()) {
+                    return this.call(endpoint, method, data, false);
+                }
+            }
+
             const responseData = await response.json();
 
             if (!response.ok) {
@@ -70,9 +81,9 @@ const Api = {
                 throw new Error(data.detail || 'Échec de la connexion');
             }
 
-            // Stocker le token
-            Auth.setToken(data.access_token);
-            console.log("🔐 Token saved:", Auth.getToken()); 
+            // Stocker les tokens
+            Auth.setToken(data.access_token, data.expires_in * 1000);
+            Auth.setRefreshToken(data.refresh_token);
 
             // Récupérer les informations utilisateur
             await this.getCurrentUser();
@@ -86,6 +97,51 @@ const Api = {
         }
     },
 
+    // Échange le jeton de rafraîchissement contre un nouveau token d'accès
+    refreshToken: async function() {
+        if (!this._refreshing) {
+            this._refreshing = (async () => {
+                try {
+                    const response = await fetch(`${CONFIG.API_URL}/auth/refresh`, {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({ refresh_token: Auth.getRefreshToken() })
+                    });
+                    if (!response.ok) {
+                        Auth.logout();
+                        return false;
+                    }
+                    const data = await response.json();
+                    Auth.setToken(data.access_token, data.expires_in * 1000);
+                    Auth.setRefreshToken(data.refresh_token);
+                    return true;
+                } catch (error) {
+                    return false;
+                } finally {
+                    this._refreshing = null;
+                }
+            })();
+        }
+        return this._refreshing;
+    },
+
+    // Révoque le jeton de rafraîchissement côté serveur
+    logout: async function() {
+        const refreshToken = Auth.getRefreshToken();
+        Auth.logout();
+        if (refreshToken) {
+            try {
+                await fetch(`${CONFIG.API_URL}/auth/logout`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({ refresh_token: refreshToken })
+                });
+            } catch (error) {
+                // La session locale est déjà fermée
+            }
+        }
+    },
+
     register: async function(userData) {
         return this.call('/users/', 'POST', userData);
     },
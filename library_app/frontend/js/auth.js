@@ -14,8 +14,23 @@ const Auth = {
         return localStorage.getItem(CONFIG.STORAGE_KEYS.TOKEN);
     },
 
-    // Vérifie si le token est valide et non expiré
+    // Stocke le jeton de rafraîchissement
+    setRefreshToken: function(refreshToken) {
+        localStorage.setItem(CONFIG.STORAGE_KEYS.REFRESH_TOKEN, refreshToken);
+    },
+
+    // Récupère le jeton de rafraîchissement
+    getRefreshToken: function() {
+        return localStorage.getItem(CONFIG.STORAGE_KEYS.REFRESH_TOKEN);
+    },
+
+    // Vérifie si l'utilisateur est connecté (token valide ou renouvelable)
     isAuthenticated: function() {
+        return this.hasValidToken() || !!this.getRefreshToken();
+    },
+
+    // Vérifie si le token est valide et non expiré
+    hasValidToken: function() {
         const token = this.getToken();
         if (!token) return false;
 
@@ -40,6 +55,7 @@ const Auth = {
     // Déconnecte l'utilisateur
     logout: function() {
         localStorage.removeItem(CONFIG.STORAGE_KEYS.TOKEN);
+        localStorage.removeItem(CONFIG.STORAGE_KEYS.REFRESH_TOKEN);
         localStorage.removeItem(CONFIG.STORAGE_KEYS.TOKEN_EXPIRY);
         localStorage.removeItem(CONFIG.STORAGE_KEYS.USER);
     }
@@ -3,12 +3,14 @@ const CONFIG = {
     // URL de base de l'API
     API_URL: 'http://localhost:8000/api/v1',
 
-    // Durée de vie du token en millisecondes (8 jours)
-    TOKEN_EXPIRY: 8 * 24 * 60 * 60 * 1000,
+    // Durée de vie par défaut du token d'accès en millisecondes (15 minutes) ;
+    // il est renouvelé via le jeton de rafraîchissement
+    TOKEN_EXPIRY: 15 * 60 * 1000,
 
     // Clés de stockage local
     STORAGE_KEYS: {
         TOKEN: 'auth_token',
+        REFRESH_TOKEN: 'refresh_token',
         USER: 'user_data',
         TOKEN_EXPIRY: 'token_expiry'
     }
@@ -32,7 +32,7 @@ const UI = {
         // Déconnexion
         this.elements.logoutLink.addEventListener('click', (e) => {
             e.preventDefault();
-            Auth.logout();
+            Api.logout();
             this.updateNavigation();
             App.loadPage('login');
             this.showMessage('Vous avez été déconnecté avec succès', 'success');
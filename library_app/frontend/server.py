@@ -1,3 +1,4 @@
+import email.utils
 import http.server
 import socketserver
 import os
@@ -8,6 +9,29 @@ PORT = 5500
 # Répertoire contenant les fichiers à servir
 DIRECTORY = os.path.dirname(os.path.abspath(__file__))
 
+# Variantes précompressées (scripts/precompress_frontend.py), par ordre de préférence
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def accepted_encodings(header):
+    """
+    Encodages acceptés par le client (en-tête Accept-Encoding), hors q=0.
+    """
+    accepted = set()
+    for part in header.lower().split(","):
+        name, _, params = part.partition(";")
+        quality = params.strip()
+        if quality.startswith("q="):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if name.strip():
+            accepted.add(name.strip())
+    return accepted
+
+
 class Handler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIRECTORY, **kwargs)
@@ -16,7 +40,47 @@ class Handler(http.server.SimpleHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         super().end_headers()
 
-with socketserver.TCPServer(("", PORT), Handler) as httpd:
-    print(f"Serveur démarré sur le port {PORT}")
-    print(f"Ouvrez votre navigateur à l'adresse : http://localhost:{PORT}")
-    httpd.serve_forever()
\ No newline at end of file
+    def send_head(self):
+        """
+        Sert la variante .br ou .gz d'un fichier si le client l'accepte et
+        qu'elle est à jour, sinon le fichier lui-même.
+        """
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split("?", 1)[0].endswith("/"):
+            path = os.path.join(path, "index.html")
+        if not os.path.isfile(path):
+            return super().send_head()
+
+        accepted = accepted_encodings(self.headers.get("Accept-Encoding", ""))
+        for encoding, suffix in PRECOMPRESSED:
+            variant = path + suffix
+            if (
+                encoding in accepted
+                and os.path.isfile(variant)
+                and os.path.getmtime(variant) >= os.path.getmtime(path)
+            ):
+                return self.send_variant(path, variant, encoding)
+        return super().send_head()
+
+    def send_variant(self, path, variant, encoding):
+        f = open(variant, "rb")
+        try:
+            stat = os.fstat(f.fileno())
+            self.send_response(200)
+            self.send_header("Content-type", self.guess_type(path))
+            self.send_header("Content-Encoding", encoding)
+            self.send_header("Content-Length", str(stat.st_size))
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Last-Modified", email.utils.formatdate(os.path.getmtime(path), usegmt=True))
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+
+
+if __name__ == "__main__":
+    with socketserver.TCPServer(("", PORT), Handler) as httpd:
+        print(f"Serveur démarré sur le port {PORT}")
+        print(f"Ouvrez votre navigateur à l'adresse : http://localhost:{PORT}")
+        httpd.serve_forever()
@@ -0,0 +1,23 @@
+# scripts/build_analytics.py
+import sys
+import os
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.db.session import SessionLocal
+from src.services.analytics import AnalyticsService
+from src.services.recommendations import RecommendationService
+
+def main():
+    db = SessionLocal()
+    try:
+        info = AnalyticsService().refresh(db)
+        print(f"Instantané {info['snapshot']} créé ({info['loan_count']} emprunts)")
+        info = RecommendationService().refresh(db)
+        print(f"Recommandations mises à jour ({info['updated_books']} livres recalculés)")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
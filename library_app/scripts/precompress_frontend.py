@@ -0,0 +1,48 @@
+# scripts/precompress_frontend.py
+import sys
+import os
+
+# Ajouter le répertoire parent au chemin Python
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.compression import ENCODINGS, compress
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "frontend")
+# Fichiers précompressés (les images déjà compressées sont ignorées)
+EXTENSIONS = (".html", ".css", ".js", ".json", ".svg")
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+MIN_SIZE = 256
+
+
+def precompress(path: str) -> list:
+    """
+    Écrit les variantes .gz (et .br si brotli est installé) d'un fichier,
+    au niveau de compression maximal : le coût est payé une fois, au build.
+    Une variante qui n'est pas plus petite que l'original est supprimée.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    written = []
+    for encoding in ENCODINGS:
+        target = path + SUFFIXES[encoding]
+        compressed = compress(data, encoding, gzip_level=9, brotli_quality=11)
+        if len(data) < MIN_SIZE or len(compressed) >= len(data):
+            if os.path.exists(target):
+                os.remove(target)
+            continue
+        with open(target, "wb") as f:
+            f.write(compressed)
+        written.append((target, len(data), len(compressed)))
+    return written
+
+
+def main():
+    for root, _, files in os.walk(FRONTEND_DIR):
+        for name in sorted(files):
+            if not name.endswith(EXTENSIONS):
+                continue
+            for target, before, after in precompress(os.path.join(root, name)):
+                print(f"{os.path.relpath(target, FRONTEND_DIR)} : {before} -> {after} octets")
+
+if __name__ == "__main__":
+    main()
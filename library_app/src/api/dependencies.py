@@ -1,68 +1,65 @@
-from fastapi import Depends, HTTPException, status
+import logging
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..db.session import get_db
+from ..db.session import get_async_db, get_read_db
 from ..models.users import User
+from ..models.versions import read_versions, read_versions_async
 from ..repositories.users import UserRepository
 from ..services.users import UserService
 from ..api.schemas.token import TokenPayload
-from ..utils.security import ALGORITHM
+from ..utils.etags import ETAG_CACHE_CONTROL, etag_matches, make_etag
+from ..utils.fields import parse_fields
+from ..utils.security import ALGORITHM, Principal, principal_cache
 from ..config import settings
 
+logger = logging.getLogger(__name__)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
+def _decode_token(token: str) -> TokenPayload:
     """
-    Dépendance pour obtenir l'utilisateur actuel à partir du token JWT.
+    Décode et valide le token JWT (403 s'il est invalide ou expiré).
     """
     try:
-        print(f"🔐 Raw token: {token}")  # Debug line
-
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[ALGORITHM]
         )
-        print(f"Decoded payload: {payload}")  # Debug line
 
-        # DEBUG: If `sub` is a string, convert it to int
+        # `sub` est encodé en chaîne dans le token
         if isinstance(payload.get("sub"), str):
             payload["sub"] = int(payload["sub"])
 
-        token_data = TokenPayload(**payload)
-        print(f"Token data parsed: {token_data}")  # Debug line
+        return TokenPayload(**payload)
 
     except (JWTError, ValidationError) as e:
-        print(f"JWT or validation error: {e}")  # Debug line
+        logger.info("Token rejeté : %s", e)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Impossible de valider les informations d'identification",
         )
 
-    repository = UserRepository(User, db)
-    service = UserService(repository)
-    user = service.get(id=token_data.sub)
 
+def _cache_principal(cache_key, user: Optional[User]) -> Principal:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Utilisateur non trouvé",
         )
-    return user
 
+    principal = Principal(id=user.id, is_active=user.is_active, is_admin=user.is_admin)
+    principal_cache.set(cache_key, principal)
+    return principal
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    """
-    Dépendance pour obtenir l'utilisateur actif actuel.
-    """
+def _require_active(current_user: Principal) -> Principal:
     if not current_user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -71,15 +68,136 @@ def get_current_active_user(
     return current_user
 
 
-def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
-    """
-    Dépendance pour obtenir l'utilisateur administrateur actuel.
-    """
+def _require_admin(current_user: Principal) -> Principal:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Privilèges insuffisants",
         )
     return current_user
+
+
+def get_current_user(
+    db: Session = Depends(get_read_db),
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Dépendance pour obtenir l'utilisateur actuel à partir du token JWT.
+    L'utilisateur est mis en cache (voir Principal) : les requêtes suivantes
+    avec le même token ne relisent pas la table user.
+    """
+    token_data = _decode_token(token)
+
+    cache_key = (token_data.sub, token)
+    principal = principal_cache.get(cache_key)
+    if principal is not None:
+        return principal
+
+    repository = UserRepository(User, db)
+    service = UserService(repository)
+    return _cache_principal(cache_key, service.get(id=token_data.sub))
+
+
+def get_current_active_user(
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
+    """
+    Dépendance pour obtenir l'utilisateur actif actuel.
+    """
+    return _require_active(current_user)
+
+
+def get_current_admin_user(
+    current_user: Principal = Depends(get_current_active_user),
+) -> Principal:
+    """
+    Dépendance pour obtenir l'utilisateur administrateur actuel.
+    """
+    return _require_admin(current_user)
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+) -> Principal:
+    """
+    Équivalent de get_current_user pour les routes asynchrones (même cache).
+    """
+    token_data = _decode_token(token)
+
+    cache_key = (token_data.sub, token)
+    principal = principal_cache.get(cache_key)
+    if principal is not None:
+        return principal
+
+    return _cache_principal(cache_key, await db.get(User, token_data.sub))
+
+
+async def get_current_active_user_async(
+    current_user: Principal = Depends(get_current_user_async),
+) -> Principal:
+    """
+    Dépendance pour obtenir l'utilisateur actif actuel (routes asynchrones).
+    """
+    return _require_active(current_user)
+
+
+async def get_current_admin_user_async(
+    current_user: Principal = Depends(get_current_active_user_async),
+) -> Principal:
+    """
+    Dépendance pour obtenir l'utilisateur administrateur actuel (routes asynchrones).
+    """
+    return _require_admin(current_user)
+
+
+def sparse_fields(schema: Type[BaseModel]) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """
+    Dépendance du paramètre `fields=id,title,...` d'une liste : champs de
+    `schema` à renvoyer (400 pour un champ inconnu), None pour tous.
+    """
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description="Champs à renvoyer, séparés par des virgules (%s)" % ", ".join(schema.model_fields)
+        )
+    ) -> Optional[Tuple[str, ...]]:
+        try:
+            return parse_fields(fields, schema)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return dependency
+
+
+def conditional_get(*tables: str) -> Callable[..., None]:
+    """
+    Dépendance des GET conditionnels : ETag dérivé des versions de `tables`
+    (voir TableVersion), renvoyé par ETagMiddleware. Si le client a déjà
+    cette version (If-None-Match), répond 304 sans exécuter la route. À
+    déclarer après la dépendance d'authentification.
+    """
+    def dependency(request: Request, db: Session = Depends(get_read_db)) -> None:
+        _check_etag(request, read_versions(db, tables))
+
+    return dependency
+
+
+def conditional_get_async(*tables: str) -> Callable[..., None]:
+    """
+    Équivalent de conditional_get pour les routes asynchrones (versions lues
+    sur la session asynchrone de la route).
+    """
+    async def dependency(request: Request, db: AsyncSession = Depends(get_async_db)) -> None:
+        _check_etag(request, await read_versions_async(db, tables))
+
+    return dependency
+
+
+def _check_etag(request: Request, versions: Dict[str, int]) -> None:
+    etag = make_etag(versions, settings.ETAG_PERIOD_SECONDS)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL},
+        )
+    request.state.etag = etag
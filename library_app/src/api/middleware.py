@@ -0,0 +1,283 @@
+import logging
+import re
+import time
+import uuid
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+from ..utils.compression import StreamCompressor, choose_encoding, compress, compressible
+from ..utils.etags import ETAG_CACHE_CONTROL
+from ..utils.logging import request_id_var
+from ..utils.profiling import QueryStats, current_query_stats, route_query_metrics
+from ..utils.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    http_requests_total,
+    sql_queries_total,
+    sql_time_seconds_total,
+)
+
+logger = logging.getLogger("library.request")
+
+REQUEST_ID_HEADER = "x-request-id"
+# Un identifiant fourni par le client (ou un proxy) n'est repris que s'il est sûr
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+_route_templates: Dict[object, str] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Modèle de chemin de la route qui a traité la requête (ex. /api/v1/books/{id}),
+    pour agréger les mesures sans une entrée par ID. Appelée après le routage.
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "<non routé>"
+    template = _route_templates.get(endpoint)
+    if template is None:
+        template = getattr(endpoint, "__name__", str(endpoint))
+        for route in scope["app"].router.routes:
+            if getattr(route, "endpoint", None) is endpoint:
+                template = route.path
+                break
+        _route_templates[endpoint] = template
+    return template
+
+
+class RequestContextMiddleware:
+    """
+    Attribue un identifiant à chaque requête (en-tête X-Request-ID repris ou
+    généré), le rend disponible aux logs et le renvoie dans la réponse.
+    Journalise une ligne par requête (méthode, chemin, statut, durée).
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        token = request_id_var.set(request_id)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (REQUEST_ID_HEADER.encode(), request_id.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            logger.info(
+                "%s %s %s", scope["method"], scope["path"], status_code,
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                },
+            )
+            request_id_var.reset(token)
+
+
+class QueryProfilingMiddleware:
+    """
+    Compte les requêtes SQL exécutées pour chaque requête HTTP, signale les
+    N+1 probables (même SELECT répété) et agrège les mesures par route.
+    En mode DEBUG, les résultats sont aussi renvoyés en en-têtes
+    (X-Query-Count, X-Query-Time-Ms, X-N-Plus-One).
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.QUERY_PROFILING:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-query-count", str(stats.count).encode()),
+                    (b"x-query-time-ms", ("%.3f" % stats.total_ms).encode()),
+                    (b"x-n-plus-one", str(len(stats.repeated_shapes())).encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_query_stats.reset(token)
+            route = route_template(scope)
+            n_plus_one = stats.repeated_shapes()
+            if n_plus_one:
+                for shape, count in n_plus_one.items():
+                    logger.warning(
+                        "N+1 probable sur %s", route,
+                        extra={"route": route, "statement": shape, "repeat": count},
+                    )
+            route_query_metrics.observe(route, stats, n_plus_one)
+
+
+class MetricsMiddleware:
+    """
+    Alimente les métriques HTTP (voir utils.metrics) : requêtes par route et
+    par statut, histogramme de latence, requêtes en cours, SQL par route.
+    Placé à l'intérieur de QueryProfilingMiddleware pour lire ses mesures SQL.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = route_template(scope)
+            method = scope["method"]
+            http_requests_total.inc(method=method, route=route, status=status_code)
+            http_request_duration_seconds.observe(time.perf_counter() - start, method=method, route=route)
+            stats = current_query_stats.get()
+            if stats is not None and stats.count:
+                sql_queries_total.inc(stats.count, route=route)
+                sql_time_seconds_total.inc(stats.total_ms / 1000, route=route)
+
+
+class CompressionMiddleware:
+    """
+    Compresse les réponses (br ou gzip selon l'Accept-Encoding du client)
+    dont le type figure dans COMPRESSION_TYPES et qui dépassent
+    COMPRESSION_MIN_SIZE octets. Une réponse en plusieurs morceaux
+    (streaming) est compressée au fil de l'eau, sans seuil de taille.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION:
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        options = {
+            "gzip_level": settings.COMPRESSION_GZIP_LEVEL,
+            "brotli_quality": settings.COMPRESSION_BROTLI_QUALITY,
+        }
+        start_message: Optional[Message] = None
+        compressor: Optional[StreamCompressor] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressor
+            if message["type"] == "http.response.start":
+                # Décision différée jusqu'au premier morceau du corps
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is None:
+                if compressor is not None:
+                    data = compressor.compress(body)
+                    if not more_body:
+                        data += compressor.finish()
+                    message = {"type": "http.response.body", "body": data, "more_body": more_body}
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            if (
+                "content-encoding" in headers
+                or start["status"] < 200 or start["status"] in (204, 304)
+                or not compressible(headers.get("content-type", ""), settings.COMPRESSION_TYPES)
+                or (not more_body and len(body) < settings.COMPRESSION_MIN_SIZE)
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            headers["content-encoding"] = encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                compressor = StreamCompressor(encoding, **options)
+                del headers["content-length"]
+                body = compressor.compress(body)
+            else:
+                body = compress(body, encoding, **options)
+                headers["content-length"] = str(len(body))
+            start["headers"] = headers.raw
+            await send(start)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class ETagMiddleware:
+    """
+    Ajoute aux réponses 200 l'ETag calculé par la dépendance conditional_get
+    (request.state.etag) ; le 304 est renvoyé par la dépendance elle-même.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+
+        async def send_with_etag(message: Message) -> None:
+            etag = state.get("etag")
+            if message["type"] == "http.response.start" and etag and message["status"] == 200:
+                headers = MutableHeaders(raw=list(message.get("headers", [])))
+                headers["etag"] = etag
+                headers["cache-control"] = ETAG_CACHE_CONTROL
+                message["headers"] = headers.raw
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
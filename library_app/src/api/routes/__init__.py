@@ -1,16 +1,41 @@
 from fastapi import APIRouter
 
+from ...config import settings
 from .books import router as books_router
 from .users import router as users_router
 from .loans import router as loans_router
 from .auth import router as auth_router
 from .stats import router as stats_router
+from .books_async import router as books_async_router
+from .stats_async import router as stats_async_router
+
+
+def shadowed(router: APIRouter, replacement: APIRouter) -> APIRouter:
+    """
+    Copie de `router` sans les routes (chemin, méthode) redéfinies par `replacement`.
+    """
+    replaced = {(route.path, method) for route in replacement.routes for method in route.methods}
+    result = APIRouter()
+    result.routes = [
+        route for route in router.routes
+        if not any((route.path, method) in replaced for method in getattr(route, "methods", ()))
+    ]
+    return result
 
 
 api_router = APIRouter()
 
 api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
-api_router.include_router(books_router, prefix="/books", tags=["books"])
+if settings.ASYNC_ROUTES:
+    # Les routes de lecture les plus sollicitées passent par la pile asynchrone
+    api_router.include_router(books_async_router, prefix="/books", tags=["books"])
+    api_router.include_router(shadowed(books_router, books_async_router), prefix="/books", tags=["books"])
+else:
+    api_router.include_router(books_router, prefix="/books", tags=["books"])
 api_router.include_router(users_router, prefix="/users", tags=["users"])
 api_router.include_router(loans_router, prefix="/loans", tags=["loans"])
-api_router.include_router(stats_router, prefix="/stats", tags=["stats"])
\ No newline at end of file
+if settings.ASYNC_ROUTES:
+    api_router.include_router(stats_async_router, prefix="/stats", tags=["stats"])
+    api_router.include_router(shadowed(stats_router, stats_async_router), prefix="/stats", tags=["stats"])
+else:
+    api_router.include_router(stats_router, prefix="/stats", tags=["stats"])
@@ -2,18 +2,30 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
+from typing import Optional, Tuple
 
 from ...db.session import get_db
+from ...db.writer import run_write
 from ...models.users import User as UserModel
-from ..schemas.token import Token
+from ...models.tokens import RefreshToken
+from ..schemas.token import Token, RefreshTokenRequest
 from ...repositories.users import UserRepository
+from ...repositories.tokens import RefreshTokenRepository
 from ...services.users import UserService
+from ...services.tokens import RefreshTokenService
 from ...utils.security import create_access_token
 from ...config import settings
 
 router = APIRouter()
 
 
+def token_service(db: Session) -> RefreshTokenService:
+    """
+    Service des jetons de rafraîchissement sur la session `db`.
+    """
+    return RefreshTokenService(RefreshTokenRepository(RefreshToken, db))
+
+
 @router.post("/login", response_model=Token)
 def login_access_token(
     db: Session = Depends(get_db),
@@ -40,11 +52,63 @@ def login_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Seule l'émission du jeton écrit : bcrypt reste hors du thread écrivain
+    user_id = user.id
+    refresh_token = run_write(db, lambda session: token_service(session).issue(user_id=user_id))
+    return _token_response(user_id, refresh_token)
+
+
+@router.post("/refresh", response_model=Token)
+def refresh_access_token(
+    token_in: RefreshTokenRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Échange un jeton de rafraîchissement contre un nouveau token d'accès
+    (et un nouveau jeton de rafraîchissement), sans vérifier le mot de passe.
+    """
+    def rotate(session: Session) -> Tuple[Optional[int], str]:
+        # Les erreurs sont retournées et non levées : une exception annulerait
+        # les révocations faites par rotate() (jeton réutilisé, donc volé)
+        service = token_service(session)
+        try:
+            user_id, refresh_token = service.rotate(token=token_in.refresh_token)
+        except ValueError as e:
+            return None, str(e)
+        user = UserService(UserRepository(UserModel, session)).get(id=user_id)
+        if not user or not user.is_active:
+            service.revoke(token=refresh_token)
+            return None, "Utilisateur inactif"
+        return user_id, refresh_token
+
+    user_id, result = run_write(db, rotate)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=result,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return _token_response(user_id, result)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    token_in: RefreshTokenRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Révoque un jeton de rafraîchissement.
+    """
+    run_write(db, lambda session: token_service(session).revoke(token=token_in.refresh_token))
+
+
+def _token_response(user_id: int, refresh_token: str) -> dict:
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": create_access_token(
-            subject=user.id, expires_delta=access_token_expires
+            subject=user_id, expires_delta=access_token_expires
         ),
         "token_type": "bearer",
+        "expires_in": int(access_token_expires.total_seconds()),
+        "refresh_token": refresh_token,
     }
-
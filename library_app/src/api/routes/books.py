@@ -1,36 +1,52 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Any
-from ...utils.pagination import PaginationParams, paginate, Page
+from sqlalchemy.orm import Session, selectinload
+from typing import List, Any, Literal
+from ...utils.fields import select_fields
+from ...utils.pagination import PaginationParams, paginate, paginate_fields, paginate_rows, Page
+from ...utils.responses import FastJSONResponse
 
-from ...db.session import get_db
+from ...db.session import get_db, get_read_db
+from ...db.writer import run_write
 from ...models.books import Book as BookModel
-from ..schemas.books import Book, BookCreate, BookUpdate
-from ...repositories.books import BookRepository
+from ..schemas.books import Book, BookCreate, BookSummary, BookUpdate
+from ...repositories.books import BookRepository, book_search_criteria
 from ...services.books import BookService
-from ..dependencies import get_current_active_user, get_current_admin_user
+from ...services.recommendations import RecommendationService
+from ..dependencies import conditional_get, get_current_active_user, get_current_admin_user, sparse_fields
 from typing import Optional
-from ...models.categories import book_category
 
 router = APIRouter()
 
+# Tables lues par les réponses du catalogue (livres et leurs catégories)
+CATALOG_TABLES = ("book", "category", "book_category")
+
 
 @router.get("/", response_model=Page[Book])
 def read_books(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     sort_by: Optional[str] = Query(None),
     sort_desc: bool = Query(False),
-    current_user = Depends(get_current_active_user)
+    view: Literal["full", "summary"] = Query("full"),
+    fields = Depends(sparse_fields(Book)),
+    current_user = Depends(get_current_active_user),
+    etag = Depends(conditional_get(*CATALOG_TABLES))
 ) -> Any:
     """
-    Récupère la liste des livres avec pagination.
+    Récupère la liste des livres avec pagination. Avec `view=summary`, les
+    éléments sont des BookSummary (sans catégories), projetés directement
+    depuis la base et sérialisés sans validation. Avec `fields=`, seuls les
+    champs demandés sont lus en base et renvoyés (prioritaire sur `view`).
     """
-    repository = BookRepository(BookModel, db)
-    query = db.query(BookModel)
-
     params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc)
+    if fields:
+        return FastJSONResponse(paginate_fields(db, select_fields(BookModel, Book, fields), params))
+    if view == "summary":
+        return FastJSONResponse(paginate_rows(db, BookModel, BookSummary, params))
+
+    # Catégories chargées en une requête pour toute la page (sinon une par livre)
+    query = db.query(BookModel).options(selectinload(BookModel.categories))
     return paginate(query, params, BookModel)
 
 
@@ -44,12 +60,12 @@ def create_book(
     """
     Crée un nouveau livre.
     """
-    repository = BookRepository(BookModel, db)
-    service = BookService(repository)
+    def create(session: Session) -> Book:
+        service = BookService(BookRepository(BookModel, session))
+        return Book.model_validate(service.create(obj_in=book_in), from_attributes=True)
 
     try:
-        book = service.create(obj_in=book_in)
-        return book
+        return run_write(db, create)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -60,9 +76,10 @@ def create_book(
 @router.get("/{id}", response_model=Book)
 def read_book(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     id: int,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_active_user),
+    etag = Depends(conditional_get(*CATALOG_TABLES))
 ) -> Any:
     """
     Récupère un livre par son ID.
@@ -78,16 +95,15 @@ def read_book(
     return book
 
 
-@router.put("/{id}", response_model=Book)
-def update_book(
+@router.get("/{id}/related", response_model=List[Book])
+def read_related_books(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     id: int,
-    book_in: BookUpdate,
-    current_user = Depends(get_current_admin_user)
+    current_user = Depends(get_current_active_user)
 ) -> Any:
     """
-    Met à jour un livre.
+    Récupère les livres souvent empruntés par les lecteurs de ce livre.
     """
     repository = BookRepository(BookModel, db)
     service = BookService(repository)
@@ -97,15 +113,41 @@ def update_book(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Livre non trouvé"
         )
+    return RecommendationService().get_related_books(db, book_id=id)
+
+
+@router.put("/{id}", response_model=Book)
+def update_book(
+    *,
+    db: Session = Depends(get_db),
+    id: int,
+    book_in: BookUpdate,
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Met à jour un livre.
+    """
+    def update(session: Session) -> Optional[Book]:
+        service = BookService(BookRepository(BookModel, session))
+        book = service.get(id=id)
+        if not book:
+            return None
+        # Sérialisé dans la session : le thread écrivain la ferme après le commit
+        return Book.model_validate(service.update(db_obj=book, obj_in=book_in), from_attributes=True)
 
     try:
-        book = service.update(db_obj=book, obj_in=book_in)
-        return book
+        book = run_write(db, update)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    if not book:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Livre non trouvé"
+        )
+    return book
 
 
 @router.delete("/{id}", response_model=Book)
@@ -113,27 +155,33 @@ def delete_book(
     *,
     db: Session = Depends(get_db),
     id: int,
+    soft: bool = False,
     current_user = Depends(get_current_admin_user)
 ) -> Any:
     """
-    Supprime un livre.
+    Supprime un livre et ses emprunts. Avec `soft`, le livre est seulement
+    marqué supprimé et ses emprunts sont archivés.
     """
-    repository = BookRepository(BookModel, db)
-    service = BookService(repository)
-    book = service.get(id=id)
+    def delete(session: Session) -> Optional[Book]:
+        service = BookService(BookRepository(BookModel, session))
+        if not service.get(id=id):
+            return None
+        book = service.soft_delete(id=id) if soft else service.remove(id=id)
+        return Book.model_validate(book, from_attributes=True)
+
+    book = run_write(db, delete)
     if not book:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Livre non trouvé"
         )
-    book = service.remove(id=id)
     return book
 
 
 @router.get("/search/title/{title}", response_model=List[Book])
 def search_books_by_title(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     title: str,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -149,7 +197,7 @@ def search_books_by_title(
 @router.get("/search/author/{author}", response_model=List[Book])
 def search_books_by_author(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     author: str,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -165,7 +213,7 @@ def search_books_by_author(
 @router.get("/search/isbn/{isbn}", response_model=Book)
 def search_book_by_isbn(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     isbn: str,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -186,7 +234,7 @@ def search_book_by_isbn(
 # src/api/routes/books.py (extrait)
 @router.get("/search/", response_model=Page[Book])
 def search_books(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     query: Optional[str] = Query(None, min_length=1),
     category_id: Optional[int] = Query(None),
     author: Optional[str] = Query(None),
@@ -195,38 +243,21 @@ def search_books(
     limit: int = Query(100, ge=1, le=100),
     sort_by: Optional[str] = Query(None),
     sort_desc: bool = Query(False),
-    current_user = Depends(get_current_active_user)
+    view: Literal["full", "summary"] = Query("full"),
+    current_user = Depends(get_current_active_user),
+    etag = Depends(conditional_get(*CATALOG_TABLES))
 ) -> Any:
     """
-    Recherche avancée de livres.
+    Recherche avancée de livres (`view=summary` : voir read_books).
     """
-    repository = BookRepository(BookModel, db)
-
-    # Construire la requête de base
-    search_query = db.query(BookModel)
-
-    # Appliquer les filtres
-    if query:
-        search_query = search_query.filter(
-            or_(
-                BookModel.title.ilike(f"%{query}%"),
-                BookModel.author.ilike(f"%{query}%"),
-                BookModel.isbn.ilike(f"%{query}%"),
-                BookModel.description.ilike(f"%{query}%")
-            )
-        )
-
-    if category_id:
-        search_query = search_query.join(book_category).filter(
-            book_category.c.category_id == category_id
-        )
-
-    if author:
-        search_query = search_query.filter(BookModel.author.ilike(f"%{author}%"))
+    criteria = book_search_criteria(
+        query=query, category_id=category_id, author=author, publication_year=publication_year
+    )
+    params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc)
+    if view == "summary":
+        return FastJSONResponse(paginate_rows(db, BookModel, BookSummary, params, *criteria))
 
-    if publication_year:
-        search_query = search_query.filter(BookModel.publication_year == publication_year)
+    search_query = db.query(BookModel).options(selectinload(BookModel.categories)).filter(*criteria)
 
     # Paginer les résultats
-    params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc)
     return paginate(search_query, params, BookModel)
@@ -0,0 +1,97 @@
+# Variantes asynchrones des routes de consultation du catalogue (ASYNC_ROUTES)
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Literal, Optional
+
+from ...db.session import get_async_db
+from ...models.books import Book as BookModel
+from ...repositories.books import AsyncBookRepository, book_search_criteria
+from ...services.books import AsyncBookService
+from ...utils.fields import select_fields
+from ...utils.pagination import Page, PaginationParams, paginate_fields_async, paginate_rows_async
+from ...utils.responses import FastJSONResponse
+from ..schemas.books import Book, BookSummary
+from ..dependencies import conditional_get_async, get_current_active_user_async, sparse_fields
+from .books import CATALOG_TABLES
+
+router = APIRouter()
+
+
+@router.get("/", response_model=Page[Book])
+async def read_books(
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    sort_by: Optional[str] = Query(None),
+    sort_desc: bool = Query(False),
+    view: Literal["full", "summary"] = Query("full"),
+    fields = Depends(sparse_fields(Book)),
+    current_user = Depends(get_current_active_user_async),
+    etag = Depends(conditional_get_async(*CATALOG_TABLES))
+) -> Any:
+    """
+    Récupère la liste des livres avec pagination (`view=summary` et
+    `fields=` : voir books.read_books).
+    """
+    params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc)
+    if fields:
+        return FastJSONResponse(await paginate_fields_async(db, select_fields(BookModel, Book, fields), params))
+    if view == "summary":
+        return FastJSONResponse(await paginate_rows_async(db, BookModel, BookSummary, params))
+    service = AsyncBookService(AsyncBookRepository(BookModel, db))
+    return await service.search(params=params)
+
+
+@router.get("/search/", response_model=Page[Book])
+async def search_books(
+    db: AsyncSession = Depends(get_async_db),
+    query: Optional[str] = Query(None, min_length=1),
+    category_id: Optional[int] = Query(None),
+    author: Optional[str] = Query(None),
+    publication_year: Optional[int] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    sort_by: Optional[str] = Query(None),
+    sort_desc: bool = Query(False),
+    view: Literal["full", "summary"] = Query("full"),
+    current_user = Depends(get_current_active_user_async),
+    etag = Depends(conditional_get_async(*CATALOG_TABLES))
+) -> Any:
+    """
+    Recherche avancée de livres (`view=summary` : voir books.read_books).
+    """
+    params = PaginationParams(skip=skip, limit=limit, sort_by=sort_by, sort_desc=sort_desc)
+    if view == "summary":
+        criteria = book_search_criteria(
+            query=query, category_id=category_id, author=author, publication_year=publication_year
+        )
+        return FastJSONResponse(await paginate_rows_async(db, BookModel, BookSummary, params, *criteria))
+    service = AsyncBookService(AsyncBookRepository(BookModel, db))
+    return await service.search(
+        params=params,
+        query=query,
+        category_id=category_id,
+        author=author,
+        publication_year=publication_year,
+    )
+
+
+@router.get("/{id}", response_model=Book)
+async def read_book(
+    *,
+    db: AsyncSession = Depends(get_async_db),
+    id: int,
+    current_user = Depends(get_current_active_user_async),
+    etag = Depends(conditional_get_async(*CATALOG_TABLES))
+) -> Any:
+    """
+    Récupère un livre par son ID.
+    """
+    service = AsyncBookService(AsyncBookRepository(BookModel, db))
+    book = await service.get(id=id)
+    if not book:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Livre non trouvé"
+        )
+    return book
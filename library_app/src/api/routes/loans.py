@@ -1,33 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Literal
 from datetime import datetime, timedelta
 
-from ...db.session import get_db
+from ...db.session import get_db, get_read_db
+from ...db.writer import run_write
 from ...models.loans import Loan as LoanModel
 from ...models.books import Book as BookModel
 from ...models.users import User as UserModel
-from ..schemas.loans import Loan, LoanCreate, LoanUpdate
+from ..schemas.loans import Loan, LoanCreate, LoanSummary, LoanUpdate
 from ...repositories.loans import LoanRepository
 from ...repositories.books import BookRepository
 from ...repositories.users import UserRepository
 from ...services.loans import LoanService
-from ..dependencies import get_current_active_user, get_current_admin_user
+from ..dependencies import get_current_active_user, get_current_admin_user, sparse_fields
+from ...utils.fields import select_fields
+from ...utils.responses import FastJSONResponse
 
 router = APIRouter()
 
 
+def loan_service(db: Session) -> LoanService:
+    """
+    Service des emprunts sur la session `db`.
+    """
+    loan_repository = LoanRepository(LoanModel, db)
+    book_repository = BookRepository(BookModel, db)
+    user_repository = UserRepository(UserModel, db)
+    return LoanService(loan_repository, book_repository, user_repository)
+
+
 @router.get("/", response_model=List[Loan])
 def read_loans(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
+    view: Literal["full", "summary"] = Query("full"),
+    fields = Depends(sparse_fields(Loan)),
     current_user = Depends(get_current_admin_user)
 ) -> Any:
     """
-    Récupère la liste des emprunts.
+    Récupère la liste des emprunts. Avec `view=summary`, des LoanSummary
+    projetés directement depuis la base et sérialisés sans validation. Avec
+    `fields=`, seuls les champs demandés (prioritaire sur `view`).
     """
     loan_repository = LoanRepository(LoanModel, db)
+    if fields:
+        return FastJSONResponse(loan_repository.get_multi_fields(
+            selection=select_fields(LoanModel, Loan, fields), skip=skip, limit=limit
+        ))
+    if view == "summary":
+        return FastJSONResponse(loan_repository.get_multi_rows(
+            fields=list(LoanSummary.model_fields), skip=skip, limit=limit
+        ))
     book_repository = BookRepository(BookModel, db)
     user_repository = UserRepository(UserModel, db)
     service = LoanService(loan_repository, book_repository, user_repository)
@@ -47,17 +72,13 @@ def create_loan(
     """
     Crée un nouvel emprunt.
     """
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
-
     try:
-        loan = service.create_loan(
+        # Écriture groupée avec celles des autres requêtes si WRITE_COORDINATOR
+        loan = run_write(db, lambda session: loan_service(session).create_loan(
             user_id=user_id,
             book_id=book_id,
             loan_period_days=loan_period_days
-        )
+        ))
         return loan
     except ValueError as e:
         raise HTTPException(
@@ -69,7 +90,7 @@ def create_loan(
 @router.get("/{id}", response_model=Loan)
 def read_loan(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     id: int,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -108,13 +129,8 @@ def return_loan(
     """
     Marque un emprunt comme retourné.
     """
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
-
     try:
-        loan = service.return_loan(loan_id=id)
+        loan = run_write(db, lambda session: loan_service(session).return_loan(loan_id=id))
         return loan
     except ValueError as e:
         raise HTTPException(
@@ -134,13 +150,10 @@ def extend_loan(
     """
     Prolonge la durée d'un emprunt.
     """
-    loan_repository = LoanRepository(LoanModel, db)
-    book_repository = BookRepository(BookModel, db)
-    user_repository = UserRepository(UserModel, db)
-    service = LoanService(loan_repository, book_repository, user_repository)
-
     try:
-        loan = service.extend_loan(loan_id=id, extension_days=extension_days)
+        loan = run_write(db, lambda session: loan_service(session).extend_loan(
+            loan_id=id, extension_days=extension_days
+        ))
         return loan
     except ValueError as e:
         raise HTTPException(
@@ -151,7 +164,7 @@ def extend_loan(
 
 @router.get("/active/", response_model=List[Loan])
 def read_active_loans(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_admin_user)
 ) -> Any:
     """
@@ -168,7 +181,7 @@ def read_active_loans(
 
 @router.get("/overdue/", response_model=List[Loan])
 def read_overdue_loans(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user = Depends(get_current_admin_user)
 ) -> Any:
     """
@@ -186,7 +199,7 @@ def read_overdue_loans(
 @router.get("/user/{user_id}", response_model=List[Loan])
 def read_user_loans(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     user_id: int,
     current_user = Depends(get_current_active_user)
 ) -> Any:
@@ -212,7 +225,7 @@ def read_user_loans(
 @router.get("/book/{book_id}", response_model=List[Loan])
 def read_book_loans(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     book_id: int,
     current_user = Depends(get_current_admin_user)
 ) -> Any:
@@ -1,19 +1,24 @@
 # src/api/routes/stats.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
-from ...db.session import get_db
+from ...db.session import get_read_db
 from ...services.stats import StatsService
-from ..dependencies import get_current_admin_user
+from ...services.analytics import AnalyticsService, LoanSnapshot
+from ...services.recommendations import RecommendationService
+from ...utils.profiling import route_query_metrics
+from ...utils.slow_queries import slow_query_log
+from ..dependencies import conditional_get, get_current_active_user, get_current_admin_user
 
 router = APIRouter()
 
 
 @router.get("/general", response_model=Dict[str, Any])
 def get_general_stats(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_admin_user)
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_admin_user),
+    etag = Depends(conditional_get("book", "user", "loan"))
 ) -> Any:
     """
     Récupère des statistiques générales sur la bibliothèque.
@@ -24,38 +29,152 @@ def get_general_stats(
 
 @router.get("/most-borrowed-books", response_model=List[Dict[str, Any]])
 def get_most_borrowed_books(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = 10,
-    current_user = Depends(get_current_admin_user)
+    days: Optional[int] = Query(None, ge=1, le=365),
+    current_user = Depends(get_current_admin_user),
+    etag = Depends(conditional_get("book", "book_daily_loans"))
 ) -> Any:
     """
-    Récupère les livres les plus empruntés.
+    Récupère les livres les plus empruntés (éventuellement sur les `days` derniers jours).
     """
     service = StatsService(db)
-    return service.get_most_borrowed_books(limit=limit)
+    return service.get_most_borrowed_books(limit=limit, days=days)
 
 
 @router.get("/most-active-users", response_model=List[Dict[str, Any]])
 def get_most_active_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     limit: int = 10,
-    current_user = Depends(get_current_admin_user)
+    days: Optional[int] = Query(None, ge=1, le=365),
+    current_user = Depends(get_current_admin_user),
+    etag = Depends(conditional_get("user", "user_daily_loans"))
+) -> Any:
+    """
+    Récupère les utilisateurs les plus actifs (éventuellement sur les `days` derniers jours).
+    """
+    service = StatsService(db)
+    return service.get_most_active_users(limit=limit, days=days)
+
+
+@router.get("/trending", response_model=List[Dict[str, Any]])
+def get_trending_books(
+    db: Session = Depends(get_read_db),
+    limit: int = Query(10, ge=1, le=100),
+    current_user = Depends(get_current_active_user),
+    etag = Depends(conditional_get("book"))
 ) -> Any:
     """
-    Récupère les utilisateurs les plus actifs.
+    Récupère les livres populaires en ce moment.
     """
     service = StatsService(db)
-    return service.get_most_active_users(limit=limit)
+    return service.get_trending_books(limit=limit)
 
 
 @router.get("/monthly-loans", response_model=List[Dict[str, Any]])
 def get_monthly_loans(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     months: int = 12,
-    current_user = Depends(get_current_admin_user)
+    current_user = Depends(get_current_admin_user),
+    etag = Depends(conditional_get("loan"))
 ) -> Any:
     """
     Récupère le nombre d'emprunts par mois pour les derniers mois.
     """
     service = StatsService(db)
-    return service.get_monthly_loans(months=months)
\ No newline at end of file
+    return service.get_monthly_loans(months=months)
+
+
+def get_analytics_snapshot() -> LoanSnapshot:
+    """
+    Dépendance fournissant l'instantané analytique courant.
+    """
+    snapshot = AnalyticsService().get_snapshot()
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Aucun instantané analytique disponible, lancez POST /stats/analytics/refresh"
+        )
+    return snapshot
+
+
+@router.post("/analytics/refresh", response_model=Dict[str, Any])
+def refresh_analytics(
+    db: Session = Depends(get_read_db),
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Reconstruit l'instantané analytique à partir de la base de données.
+    """
+    return AnalyticsService().refresh(db)
+
+
+@router.post("/analytics/recommendations/refresh", response_model=Dict[str, Any])
+def refresh_recommendations(
+    db: Session = Depends(get_read_db),
+    full: bool = False,
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Met à jour l'index de recommandations avec les nouveaux emprunts
+    (ou le reconstruit entièrement si `full`).
+    """
+    return RecommendationService().refresh(db, full=full)
+
+
+@router.get("/analytics/return-latency", response_model=Dict[str, Any])
+def get_return_latency(
+    bins: Optional[List[float]] = Query(None),
+    snapshot: LoanSnapshot = Depends(get_analytics_snapshot),
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Récupère la distribution des délais de retour (histogramme et percentiles).
+    """
+    service = AnalyticsService()
+    if bins:
+        return service.get_return_latency(snapshot, bins=sorted(bins))
+    return service.get_return_latency(snapshot)
+
+
+@router.get("/analytics/late-returns-by-category", response_model=List[Dict[str, Any]])
+def get_late_returns_by_category(
+    snapshot: LoanSnapshot = Depends(get_analytics_snapshot),
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Récupère le taux de retours en retard par catégorie.
+    """
+    return AnalyticsService().get_late_returns_by_category(snapshot)
+
+
+@router.get("/analytics/seasonality", response_model=Dict[str, Any])
+def get_seasonality(
+    snapshot: LoanSnapshot = Depends(get_analytics_snapshot),
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Récupère la répartition des emprunts par mois et par jour de la semaine.
+    """
+    return AnalyticsService().get_seasonality(snapshot)
+
+
+@router.get("/query-profile", response_model=List[Dict[str, Any]])
+def get_query_profile(
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Récupère les requêtes SQL agrégées par route (nombre, temps, N+1 suspectés).
+    """
+    return route_query_metrics.snapshot()
+
+
+@router.get("/slow-queries", response_model=List[Dict[str, Any]])
+def get_slow_queries(
+    limit: int = Query(20, ge=1, le=100),
+    current_user = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Récupère les requêtes SQL les plus lentes, avec leur plan d'exécution.
+    """
+    return slow_query_log.snapshot()[:limit]
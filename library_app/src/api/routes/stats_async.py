@@ -0,0 +1,63 @@
+# Variantes asynchrones des statistiques les plus consultées (ASYNC_ROUTES)
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, List, Optional
+
+from ...db.session import get_async_db
+from ...services.stats import AsyncStatsService
+from ..dependencies import conditional_get_async, get_current_active_user_async, get_current_admin_user_async
+
+router = APIRouter()
+
+
+@router.get("/general", response_model=Dict[str, Any])
+async def get_general_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_admin_user_async),
+    etag = Depends(conditional_get_async("book", "user", "loan"))
+) -> Any:
+    """
+    Récupère des statistiques générales sur la bibliothèque.
+    """
+    return await AsyncStatsService(db).get_general_stats()
+
+
+@router.get("/most-borrowed-books", response_model=List[Dict[str, Any]])
+async def get_most_borrowed_books(
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = 10,
+    days: Optional[int] = Query(None, ge=1, le=365),
+    current_user = Depends(get_current_admin_user_async),
+    etag = Depends(conditional_get_async("book", "book_daily_loans"))
+) -> Any:
+    """
+    Récupère les livres les plus empruntés (éventuellement sur les `days` derniers jours).
+    """
+    return await AsyncStatsService(db).get_most_borrowed_books(limit=limit, days=days)
+
+
+@router.get("/most-active-users", response_model=List[Dict[str, Any]])
+async def get_most_active_users(
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = 10,
+    days: Optional[int] = Query(None, ge=1, le=365),
+    current_user = Depends(get_current_admin_user_async),
+    etag = Depends(conditional_get_async("user", "user_daily_loans"))
+) -> Any:
+    """
+    Récupère les utilisateurs les plus actifs (éventuellement sur les `days` derniers jours).
+    """
+    return await AsyncStatsService(db).get_most_active_users(limit=limit, days=days)
+
+
+@router.get("/trending", response_model=List[Dict[str, Any]])
+async def get_trending_books(
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(10, ge=1, le=100),
+    current_user = Depends(get_current_active_user_async),
+    etag = Depends(conditional_get_async("book"))
+) -> Any:
+    """
+    Récupère les livres populaires en ce moment.
+    """
+    return await AsyncStatsService(db).get_trending_books(limit=limit)
@@ -1,25 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List, Any
+from typing import List, Any, Optional
 
-from ...db.session import get_db
+from ...db.session import get_db, get_read_db
+from ...db.writer import run_write
 from ...models.users import User as UserModel
 from ..schemas.users import User, UserCreate, UserUpdate
 from ...repositories.users import UserRepository
 from ...services.users import UserService
-from ..dependencies import get_current_admin_user
+from ..dependencies import get_current_admin_user, sparse_fields
+from ...utils.fields import select_fields
+from ...utils.responses import FastJSONResponse
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[User])
 def read_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     skip: int = 0,
     limit: int = 100,
+    fields=Depends(sparse_fields(User)),
     current_user=Depends(get_current_admin_user)
 ) -> Any:
     repository = UserRepository(UserModel, db)
+    if fields:
+        # Seules les colonnes demandées sont lues en base
+        return FastJSONResponse(repository.get_multi_fields(
+            selection=select_fields(UserModel, User, fields), skip=skip, limit=limit
+        ))
     service = UserService(repository)
     users = service.get_multi(skip=skip, limit=limit)
     return users
@@ -32,11 +41,15 @@ def create_user(
     user_in: UserCreate,
     current_user=Depends(get_current_admin_user)
 ) -> Any:
-    repository = UserRepository(UserModel, db)
-    service = UserService(repository)
+    # bcrypt hors du thread écrivain
+    user_data = UserService.hash_password(user_in)
+
+    def create(session: Session) -> User:
+        service = UserService(UserRepository(UserModel, session))
+        return User.model_validate(service.create(obj_in=user_data), from_attributes=True)
+
     try:
-        user = service.create(user_in)
-        return user
+        return run_write(db, create)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -44,7 +57,7 @@ def create_user(
 @router.get("/{id}", response_model=User)
 def read_user(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     id: int,
     current_user=Depends(get_current_admin_user)
 ) -> Any:
@@ -64,17 +77,23 @@ def update_user(
     user_in: UserUpdate,
     current_user=Depends(get_current_admin_user)
 ) -> Any:
-    repository = UserRepository(UserModel, db)
-    service = UserService(repository)
-    user = service.get(id=id)
-    if not user:
-        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
+    # bcrypt hors du thread écrivain
+    update_data = UserService.hash_password(user_in, exclude_unset=True)
+
+    def update(session: Session) -> Optional[User]:
+        service = UserService(UserRepository(UserModel, session))
+        user = service.get(id=id)
+        if not user:
+            return None
+        return User.model_validate(service.update(db_obj=user, obj_in=update_data), from_attributes=True)
 
     try:
-        updated_user = service.update(user, user_in)
-        return updated_user
+        user = run_write(db, update)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    if not user:
+        raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
+    return user
 
 
 @router.delete("/{id}", response_model=User)
@@ -82,12 +101,21 @@ def delete_user(
     *,
     db: Session = Depends(get_db),
     id: int,
+    soft: bool = False,
     current_user=Depends(get_current_admin_user)
 ) -> Any:
-    repository = UserRepository(UserModel, db)
-    service = UserService(repository)
-    user = service.get(id=id)
+    """
+    Supprime un utilisateur et ses emprunts. Avec `soft`, l'utilisateur est
+    seulement marqué supprimé et ses emprunts sont archivés.
+    """
+    def delete(session: Session) -> Optional[User]:
+        service = UserService(UserRepository(UserModel, session))
+        if not service.get(id=id):
+            return None
+        user = service.soft_delete(id=id) if soft else service.remove(id=id)
+        return User.model_validate(user, from_attributes=True)
+
+    user = run_write(db, delete)
     if not user:
         raise HTTPException(status_code=404, detail="Utilisateur non trouvé")
-    deleted_user = service.remove(id=id)
-    return deleted_user
+    return user
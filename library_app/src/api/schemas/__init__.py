@@ -1,4 +1,4 @@
-from .books import Book, BookCreate, BookUpdate
+from .books import Book, BookCreate, BookSummary, BookUpdate
 from .users import User, UserCreate, UserUpdate
-from .loans import Loan, LoanCreate, LoanUpdate
+from .loans import Loan, LoanCreate, LoanSummary, LoanUpdate
 from .token import Token, TokenPayload
@@ -67,5 +67,19 @@ class BookInDBBase(BookBase):
         orm_mode = True
 
 
+class BookSummary(BaseModel):
+    """
+    Vue réduite d'un livre pour les listes (`view=summary`) : colonnes du
+    livre seulement, sans catégories ni popularité.
+    """
+    id: int
+    title: str
+    author: str
+    isbn: str
+    publication_year: int
+    quantity: int
+
+
 class Book(BookInDBBase):
-    categories: List[Category] = []
\ No newline at end of file
+    categories: List[Category] = []
+    popularity: float = Field(0.0, description="Popularité actuelle (emprunts récents, avec décroissance)")
\ No newline at end of file
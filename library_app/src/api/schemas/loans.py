@@ -37,6 +37,18 @@ class Loan(LoanInDBBase):
     pass
 
 
+class LoanSummary(BaseModel):
+    """
+    Vue réduite d'un emprunt pour les listes (`view=summary`).
+    """
+    id: int
+    user_id: int
+    book_id: int
+    loan_date: datetime
+    due_date: datetime
+    return_date: Optional[datetime] = None
+
+
 class LoanWithDetails(Loan): 
     user: User
     book: Book
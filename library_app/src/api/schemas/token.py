@@ -5,6 +5,13 @@ from typing import Union
 class Token(BaseModel):
     access_token: str
     token_type: str
+    # Durée de validité du token d'accès, en secondes
+    expires_in: Optional[int] = None
+    refresh_token: Optional[str] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenPayload (BaseModel) :
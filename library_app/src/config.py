@@ -1,14 +1,27 @@
 from pydantic import AnyHttpUrl
 from pydantic_settings import BaseSettings
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 import secrets
 
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Library Management System"
+    # Mode debug : en-têtes de diagnostic (X-Query-Count...) dans les réponses
+    DEBUG: bool = False
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = secrets.token_urlsafe(32)
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 jours
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    # Les clients renouvellent leur token d'accès via /auth/refresh
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+
+    # Hachage bcrypt : processus dédiés et taille de la file d'attente (0 = sans pool)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10.0
+
+    # Cache des utilisateurs authentifiés (évite un SELECT user par requête)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_SIZE: int = 10000
 
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = ["http://localhost:8000", "http://localhost:5500", "http://127.0.0.1:5500"]
@@ -16,6 +29,67 @@ class Settings(BaseSettings):
     # Base de données
     DATABASE_URL: str = "sqlite:///./library.db"
     SQL_ECHO: bool = False
+    # Profil SQLite (voir db/sqlite.py : default, production, durable) et
+    # surcharges éventuelles, ex. SQLITE_PRAGMAS='{"busy_timeout": 10000}'
+    SQLITE_PROFILE: str = "production"
+    SQLITE_PRAGMAS: Dict[str, Union[int, str]] = {}
+    # Pool de connexions
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    # Lectures (routes GET, statistiques) sur un pool distinct, en lecture seule :
+    # DATABASE_READ_URL (réplique) ou, pour SQLite, le même fichier ouvert en mode=ro
+    DB_READ_ROUTING: bool = True
+    DATABASE_READ_URL: Optional[str] = None
+    DB_READ_POOL_SIZE: int = 10
+    # Écritures groupées : un thread écrivain unique valide les opérations de
+    # plusieurs requêtes dans une même transaction (un commit, un fsync par lot)
+    WRITE_COORDINATOR: bool = False
+    WRITE_BATCH_SIZE: int = 64
+    WRITE_BATCH_WAIT_MS: float = 2.0
+    WRITE_TIMEOUT_SECONDS: float = 30.0
+    # Pile asynchrone (AsyncSession) pour les routes de lecture les plus sollicitées ;
+    # l'URL est dérivée de DATABASE_URL si absente (sqlite -> sqlite+aiosqlite)
+    ASYNC_ROUTES: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Journalisation (JSON, écrite par un thread dédié)
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE: Optional[str] = "logs/library.log"
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 5
+    # Requêtes SQL : DEBUG pour journaliser un échantillon de toutes les requêtes
+    SQL_LOG_LEVEL: str = "WARNING"
+    SQL_LOG_SAMPLE_RATE: float = 0.01
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    # Requêtes lentes : nombre d'empreintes conservées, capture du plan d'exécution
+    SLOW_QUERY_LOG_SIZE: int = 50
+    SLOW_QUERY_EXPLAIN: bool = True
+    # Comptage des requêtes SQL par requête HTTP et détection des N+1
+    QUERY_PROFILING: bool = True
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Compression des réponses (br si le module brotli est installé, sinon gzip) :
+    # taille minimale en octets et types de contenu compressés ("text/" = préfixe)
+    COMPRESSION: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_TYPES: List[str] = [
+        "application/json", "application/javascript", "image/svg+xml", "text/",
+    ]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # GET conditionnels (ETag, 304) : les réponses qui dépendent de l'heure sont
+    # revalidées au moins une fois par période (0 : seulement après une écriture)
+    ETAG_PERIOD_SECONDS: int = 60
+
+    # Tendances : demi-vie de la popularité des livres
+    TRENDING_HALF_LIFE_DAYS: float = 7.0
+
+    # Analyses : répertoire des instantanés NumPy de l'historique des emprunts
+    ANALYTICS_DIR: str = "./analytics"
+    # Recommandations : nombre de voisins conservés par livre
+    RECOMMENDATIONS_TOP_N: int = 10
 
     class Config:
         case_sensitive = True
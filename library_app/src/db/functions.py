@@ -0,0 +1,85 @@
+from sqlalchemy import Float, String, func, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class month_bucket(FunctionElement):
+    """
+    Tronque une date au mois et la formate en texte 'YYYY-MM'.
+
+    L'expression SQL est générée selon le dialecte (strftime pour SQLite,
+    to_char pour PostgreSQL), ce qui permet d'utiliser les mêmes requêtes
+    de statistiques sur les deux moteurs.
+    """
+    type = String()
+    name = "month_bucket"
+    inherit_cache = True
+
+
+class day_bucket(FunctionElement):
+    """
+    Tronque une date au jour et la formate en texte 'YYYY-MM-DD'.
+    """
+    type = String()
+    name = "day_bucket"
+    inherit_cache = True
+
+
+# Les formats sont rendus en littéraux (et non en paramètres liés) afin que
+# l'expression du SELECT et celle du GROUP BY soient identiques : PostgreSQL
+# refuse de regrouper sur deux expressions dont les paramètres diffèrent.
+_SQLITE_FORMATS = {
+    "month_bucket": "'%Y-%m'",
+    "day_bucket": "'%Y-%m-%d'",
+}
+
+_POSTGRESQL_FORMATS = {
+    "month_bucket": "'YYYY-MM'",
+    "day_bucket": "'YYYY-MM-DD'",
+}
+
+
+@compiles(month_bucket)
+@compiles(day_bucket)
+def _compile_bucket_sqlite(element, compiler, **kw):
+    (expr,) = element.clauses
+    fmt = literal_column(_SQLITE_FORMATS[element.name])
+    return compiler.process(func.strftime(fmt, expr), **kw)
+
+
+@compiles(month_bucket, "postgresql")
+@compiles(day_bucket, "postgresql")
+def _compile_bucket_postgresql(element, compiler, **kw):
+    (expr,) = element.clauses
+    fmt = literal_column(_POSTGRESQL_FORMATS[element.name])
+    return compiler.process(func.to_char(expr, fmt), **kw)
+
+
+class log_add_exp(FunctionElement):
+    """
+    log(exp(a) + exp(b)) calculé sans débordement :
+    max(a, b) + ln(1 + exp(-|a - b|)).
+
+    Sous SQLite, exp et ln exigent une version 3.35 ou plus récente compilée
+    avec les fonctions mathématiques (cas du module sqlite3 de Python).
+    """
+    type = Float()
+    name = "log_add_exp"
+    inherit_cache = True
+
+
+def _log_add_exp(element, compiler, greatest, **kw):
+    a, b = element.clauses
+    expr = greatest(a, b) + func.ln(1 + func.exp(-func.abs(a - b)))
+    return compiler.process(expr, **kw)
+
+
+@compiles(log_add_exp)
+def _compile_log_add_exp(element, compiler, **kw):
+    return _log_add_exp(element, compiler, func.greatest, **kw)
+
+
+@compiles(log_add_exp, "sqlite")
+def _compile_log_add_exp_sqlite(element, compiler, **kw):
+    # max() à plusieurs arguments est le maximum scalaire sous SQLite
+    return _log_add_exp(element, compiler, func.max, **kw)
@@ -8,6 +8,7 @@ from ..models.users import User
 from ..models.books import Book
 from ..models.loans import Loan
 from ..models.categories import Category
+from ..repositories.loans import LoanRepository
 from ..utils.security import get_password_hash
 
 logger = logging.getLogger(__name__)
@@ -146,6 +147,9 @@ def init_db(db: Session) -> None:
     book2 = db.query(Book).filter(Book.isbn == "9780618640157").first()
 
     if book1 and book2 and user:
+        # Les compteurs, scores de tendance et agrégats quotidiens suivent les emprunts créés
+        loan_repository = LoanRepository(Loan, db)
+
         # Emprunt actif
         loan1 = db.query(Loan).filter(
             Loan.user_id == user.id,
@@ -164,6 +168,7 @@ def init_db(db: Session) -> None:
             }
             loan1 = Loan(**loan1_data)
             db.add(loan1)
+            loan_repository.record_checkout(loan=loan1)
 
             # Mettre à jour la quantité
             book1.quantity -= 1
@@ -187,6 +192,7 @@ def init_db(db: Session) -> None:
             }
             loan2 = Loan(**loan2_data)
             db.add(loan2)
+            loan_repository.record_checkout(loan=loan2)
 
         db.commit()
         logger.info("Emprunts créés")
\ No newline at end of file
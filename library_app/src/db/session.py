@@ -1,21 +1,93 @@
+import time
+from typing import AsyncIterator, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from ..config import settings
-from ..utils import logging
+from .sqlite import apply_sqlite_pragmas, read_only_pragmas, sqlite_pragmas, sqlite_read_only_url
+from ..utils.logging import instrument_engine
+from ..utils.metrics import db_pool_checkout_seconds, db_pool_connections_in_use
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool qui mesure l'attente pour obtenir une connexion.
+    """
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            db_pool_checkout_seconds.observe(time.perf_counter() - start)
+
 
 # Création de l'URL de connexion à partir des paramètres de configuration
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    # Pour SQLite, il est nécessaire d'activer le support des clés étrangères
-    connect_args={"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {},
-    echo=settings.SQL_ECHO  # Activer l'écho SQL en fonction de la configuration
-)
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+IN_MEMORY = ":memory:" in SQLALCHEMY_DATABASE_URL
+
+
+def build_engine(url: str, *, pool_size: int, read_only: bool = False) -> Engine:
+    """
+    Moteur synchrone avec le pool, les PRAGMA SQLite et l'instrumentation
+    de l'application.
+    """
+    is_sqlite = url.startswith("sqlite")
+    db_engine = create_engine(
+        url,
+        # Les connexions SQLite sont partagées entre les threads du pool
+        connect_args={"check_same_thread": False} if is_sqlite else {},
+        echo=settings.SQL_ECHO,  # Activer l'écho SQL en fonction de la configuration
+        # SQLite en mémoire garde sa connexion unique par thread
+        **({} if ":memory:" in url else {
+            "poolclass": TimedQueuePool,
+            "pool_size": pool_size,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+        })
+    )
+    if is_sqlite:
+        pragmas = sqlite_pragmas(settings.SQLITE_PROFILE, settings.SQLITE_PRAGMAS)
+        apply_sqlite_pragmas(db_engine, read_only_pragmas(pragmas) if read_only else pragmas)
+    instrument_engine(db_engine)
+    return db_engine
+
+
+def read_database_url() -> Optional[str]:
+    """
+    URL du pool de lecture : DATABASE_READ_URL, sinon le fichier SQLite en
+    lecture seule. None si les lectures restent sur le pool principal.
+    """
+    if not settings.DB_READ_ROUTING:
+        return None
+    if settings.DATABASE_READ_URL:
+        return settings.DATABASE_READ_URL
+    if IS_SQLITE:
+        return sqlite_read_only_url(SQLALCHEMY_DATABASE_URL)
+    return None
+
+
+engine = build_engine(SQLALCHEMY_DATABASE_URL, pool_size=settings.DB_POOL_SIZE)
+if isinstance(engine.pool, QueuePool):
+    db_pool_connections_in_use.set_function(engine.pool.checkedout)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Pool de lecture : les requêtes longues (statistiques) n'occupent pas les
+# connexions des écritures. Sur une réplique, les lectures peuvent être en
+# retard sur les écritures ; en SQLite (WAL), elles voient les derniers commits.
+READ_DATABASE_URL = read_database_url()
+read_engine = (
+    build_engine(READ_DATABASE_URL, pool_size=settings.DB_READ_POOL_SIZE, read_only=True)
+    if READ_DATABASE_URL else engine
+)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 Base = declarative_base()
 
 # Dependency to get the database session
@@ -25,3 +97,80 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """
+    Dépendance fournissant une session du pool de lecture (routes GET).
+    Les repositories s'utilisent à l'identique ; une écriture y échoue.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Drivers asynchrones correspondant aux URL synchrones
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def async_database_url(url: str) -> str:
+    """
+    URL asynchrone équivalente à `url` (ex. sqlite:/// -> sqlite+aiosqlite:///).
+    """
+    scheme, rest = url.split(":", 1)
+    return ASYNC_DRIVERS.get(scheme, scheme) + ":" + rest
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Moteur asynchrone, créé à la première utilisation avec les mêmes réglages
+    (PRAGMA SQLite, pool, instrumentation) que le moteur synchrone.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = settings.ASYNC_DATABASE_URL or async_database_url(SQLALCHEMY_DATABASE_URL)
+        _async_engine = create_async_engine(
+            url,
+            echo=settings.SQL_ECHO,
+            **({} if IN_MEMORY else {
+                "pool_size": settings.DB_POOL_SIZE,
+                "max_overflow": settings.DB_MAX_OVERFLOW,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+            })
+        )
+        if url.startswith("sqlite"):
+            apply_sqlite_pragmas(
+                _async_engine.sync_engine,
+                sqlite_pragmas(settings.SQLITE_PROFILE, settings.SQLITE_PRAGMAS),
+            )
+        instrument_engine(_async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_engine
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dépendance fournissant une session asynchrone.
+    """
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """
+    Ferme les connexions du moteur asynchrone (à l'arrêt), s'il a été créé.
+    """
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
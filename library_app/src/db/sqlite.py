@@ -0,0 +1,89 @@
+import re
+from typing import Any, Dict, Mapping, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Profils de réglage SQLite, appliqués par PRAGMA à chaque nouvelle connexion
+SQLITE_PROFILES: Dict[str, Dict[str, Union[str, int]]] = {
+    # Réglages par défaut de SQLite (journal rollback, synchronous=FULL...)
+    "default": {},
+    # Lecteurs concurrents d'un écrivain (WAL), fsync seulement aux checkpoints
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -20000,  # négatif : en Kio (20 Mo)
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+    # Comme production, mais chaque commit est synchronisé sur disque
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+        "cache_size": -20000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    },
+}
+
+# PRAGMA enregistrés dans le fichier : fixés par les connexions en écriture
+# seulement (une connexion mode=ro ne peut pas passer la base en WAL)
+PERSISTENT_PRAGMAS = ("journal_mode",)
+
+_PRAGMA_NAME = re.compile(r"^[a-z_]+$")
+_PRAGMA_VALUE = re.compile(r"^-?\w+$")
+
+
+def sqlite_pragmas(profile: str, overrides: Mapping[str, Any] = None) -> Dict[str, Union[str, int]]:
+    """
+    PRAGMA du profil `profile`, complétés ou remplacés par `overrides`.
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(
+            "Profil SQLite inconnu : %s (attendu : %s)" % (profile, ", ".join(SQLITE_PROFILES))
+        )
+    pragmas = dict(SQLITE_PROFILES[profile])
+    pragmas.update(overrides or {})
+    for name, value in pragmas.items():
+        if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(str(value)):
+            raise ValueError("PRAGMA invalide : %s=%s" % (name, value))
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Mapping[str, Union[str, int]]) -> None:
+    """
+    Exécute les PRAGMA à l'ouverture de chaque connexion DBAPI du moteur.
+    """
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute("PRAGMA %s=%s" % (name, value))
+        finally:
+            cursor.close()
+
+
+def sqlite_read_only_url(url: str) -> Optional[str]:
+    """
+    URL ouvrant le même fichier SQLite en lecture seule (URI `mode=ro`),
+    ou None pour une base en mémoire.
+    """
+    prefix, _, path = url.partition(":///")
+    if not path or path.startswith(":memory:") or path.startswith("file:"):
+        return None
+    return "%s:///file:%s?mode=ro&uri=true" % (prefix, path)
+
+
+def read_only_pragmas(pragmas: Mapping[str, Union[str, int]]) -> Dict[str, Union[str, int]]:
+    """
+    PRAGMA applicables à une connexion en lecture seule.
+    """
+    return {name: value for name, value in pragmas.items() if name not in PERSISTENT_PRAGMAS}
@@ -0,0 +1,99 @@
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from typing import Callable, Hashable, Iterator, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..utils.cache import invalidate_cache
+
+# Profondeur d'imbrication des unités de travail, dans session.info
+UNIT_OF_WORK_KEY = "unit_of_work_depth"
+# Session dont commit() ne valide pas (lot du thread écrivain), dans session.info
+DEFERRED_COMMIT_KEY = "deferred_commit"
+# Actions à exécuter au prochain commit (invalidations de caches), dans session.info
+PENDING_ON_COMMIT_KEY = "pending_on_commit"
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Regroupe les écritures des repositories en une seule transaction.
+
+    Dans le bloc, les repositories se contentent d'envoyer leurs
+    modifications (flush) sans valider ni recharger les objets ; le commit a
+    lieu une fois, à la sortie du bloc le plus extérieur, et toute exception
+    annule l'ensemble. Les blocs imbriqués rejoignent la transaction du bloc
+    englobant.
+    """
+    depth = db.info.get(UNIT_OF_WORK_KEY, 0)
+    db.info[UNIT_OF_WORK_KEY] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            db.commit()
+    except BaseException:
+        if depth == 0:
+            db.rollback()
+        raise
+    finally:
+        db.info[UNIT_OF_WORK_KEY] = depth
+
+
+def in_unit_of_work(db: Session) -> bool:
+    """
+    Indique si la session est dans un bloc unit_of_work.
+    """
+    return db.info.get(UNIT_OF_WORK_KEY, 0) > 0
+
+
+def on_commit(db: Session, key: Hashable, action: Callable[[], None]) -> None:
+    """
+    Exécute `action` une fois les écritures de la session validées : tout
+    de suite hors d'un bloc unit_of_work, au commit sinon (bloc ou lot du
+    thread écrivain), jamais si la transaction est annulée. Une seule action
+    par `key` et par transaction.
+
+    Sert aux invalidations de caches en mémoire : invalider dès le flush
+    laisserait un lecteur concurrent remettre en cache les données d'avant
+    le commit, jusqu'à expiration.
+    """
+    if in_unit_of_work(db) or db.info.get(DEFERRED_COMMIT_KEY):
+        db.info.setdefault(PENDING_ON_COMMIT_KEY, {})[key] = action
+    else:
+        action()
+
+
+def invalidate_cache_on_commit(db: Session, prefix: str) -> None:
+    """
+    Invalide le cache `prefix` une fois les écritures de la session validées.
+    """
+    on_commit(db, ("cache", prefix), partial(invalidate_cache, prefix))
+
+
+@event.listens_for(Session, "after_commit")
+def run_pending_actions(session: Session) -> None:
+    for action in session.info.pop(PENDING_ON_COMMIT_KEY, {}).values():
+        action()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def forget_pending_actions(session: Session, transaction) -> None:
+    # Transaction annulée : les données en cache restent valides
+    if transaction.parent is None:
+        session.info.pop(PENDING_ON_COMMIT_KEY, None)
+
+
+@lru_cache(maxsize=None)
+def has_server_generated_columns(model: Type) -> bool:
+    """
+    Indique si le modèle a des colonnes calculées par la base (valeur par
+    défaut côté serveur sans équivalent Python, mise à jour côté serveur,
+    colonne calculée) : leur valeur n'est connue qu'après un rechargement.
+    """
+    for column in inspect(model).columns:
+        if column.server_onupdate is not None or column.computed is not None:
+            return True
+        if column.server_default is not None and column.default is None:
+            return True
+    return False
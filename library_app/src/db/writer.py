@@ -0,0 +1,204 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..config import settings
+from ..utils.metrics import db_write_batch_size
+from .session import SQLALCHEMY_DATABASE_URL, build_engine
+from .unit_of_work import DEFERRED_COMMIT_KEY
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Job = Tuple[Callable[[Session], object], Future]
+
+
+class BatchSession(Session):
+    """
+    Session du thread écrivain : le commit() appelé par les repositories
+    n'envoie que les modifications (flush) et rollback() n'annule que
+    l'opération en cours ; le WriteCoordinator valide le lot entier avec
+    commit_batch().
+    """
+    def commit(self) -> None:
+        self.flush()
+
+    def rollback(self) -> None:
+        savepoint = self.get_nested_transaction()
+        if savepoint is not None:
+            savepoint.rollback()
+        else:
+            super().rollback()
+
+    def commit_batch(self) -> None:
+        super().commit()
+
+
+def use_immediate_transactions(engine: Engine) -> None:
+    """
+    Transactions explicites sur SQLite : le pilote sqlite3 n'émet pas de
+    BEGIN avant un SAVEPOINT, qui validerait alors chaque opération du lot
+    séparément. BEGIN IMMEDIATE prend le verrou d'écriture dès le début.
+    """
+    @event.listens_for(engine, "connect")
+    def disable_implicit_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+class WriteCoordinator:
+    """
+    Thread écrivain unique avec validation groupée (group commit).
+
+    Les requêtes soumettent des opérations `operation(session)` ; le thread
+    les regroupe (jusqu'à `max_batch`, en attendant au plus `max_wait_ms`
+    après la première) et les exécute dans une même transaction, chacune
+    dans un SAVEPOINT : une opération qui échoue est annulée seule et son
+    exception est renvoyée à sa requête. Un seul commit (et un seul fsync)
+    par lot au lieu d'un par requête.
+    """
+    def __init__(self, engine: Engine, *, max_batch: int = 64, max_wait_ms: float = 2.0):
+        if engine.dialect.name == "sqlite":
+            use_immediate_transactions(engine)
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._session_factory = sessionmaker(
+            bind=engine, class_=BatchSession, autoflush=False, expire_on_commit=False,
+            info={DEFERRED_COMMIT_KEY: True},
+        )
+        self._jobs: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, operation: Callable[[Session], T], timeout: Optional[float] = None) -> T:
+        """
+        Exécute `operation` dans le prochain lot et retourne son résultat
+        (ou lève son exception) une fois le lot validé.
+        """
+        future: Future = Future()
+        self._ensure_started()
+        self._jobs.put((operation, future))
+        return future.result(timeout=timeout)
+
+    def stop(self) -> None:
+        """
+        Termine les lots en cours puis arrête le thread écrivain.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._jobs.put(None)
+            thread.join()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            batch = [job]
+            deadline = time.monotonic() + self.max_wait
+            stopping = False
+            while len(batch) < self.max_batch:
+                try:
+                    job = self._jobs.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+            self._execute(batch)
+            if stopping:
+                return
+
+    def _execute(self, batch: List[Job]) -> None:
+        session = self._session_factory()
+        succeeded = []
+        try:
+            for operation, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                savepoint = session.begin_nested()
+                try:
+                    result = operation(session)
+                    if savepoint.is_active:
+                        savepoint.commit()
+                except Exception as e:
+                    # Annulé par l'opération elle-même, sinon par nous (y compris après un flush en échec)
+                    if session.get_nested_transaction() is savepoint:
+                        savepoint.rollback()
+                    future.set_exception(e)
+                else:
+                    succeeded.append((future, result))
+            session.commit_batch()
+        except Exception as e:
+            logger.exception("Échec de la validation d'un lot de %d écritures", len(batch))
+            session.rollback()
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            db_write_batch_size.observe(len(succeeded))
+            for future, result in succeeded:
+                future.set_result(result)
+        finally:
+            session.close()
+
+
+_coordinator: Optional[WriteCoordinator] = None
+_coordinator_lock = threading.Lock()
+
+
+def get_write_coordinator() -> WriteCoordinator:
+    """
+    Coordinateur de l'application, avec son propre moteur à une connexion.
+    """
+    global _coordinator
+    with _coordinator_lock:
+        if _coordinator is None:
+            _coordinator = WriteCoordinator(
+                build_engine(SQLALCHEMY_DATABASE_URL, pool_size=1),
+                max_batch=settings.WRITE_BATCH_SIZE,
+                max_wait_ms=settings.WRITE_BATCH_WAIT_MS,
+            )
+        return _coordinator
+
+
+def stop_write_coordinator() -> None:
+    """
+    Arrête le thread écrivain s'il a été démarré (à l'arrêt de l'application).
+    """
+    global _coordinator
+    with _coordinator_lock:
+        coordinator, _coordinator = _coordinator, None
+    if coordinator is not None:
+        coordinator.stop()
+        coordinator.engine.dispose()
+
+
+def run_write(db: Session, operation: Callable[[Session], T]) -> T:
+    """
+    Exécute une opération d'écriture : dans un lot du thread écrivain si
+    WRITE_COORDINATOR est activé, sinon directement sur la session `db` de
+    la requête.
+    """
+    if settings.WRITE_COORDINATOR:
+        return get_write_coordinator().submit(operation, timeout=settings.WRITE_TIMEOUT_SECONDS)
+    return operation(db)
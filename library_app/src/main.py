@@ -1,13 +1,29 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from .config import settings
 from .api.routes import api_router
-from .models import base, books, users, loans  # Importer les modèles pour Alembic
+from .db.session import dispose_async_engine
+from .db.writer import stop_write_coordinator
+from .api.middleware import (
+    CompressionMiddleware,
+    ETagMiddleware,
+    MetricsMiddleware,
+    QueryProfilingMiddleware,
+    RequestContextMiddleware,
+)
+from .utils.logging import setup_logging, shutdown_logging
+from .utils.metrics import registry
+from .utils.responses import FastJSONResponse
+from .utils.security import PasswordHashingBusy, password_hasher
+from .models import base, books, users, loans, stats, tokens, versions  # Importer les modèles pour Alembic
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    # Réponses sérialisées par orjson (ou pydantic-core) plutôt que par json
+    default_response_class=FastJSONResponse,
 )
 
 # CORS settings
@@ -20,9 +36,58 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Au plus près de l'application : la durée mesurée inclut la compression
+app.add_middleware(ETagMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryProfilingMiddleware)
+app.add_middleware(RequestContextMiddleware)
+
+
+@app.exception_handler(PasswordHashingBusy)
+def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    # Trop de connexions simultanées : on refuse plutôt que de bloquer les autres requêtes
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Trop de tentatives de connexion simultanées, réessayez dans un instant"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.on_event("startup")
+def start_logging():
+    setup_logging()
+
+
+@app.on_event("shutdown")
+def shutdown_password_hasher():
+    password_hasher.shutdown()
+
+
+@app.on_event("shutdown")
+def stop_writer():
+    stop_write_coordinator()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engine()
+
+
+@app.on_event("shutdown")
+def stop_logging():
+    shutdown_logging()
+
+
 # Inclusion des routes API
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Library Management System API"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    # Format texte de Prometheus ; route asynchrone pour lire l'état du threadpool
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
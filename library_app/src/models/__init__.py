@@ -2,5 +2,8 @@ from .base import Base
 from .categories import Category
 from .books import Book
 from .users import User
-from .loans import Loan
+from .loans import Loan, LoanArchive
 
+from .stats import BookDailyLoans, UserDailyLoans
+from .tokens import RefreshToken
+from .versions import TableVersion
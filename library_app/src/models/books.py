@@ -1,11 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, Index, CheckConstraint
+from sqlalchemy import Column, Integer, Float, String, Text, Index, CheckConstraint
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 from .base import Base
+from .soft_delete import SoftDeleteMixin
 from .categories import book_category
+from ..utils.trending import current_popularity
 
-class Book(Base):
+class Book(SoftDeleteMixin, Base):
     title = Column(String(100), nullable=False, index=True)
     author = Column(String(100), nullable=False, index=True)
     isbn = Column(String(13), nullable=False, unique=True, index=True)
@@ -15,6 +18,10 @@ class Book(Base):
     publisher = Column(String(100), nullable=True)
     language = Column(String(50), nullable=True)
     pages = Column(Integer, nullable=True)
+    # Compteur d'emprunts maintenu à chaque emprunt (classements sans parcourir loan)
+    loan_count = Column(Integer, nullable=False, default=0, server_default="0", index=True)
+    # Score de tendance logarithmique (voir utils.trending), 0 = jamais emprunté
+    trending_score = Column(Float, nullable=False, default=0.0, server_default="0", index=True)
 
     # Contraintes
     __table_args__ = (
@@ -26,7 +33,20 @@ class Book(Base):
     )
 
     # Relations
-    loans = relationship("Loan", back_populates="book", cascade="all, delete-orphan")
+    # passive_deletes : la base supprime les emprunts (ON DELETE CASCADE), sans les charger
+    loans = relationship("Loan", back_populates="book", cascade="all, delete-orphan", passive_deletes=True)
     # categories = relationship("BookCategory", back_populates="book", cascade="all, delete-orphan")  
-    categories = relationship("Category", secondary=book_category, back_populates="books")
-  
\ No newline at end of file
+    categories = relationship("Category", secondary=book_category, back_populates="books", passive_deletes=True)
+
+    @hybrid_property
+    def popularity(self) -> float:
+        """
+        Popularité actuelle, décroissance appliquée à la lecture.
+        """
+        return current_popularity(self.trending_score)
+
+    @popularity.expression
+    def popularity(cls):
+        # Le score stocké est ordonné comme la popularité actuelle : le tri
+        # (sort_by=popularity) se fait en SQL sur la colonne indexée
+        return cls.trending_score
@@ -7,8 +7,8 @@ from .base import Base
 book_category = Table(
     "book_category",
     Base.metadata,
-    Column("book_id", Integer, ForeignKey("book.id"), primary_key=True),
-    Column("category_id", Integer, ForeignKey("category.id"), primary_key=True),
+    Column("book_id", Integer, ForeignKey("book.id", ondelete="CASCADE"), primary_key=True),
+    Column("category_id", Integer, ForeignKey("category.id", ondelete="CASCADE"), primary_key=True),
 )
 
 
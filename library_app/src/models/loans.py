@@ -6,8 +6,8 @@ from .base import Base
 
 
 class Loan(Base):
-    user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
-    book_id = Column(Integer, ForeignKey("book.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    book_id = Column(Integer, ForeignKey("book.id", ondelete="CASCADE"), nullable=False)
     loan_date = Column(DateTime, default=datetime.utcnow, nullable=False)
     return_date = Column(DateTime, nullable=True)
     due_date = Column(DateTime, nullable=False)
@@ -21,8 +21,30 @@ class Loan(Base):
         Index('idx_loan_user_id', 'user_id'),
         Index('idx_loan_book_id', 'book_id'),
         Index('idx_loan_return_date', 'return_date'),
+        # Index pour les statistiques par période (filtre sur loan_date)
+        Index('idx_loan_loan_date', 'loan_date'),
     )
 
     # Relations
     user = relationship("User", back_populates="loans")
-    book = relationship("Book", back_populates="loans")
\ No newline at end of file
+    book = relationship("Book", back_populates="loans")
+
+
+class LoanArchive(Base):
+    """
+    Historique des emprunts d'un livre ou d'un utilisateur supprimé
+    logiquement. Même ID que l'emprunt d'origine ; sans clé étrangère, pour
+    survivre à la suppression définitive du livre ou de l'utilisateur.
+    """
+    user_id = Column(Integer, nullable=False)
+    book_id = Column(Integer, nullable=False)
+    loan_date = Column(DateTime, nullable=False)
+    return_date = Column(DateTime, nullable=True)
+    due_date = Column(DateTime, nullable=False)
+    extended = Column(Boolean, default=False, nullable=False)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('idx_loan_archive_user_id', 'user_id'),
+        Index('idx_loan_archive_book_id', 'book_id'),
+    )
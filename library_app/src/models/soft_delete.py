@@ -0,0 +1,51 @@
+from typing import Type
+
+from sqlalchemy import Column, DateTime, event
+from sqlalchemy.orm import ORMExecuteState, Session, with_loader_criteria
+from sqlalchemy.sql import Select
+
+# Option d'exécution qui inclut les lignes supprimées logiquement
+INCLUDE_DELETED = "include_deleted"
+# Option d'exécution d'une requête qui applique elle-même le filtre
+SOFT_DELETE_FILTERED = "soft_delete_filtered"
+
+
+class SoftDeleteMixin:
+    """
+    Suppression logique : une ligne dont deleted_at est renseigné est exclue
+    de toutes les requêtes ORM de sélection (y compris les jointures et les
+    relations), sauf avec l'option d'exécution `include_deleted=True`.
+    """
+    deleted_at = Column(DateTime, nullable=True, index=True)
+
+    @property
+    def is_deleted(self) -> bool:
+        return self.deleted_at is not None
+
+
+def exclude_deleted_rows(statement: Select, model: Type) -> Select:
+    """
+    Applique directement à `statement` (SELECT d'une seule entité, sans
+    jointure) le filtre deleted_at IS NULL si `model` est un SoftDeleteMixin,
+    et le marque : le hook ne le réécrit plus à chaque exécution, une requête
+    construite une fois garde ainsi sa clé de cache (calculée une seule fois).
+    """
+    if issubclass(model, SoftDeleteMixin):
+        statement = statement.where(model.deleted_at.is_(None))
+    return statement.execution_options(**{SOFT_DELETE_FILTERED: True})
+
+
+@event.listens_for(Session, "do_orm_execute")
+def exclude_soft_deleted(execute_state: ORMExecuteState) -> None:
+    # Les rechargements d'attributs (après commit) portent sur un objet déjà
+    # chargé : ils ne doivent pas échouer s'il vient d'être supprimé
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get(INCLUDE_DELETED, False)
+        and not execute_state.execution_options.get(SOFT_DELETE_FILTERED, False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, UniqueConstraint, Index
+
+from .base import Base
+
+
+class BookDailyLoans(Base):
+    """
+    Agrégat quotidien du nombre d'emprunts par livre.
+    """
+    day = Column(Date, nullable=False)
+    book_id = Column(Integer, ForeignKey("book.id", ondelete="CASCADE"), nullable=False)
+    loan_count = Column(Integer, nullable=False, default=0)
+
+    # Contraintes
+    __table_args__ = (
+        UniqueConstraint('day', 'book_id', name='uq_book_daily_loans_day_book'),
+        Index('idx_book_daily_loans_book_id', 'book_id'),
+    )
+
+
+class UserDailyLoans(Base):
+    """
+    Agrégat quotidien du nombre d'emprunts par utilisateur.
+    """
+    day = Column(Date, nullable=False)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    loan_count = Column(Integer, nullable=False, default=0)
+
+    # Contraintes
+    __table_args__ = (
+        UniqueConstraint('day', 'user_id', name='uq_user_daily_loans_day_user'),
+        Index('idx_user_daily_loans_user_id', 'user_id'),
+    )
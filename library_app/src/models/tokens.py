@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+
+from .base import Base
+
+
+class RefreshToken(Base):
+    """
+    Jeton de rafraîchissement. Seule l'empreinte SHA-256 du jeton est stockée.
+    """
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False, unique=True, index=True)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+
+    # Relations
+    user = relationship("User", back_populates="refresh_tokens")
@@ -1,10 +1,11 @@
-from sqlalchemy import Column, String, Boolean, CheckConstraint
+from sqlalchemy import Column, Integer, String, Boolean, CheckConstraint
 from sqlalchemy.orm import relationship
 
 from .base import Base
+from .soft_delete import SoftDeleteMixin
 
 
-class User(Base):
+class User(SoftDeleteMixin, Base):
     email = Column(String(100), nullable=False, unique=True, index=True)
     hashed_password = Column(String(100), nullable=False)
     full_name = Column(String(100), nullable=False)
@@ -12,6 +13,8 @@ class User(Base):
     is_admin = Column(Boolean, default=False, nullable=False)
     phone = Column(String(20), nullable=True)
     address = Column(String(200), nullable=True)
+    # Compteur d'emprunts maintenu à chaque emprunt (classements sans parcourir loan)
+    loan_count = Column(Integer, nullable=False, default=0, server_default="0", index=True)
 
     # Contraintes
     __table_args__ = (
@@ -19,4 +22,6 @@ class User(Base):
     )
 
     # Relations
-    loans = relationship("Loan", back_populates="user", cascade="all, delete-orphan")
+    # passive_deletes : la base supprime emprunts et jetons (ON DELETE CASCADE), sans les charger
+    loans = relationship("Loan", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
@@ -0,0 +1,127 @@
+from itertools import chain
+from typing import Dict, Iterable
+
+from sqlalchemy import Column, Integer, String, bindparam, event, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from .base import Base
+
+# Tables modifiées dans la transaction en cours, dans session.info
+MODIFIED_TABLES_KEY = "modified_tables"
+
+# INSERT ... ON CONFLICT DO UPDATE selon le dialecte
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+class TableVersion(Base):
+    """
+    Compteur de version d'une table, incrémenté au commit de toute
+    transaction qui la modifie (flush de l'ORM ou INSERT/UPDATE/DELETE passé
+    par une session), dans cette transaction. Sert à dériver des ETags sans
+    relire les données.
+    """
+    table_name = Column(String(64), unique=True, nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+
+
+_VERSIONS = select(TableVersion.table_name, TableVersion.version).where(
+    TableVersion.table_name.in_(bindparam("names", expanding=True))
+)
+
+
+def read_versions(db: Session, tables: Iterable[str]) -> Dict[str, int]:
+    """
+    Versions courantes de `tables` (0 pour une table jamais modifiée).
+    """
+    tables = list(tables)
+    versions = dict.fromkeys(tables, 0)
+    versions.update(db.execute(_VERSIONS, {"names": tables}).all())
+    return versions
+
+
+async def read_versions_async(db: AsyncSession, tables: Iterable[str]) -> Dict[str, int]:
+    """
+    Équivalent de read_versions sur une session asynchrone.
+    """
+    tables = list(tables)
+    versions = dict.fromkeys(tables, 0)
+    versions.update((await db.execute(_VERSIONS, {"names": tables})).all())
+    return versions
+
+
+def bump_versions(db: Session, tables: Iterable[str]) -> None:
+    """
+    Incrémente la version de `tables` en une instruction, dans la transaction
+    de la session.
+    """
+    tables = sorted(set(tables) - {TableVersion.__tablename__})
+    if not tables:
+        return
+    connection = db.connection()
+    upsert = _UPSERT_INSERTS.get(connection.dialect.name)
+    if upsert is not None:
+        statement = upsert(TableVersion.__table__).values(
+            [{"table_name": name, "version": 1} for name in tables]
+        )
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=["table_name"],
+            set_={"version": TableVersion.__table__.c.version + 1},
+        ))
+        return
+    for name in tables:
+        result = connection.execute(
+            update(TableVersion.__table__)
+            .where(TableVersion.__table__.c.table_name == name)
+            .values(version=TableVersion.__table__.c.version + 1)
+        )
+        if result.rowcount == 0:
+            connection.execute(TableVersion.__table__.insert().values(table_name=name, version=1))
+
+
+def _modified_tables(session: Session) -> set:
+    return session.info.setdefault(MODIFIED_TABLES_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def record_flushed_tables(session: Session, flush_context) -> None:
+    # L'état d'avant le flush (new, dirty, deleted, historique) est encore visible
+    tables = _modified_tables(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        state = inspect(obj)
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        tables.add(state.mapper.local_table.name)
+        for relationship in state.mapper.relationships:
+            if relationship.secondary is not None and (
+                obj in session.deleted or state.attrs[relationship.key].history.has_changes()
+            ):
+                tables.add(relationship.secondary.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def record_statement_table(execute_state: ORMExecuteState) -> None:
+    if execute_state.is_insert or execute_state.is_update or execute_state.is_delete:
+        _modified_tables(execute_state.session).add(execute_state.statement.table.name)
+
+
+@event.listens_for(Session, "before_commit")
+def bump_modified_tables(session: Session) -> None:
+    # Le flush final du commit a lieu après cet événement : on le fait avant
+    # pour incrémenter en une instruction toutes les tables de la transaction
+    session.flush()
+    tables = session.info.pop(MODIFIED_TABLES_KEY, None)
+    if tables:
+        bump_versions(session, tables)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def forget_modified_tables(session: Session, transaction) -> None:
+    # Transaction annulée : ses modifications ne comptent plus (un SAVEPOINT
+    # annulé laisse ses tables, incrémentées inutilement mais sans risque)
+    if transaction.parent is None:
+        session.info.pop(MODIFIED_TABLES_KEY, None)
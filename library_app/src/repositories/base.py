@@ -1,17 +1,98 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import Column, Integer, bindparam, delete, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
+from ..db.unit_of_work import has_server_generated_columns, in_unit_of_work
 from ..models.base import Base
+from ..models.soft_delete import INCLUDE_DELETED, exclude_deleted_rows
+from ..utils.fields import FieldSelection
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Lignes par instruction des opérations en masse
+BULK_CHUNK_SIZE = 500
+
+# INSERT ... ON CONFLICT DO UPDATE selon le dialecte
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """
+    Découpe `items` en tranches d'au plus `size` éléments.
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+@lru_cache(maxsize=None)
+def column_map(model: Type) -> Dict[str, Column]:
+    """
+    Colonnes d'un modèle (nom d'attribut -> colonne), construites une fois
+    par modèle à partir du mapper SQLAlchemy.
+    """
+    return {attribute.key: attribute.columns[0] for attribute in inspect(model).column_attrs}
+
+
+def column_values(
+    model: Type, obj_in: Union[BaseModel, Dict[str, Any]], *, exclude_unset: bool = False
+) -> Dict[str, Any]:
+    """
+    Valeurs de `obj_in` (schéma Pydantic ou dict) qui correspondent à une
+    colonne du modèle, lues directement sur le schéma : pas de sérialisation
+    intermédiaire, les dates restent des datetime. Les autres champs
+    (mot de passe en clair, category_ids...) sont ignorés.
+    """
+    columns = column_map(model)
+    if isinstance(obj_in, dict):
+        return {key: value for key, value in obj_in.items() if key in columns}
+    fields = obj_in.model_fields_set if exclude_unset else type(obj_in).model_fields
+    return {key: getattr(obj_in, key) for key in fields if key in columns}
+
+
+@lru_cache(maxsize=None)
+def lookup_statement(model: Type, column: str, include_deleted: bool = False) -> Select:
+    """
+    SELECT du modèle filtré sur `column = :value`, construit une fois par
+    modèle et colonne : les lectures fréquentes ne reconstruisent plus la
+    requête et SQLAlchemy ne recalcule ni sa clé de cache ni sa compilation.
+    La valeur est passée en paramètre à l'exécution.
+    """
+    statement = select(model).where(getattr(model, column) == bindparam("value"))
+    if include_deleted:
+        return statement.execution_options(**{INCLUDE_DELETED: True})
+    return exclude_deleted_rows(statement, model)
+
+
+@lru_cache(maxsize=None)
+def page_statement(model: Type) -> Select:
+    """
+    SELECT paginé du modèle (`:skip`, `:limit`), construit une fois par modèle.
+    """
+    return exclude_deleted_rows(
+        select(model)
+        .offset(bindparam("skip", type_=Integer))
+        .limit(bindparam("limit", type_=Integer)),
+        model,
+    )
+
 
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Clés étrangères des lignes dépendantes, supprimées en masse avec l'objet
+    # (DELETE ... WHERE) plutôt que chargées une à une par les cascades de l'ORM
+    dependent_columns: Tuple[Column, ...] = ()
+
     def __init__(self, model: Type[ModelType], db: Session):
         """
         Initialise le repository avec un modèle et une session de base de données.
@@ -23,7 +104,7 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Récupère un objet par son ID.
         """
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        return self.db.execute(lookup_statement(self.model, "id"), {"value": id}).scalars().first()
 
     def get_multi(
         self, *, skip: int = 0, limit: int = 100
@@ -31,17 +112,39 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Récupère plusieurs objets avec pagination.
         """
-        return self.db.query(self.model).offset(skip).limit(limit).all()
+        return self.db.execute(page_statement(self.model), {"skip": skip, "limit": limit}).scalars().all()
+
+    def get_multi_rows(
+        self, *, fields: Sequence[str], skip: int = 0, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Récupère plusieurs lignes avec pagination, projetées en dictionnaires
+        sur les colonnes `fields` : pas d'objets ORM à construire.
+        """
+        statement = select(*(getattr(self.model, name) for name in fields)).offset(skip).limit(limit)
+        return [dict(row) for row in self.db.execute(statement).mappings()]
 
-    def create(self, *, obj_in: CreateSchemaType) -> ModelType:
+    def get_multi_fields(
+        self, *, selection: FieldSelection, skip: int = 0, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Récupère plusieurs objets avec pagination, réduits aux champs de
+        `selection` (`fields=`) : SELECT des seules colonnes demandées, ou
+        objets ORM restreints par load_only si des relations ou des champs
+        calculés sont demandés.
+        """
+        if selection.only_columns:
+            return self.get_multi_rows(fields=selection.columns, skip=skip, limit=limit)
+        statement = select(self.model).options(*selection.options()).offset(skip).limit(limit)
+        return selection.dump(self.db.execute(statement).scalars().all())
+
+    def create(self, *, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> ModelType:
         """
         Crée un nouvel objet.
         """
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)
+        db_obj = self.model(**column_values(self.model, obj_in))
         self.db.add(db_obj)
-        self.db.commit()
-        self.db.refresh(db_obj)
+        self._save(db_obj)
         return db_obj
 
     def update(
@@ -51,29 +154,241 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
         """
-        Met à jour un objet existant.
+        Met à jour un objet existant. Seules les colonnes dont la valeur change
+        sont affectées : le flush n'envoie qu'elles dans l'UPDATE.
+        """
+        for field, value in column_values(self.model, obj_in, exclude_unset=True).items():
+            if getattr(db_obj, field) != value:
+                setattr(db_obj, field, value)
+
+        self.db.add(db_obj)
+        self._save(db_obj)
+        return db_obj
+
+    def update_columns(self, *, id: Any, values: Dict[str, Any]) -> int:
+        """
+        UPDATE ... SET ciblé sur les colonnes `values` d'une ligne, sans la
+        charger. Les valeurs peuvent être des expressions SQL (par exemple
+        `Book.quantity + 1`) ; les objets déjà présents dans la session sont
+        synchronisés. Retourne le nombre de lignes modifiées.
         """
-        obj_data = jsonable_encoder(db_obj)
+        result = self.db.execute(
+            update(self.model).where(self.model.id == id).values(values)
+        )
+        self._save()
+        return result.rowcount
 
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
+    def remove(self, *, id: int) -> Optional[ModelType]:
+        """
+        Supprime un objet et ses lignes dépendantes (`dependent_columns`) par
+        des DELETE ... WHERE, sans charger les collections liées.
+        """
+        obj = self.get(id=id)
+        if obj is None:
+            return None
+        for column in self.dependent_columns:
+            self.db.execute(delete(column.table).where(column == id))
+        self.db.execute(delete(self.model).where(self.model.id == id))
+        self._save()
+        return obj
 
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+    def soft_delete(self, *, id: Any) -> Optional[ModelType]:
+        """
+        Suppression logique (modèles SoftDeleteMixin) : renseigne deleted_at,
+        l'objet disparaît alors des requêtes.
+        """
+        obj = self.get(id=id)
+        if obj is None:
+            return None
+        obj.deleted_at = datetime.utcnow()
+        self._save(obj)
+        return obj
 
-        self.db.add(db_obj)
+    def create_many(
+        self,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        *,
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> List[int]:
+        """
+        Insère plusieurs lignes (INSERT en executemany par tranches de
+        `chunk_size`) sans créer d'objets dans la session. Retourne les IDs
+        dans l'ordre de `objs_in`.
+        """
+        rows = [column_values(self.model, obj_in) for obj_in in objs_in]
+        statement = insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+        ids: List[int] = []
+        for chunk in chunks(rows, chunk_size):
+            ids.extend(self.db.scalars(statement, list(chunk)).all())
+        self._save()
+        return ids
+
+    def update_many(
+        self,
+        values_by_id: Dict[Any, Union[UpdateSchemaType, Dict[str, Any]]],
+        *,
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> List[int]:
+        """
+        Met à jour plusieurs lignes par ID (UPDATE ... WHERE id = ? en
+        executemany). Les IDs inexistants sont ignorés ; retourne les IDs
+        effectivement mis à jour.
+        """
+        rows = [
+            {**column_values(self.model, obj_in, exclude_unset=True), "id": id}
+            for id, obj_in in values_by_id.items()
+        ]
+        ids: List[int] = []
+        for chunk in chunks(rows, chunk_size):
+            existing = set(self.db.scalars(
+                select(self.model.id).where(self.model.id.in_([row["id"] for row in chunk]))
+            ))
+            chunk = [row for row in chunk if row["id"] in existing and len(row) > 1]
+            if chunk:
+                self.db.execute(update(self.model), chunk)
+                ids.extend(row["id"] for row in chunk)
+        self._save()
+        return ids
+
+    def upsert_many(
+        self,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        *,
+        index_elements: Sequence[str],
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> List[int]:
+        """
+        Insère ou met à jour plusieurs lignes selon des colonnes uniques
+        (`index_elements`, par exemple ("isbn",)) : INSERT ... ON CONFLICT DO
+        UPDATE. En cas de doublon dans `objs_in`, la dernière ligne l'emporte.
+        Retourne les IDs dans l'ordre de première apparition des clés.
+        """
+        dialect = self.db.get_bind().dialect.name
+        dialect_insert = UPSERT_INSERTS.get(dialect)
+        if dialect_insert is None:
+            raise NotImplementedError(f"upsert_many n'est pas disponible pour le dialecte {dialect}")
+
+        rows_by_key: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for obj_in in objs_in:
+            row = column_values(self.model, obj_in)
+            rows_by_key[tuple(row[name] for name in index_elements)] = row
+
+        # Colonnes remplacées en cas de conflit : toutes sauf la clé, l'ID et la date de création
+        columns = column_map(self.model)
+        preserved = set(index_elements) | {"id", "created_at"}
+        refreshed = {name for name, column in columns.items() if column.onupdate is not None}
+        key_columns = [columns[name] for name in index_elements]
+
+        ids_by_key: Dict[Tuple[Any, ...], int] = {}
+        # Un INSERT multi-VALUES exige les mêmes colonnes pour toutes les lignes
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows_by_key.values():
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        for names, group in groups.items():
+            for chunk in chunks(group, chunk_size):
+                statement = dialect_insert(self.model).values(list(chunk))
+                statement = statement.on_conflict_do_update(
+                    index_elements=key_columns,
+                    set_={
+                        name: statement.excluded[columns[name].name]
+                        for name in (set(names) | refreshed) - preserved
+                    },
+                ).returning(self.model.id, *key_columns)
+                for id, *key in self.db.execute(statement):
+                    ids_by_key[tuple(key)] = id
+        self._save()
+        return [ids_by_key[key] for key in rows_by_key]
+
+    def delete_where(self, *criteria: Any) -> List[int]:
+        """
+        Supprime en une instruction les lignes qui vérifient `criteria`
+        (au moins une condition) et retourne leurs IDs. Les cascades de
+        l'ORM ne s'appliquent pas : seules celles de la base (ON DELETE) ont lieu.
+        """
+        if not criteria:
+            raise ValueError("delete_where exige au moins une condition")
+        ids = list(self.db.scalars(
+            delete(self.model).where(*criteria).returning(self.model.id)
+        ))
+        self._save()
+        return ids
+
+    def _save(self, db_obj: Optional[ModelType] = None) -> None:
+        """
+        Valide les modifications de la session et recharge `db_obj`. Dans un
+        bloc unit_of_work, se contente d'un flush : les clés primaires et
+        valeurs par défaut Python sont alors connues, le rechargement n'a lieu
+        que si le modèle a des colonnes calculées par la base.
+        """
+        if in_unit_of_work(self.db):
+            self.db.flush()
+            if db_obj is not None and has_server_generated_columns(type(db_obj)):
+                self.db.refresh(db_obj)
+            return
         self.db.commit()
-        self.db.refresh(db_obj)
+        if db_obj is not None:
+            self.db.refresh(db_obj)
+
+
+class AsyncBaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Équivalent asynchrone de BaseRepository, sur une AsyncSession.
+
+    Les relations ne se chargent pas paresseusement en asynchrone : elles
+    doivent être chargées explicitement (selectinload) par les requêtes.
+    """
+    def __init__(self, model: Type[ModelType], db: AsyncSession):
+        self.model = model
+        self.db = db
+
+    async def get(self, id: Any) -> Optional[ModelType]:
+        """
+        Récupère un objet par son ID.
+        """
+        return await self.db.get(self.model, id)
+
+    async def get_multi(
+        self, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        """
+        Récupère plusieurs objets avec pagination.
+        """
+        result = await self.db.scalars(select(self.model).offset(skip).limit(limit))
+        return list(result)
+
+    async def create(self, *, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> ModelType:
+        """
+        Crée un nouvel objet.
+        """
+        db_obj = self.model(**column_values(self.model, obj_in))
+        self.db.add(db_obj)
+        await self.db.commit()
+        await self.db.refresh(db_obj)
         return db_obj
 
-    def remove(self, *, id: int) -> ModelType:
+    async def update(
+        self,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """
+        Met à jour un objet existant.
+        """
+        for field, value in column_values(self.model, obj_in, exclude_unset=True).items():
+            if getattr(db_obj, field) != value:
+                setattr(db_obj, field, value)
+
+        await self.db.commit()
+        await self.db.refresh(db_obj)
+        return db_obj
+
+    async def remove(self, *, id: int) -> Optional[ModelType]:
         """
         Supprime un objet.
         """
-        obj = self.db.query(self.model).get(id)
-        self.db.delete(obj)
-        self.db.commit()
-        return obj
\ No newline at end of file
+        obj = await self.db.get(self.model, id)
+        if obj is not None:
+            await self.db.delete(obj)
+            await self.db.commit()
+        return obj
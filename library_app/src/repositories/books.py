@@ -1,19 +1,60 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, or_, select
+from sqlalchemy.sql import Select
+from typing import List, Optional, Dict, Any, Sequence
 
-from .base import BaseRepository
+from .base import AsyncBaseRepository, BaseRepository, lookup_statement
+from .loans import LoanRepository
 from ..models.books import Book
 from ..models.categories import Category, book_category
-from ..utils.cache import cache, invalidate_cache
+from ..models.loans import Loan
+from ..models.stats import BookDailyLoans
+from ..db.unit_of_work import invalidate_cache_on_commit, unit_of_work
+from ..utils.cache import cache
+
+
+def book_search_criteria(
+    *,
+    query: Optional[str] = None,
+    category_id: Optional[int] = None,
+    author: Optional[str] = None,
+    publication_year: Optional[int] = None
+) -> List[Any]:
+    """
+    Conditions de la recherche avancée de livres, communes aux piles
+    synchrone et asynchrone.
+    """
+    criteria = []
+    if query:
+        criteria.append(or_(
+            Book.title.ilike(f"%{query}%"),
+            Book.author.ilike(f"%{query}%"),
+            Book.isbn.ilike(f"%{query}%"),
+            Book.description.ilike(f"%{query}%")
+        ))
+    if category_id:
+        # Sous-requête plutôt que jointure : pas de doublons ni de DISTINCT
+        criteria.append(Book.id.in_(
+            select(book_category.c.book_id).where(book_category.c.category_id == category_id)
+        ))
+    if author:
+        criteria.append(Book.author.ilike(f"%{author}%"))
+    if publication_year:
+        criteria.append(Book.publication_year == publication_year)
+    return criteria
 
 
 class BookRepository(BaseRepository[Book, None, None]):
-    def get_by_isbn(self, *, isbn: str) -> Optional[Book]:
+    dependent_columns = (Loan.book_id, BookDailyLoans.book_id, book_category.c.book_id)
+
+    def get_by_isbn(self, *, isbn: str, include_deleted: bool = False) -> Optional[Book]:
         """
-        Récupère un livre par son ISBN.
+        Récupère un livre par son ISBN (y compris supprimé logiquement si
+        `include_deleted`, l'ISBN restant unique).
         """
-        return self.db.query(Book).filter(Book.isbn == isbn).first()
+        return self.db.execute(
+            lookup_statement(Book, "isbn", include_deleted), {"value": isbn}
+        ).scalars().first()
 
     def get_by_title(self, *, title: str) -> List[Book]:
         """
@@ -72,7 +113,7 @@ class BookRepository(BaseRepository[Book, None, None]):
             raise ValueError(f"Catégorie avec l'ID {category_id} non trouvée")
 
         book.categories.append(category)
-        self.db.commit()
+        self._save()
 
     def remove_category(self, *, book_id: int, category_id: int) -> None:
         """
@@ -87,7 +128,7 @@ class BookRepository(BaseRepository[Book, None, None]):
             raise ValueError(f"Catégorie avec l'ID {category_id} non trouvée")
 
         book.categories.remove(category)
-        self.db.commit()
+        self._save()
 
     @cache(expiry=60)  # Cache pendant 1 minute
     def get_stats(self) -> Dict[str, Any]:
@@ -109,7 +150,7 @@ class BookRepository(BaseRepository[Book, None, None]):
         Crée un nouveau livre et invalide le cache.
         """
         book = super().create(obj_in=obj_in)
-        invalidate_cache("src.repositories.books")
+        invalidate_cache_on_commit(self.db, "src.repositories.books")
         return book
 
     def update(self, *, db_obj: Book, obj_in: Any) -> Book:
@@ -117,13 +158,101 @@ class BookRepository(BaseRepository[Book, None, None]):
         Met à jour un livre et invalide le cache.
         """
         book = super().update(db_obj=db_obj, obj_in=obj_in)
-        invalidate_cache("src.repositories.books")
+        invalidate_cache_on_commit(self.db, "src.repositories.books")
+        return book
+
+    def update_columns(self, *, id: Any, values: Dict[str, Any]) -> int:
+        """
+        Met à jour des colonnes d'un livre sans le charger et invalide le cache.
+        """
+        rowcount = super().update_columns(id=id, values=values)
+        invalidate_cache_on_commit(self.db, "src.repositories.books")
+        return rowcount
+
+    def remove(self, *, id: int) -> Optional[Book]:
+        """
+        Supprime un livre, ses emprunts, agrégats et catégories, et invalide le cache.
+        """
+        # Catégories chargées avant la suppression : le livre retourné reste
+        # sérialisable. La référence est gardée jusqu'au retour, sinon la
+        # session (références faibles) peut libérer l'objet chargé et
+        # super().remove() en recharge un sans ses catégories.
+        book = self.get_with_categories(id=id)
+        if book is None:
+            return None
+        super().remove(id=id)
+        invalidate_cache_on_commit(self.db, "src.repositories.books")
         return book
 
-    def remove(self, *, id: int) -> Book:
+    def soft_delete(self, *, id: Any) -> Optional[Book]:
+        """
+        Supprime logiquement un livre et archive ses emprunts, en une transaction.
+        """
+        with unit_of_work(self.db):
+            book = super().soft_delete(id=id)
+            if book is not None:
+                LoanRepository(Loan, self.db).archive_where(Loan.book_id == id)
+        invalidate_cache_on_commit(self.db, "src.repositories.books")
+        return book
+
+    def create_many(self, objs_in: Sequence[Any], **kwargs: Any) -> List[int]:
+        """
+        Crée plusieurs livres et invalide le cache.
+        """
+        ids = super().create_many(objs_in, **kwargs)
+        invalidate_cache_on_commit(self.db, "src.repositories.books")
+        return ids
+
+    def update_many(self, values_by_id: Dict[Any, Any], **kwargs: Any) -> List[int]:
+        """
+        Met à jour plusieurs livres et invalide le cache.
+        """
+        ids = super().update_many(values_by_id, **kwargs)
+        invalidate_cache_on_commit(self.db, "src.repositories.books")
+        return ids
+
+    def upsert_many(self, objs_in: Sequence[Any], *, index_elements: Sequence[str] = ("isbn",), **kwargs: Any) -> List[int]:
+        """
+        Crée ou met à jour plusieurs livres (par ISBN par défaut) et invalide le cache.
+        """
+        ids = super().upsert_many(objs_in, index_elements=index_elements, **kwargs)
+        invalidate_cache_on_commit(self.db, "src.repositories.books")
+        return ids
+
+    def delete_where(self, *criteria: Any) -> List[int]:
+        """
+        Supprime les livres qui vérifient `criteria` et invalide le cache.
+        """
+        ids = super().delete_where(*criteria)
+        invalidate_cache_on_commit(self.db, "src.repositories.books")
+        return ids
+
+
+class AsyncBookRepository(AsyncBaseRepository[Book, None, None]):
+    """
+    Lecture des livres sur une AsyncSession. Les catégories sont toujours
+    chargées avec le livre (pas de chargement paresseux en asynchrone).
+    """
+    async def get(self, id: Any) -> Optional[Book]:
+        """
+        Récupère un livre avec ses catégories.
+        """
+        return await self.db.scalar(
+            select(Book).options(selectinload(Book.categories)).where(Book.id == id)
+        )
+
+    async def get_by_isbn(self, *, isbn: str) -> Optional[Book]:
+        """
+        Récupère un livre par son ISBN.
+        """
+        return await self.db.scalar(
+            select(Book).options(selectinload(Book.categories)).where(Book.isbn == isbn)
+        )
+
+    def search_statement(self, **criteria: Any) -> Select:
         """
-        Supprime un livre et invalide le cache.
+        Requête de recherche avancée (voir book_search_criteria), à paginer.
         """
-        book = super().remove(id=id)
-        invalidate_cache("src.repositories.books")
-        return book
\ No newline at end of file
+        return select(Book).options(selectinload(Book.categories)).where(
+            *book_search_criteria(**criteria)
+        )
@@ -1,12 +1,22 @@
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
-from sqlalchemy import func, and_, or_
+from sqlalchemy import bindparam, delete, func, and_, insert, or_, select, update
 
-from .base import BaseRepository
-from ..models.loans import Loan
+from .base import UPSERT_INSERTS, BaseRepository, lookup_statement
+from ..models.loans import Loan, LoanArchive
 from ..models.books import Book
 from ..models.users import User
+from ..models.soft_delete import exclude_deleted_rows
+from ..models.stats import BookDailyLoans, UserDailyLoans
+from ..db.functions import month_bucket
+from ..utils.trending import bumped_trending_score
+
+# Filtres d'emprunts construits une fois (la date est un paramètre)
+ACTIVE_LOANS = exclude_deleted_rows(select(Loan).where(Loan.return_date.is_(None)), Loan)
+OVERDUE_LOANS = exclude_deleted_rows(
+    select(Loan).where(Loan.return_date.is_(None), Loan.due_date < bindparam("now")), Loan
+)
 
 
 class LoanRepository(BaseRepository[Loan, None, None]):
@@ -14,29 +24,80 @@ class LoanRepository(BaseRepository[Loan, None, None]):
         """
         Récupère les emprunts actifs (non retournés).
         """
-        return self.db.query(Loan).filter(Loan.return_date == None).all()
+        return self.db.execute(ACTIVE_LOANS).scalars().all()
 
     def get_overdue_loans(self) -> List[Loan]:
         """
         Récupère les emprunts en retard.
         """
-        now = datetime.utcnow()
-        return self.db.query(Loan).filter(
-            Loan.return_date == None,
-            Loan.due_date < now
-        ).all()
+        return self.db.execute(OVERDUE_LOANS, {"now": datetime.utcnow()}).scalars().all()
 
     def get_loans_by_user(self, *, user_id: int) -> List[Loan]:
         """
         Récupère les emprunts d'un utilisateur.
         """
-        return self.db.query(Loan).filter(Loan.user_id == user_id).all()
+        return self.db.execute(lookup_statement(Loan, "user_id"), {"value": user_id}).scalars().all()
 
     def get_loans_by_book(self, *, book_id: int) -> List[Loan]:
         """
         Récupère les emprunts d'un livre.
         """
-        return self.db.query(Loan).filter(Loan.book_id == book_id).all()
+        return self.db.execute(lookup_statement(Loan, "book_id"), {"value": book_id}).scalars().all()
+
+    def record_checkout(self, *, loan: Loan) -> None:
+        """
+        Incrémente les compteurs d'emprunts du livre et de l'utilisateur, le
+        score de tendance du livre et les agrégats quotidiens, en SQL. Le
+        commit est laissé à l'appelant.
+        """
+        self.db.execute(
+            update(Book).where(Book.id == loan.book_id).values(
+                loan_count=Book.loan_count + 1,
+                trending_score=bumped_trending_score(Book.trending_score, loan.loan_date)
+            )
+        )
+        self.db.execute(
+            update(User).where(User.id == loan.user_id).values(loan_count=User.loan_count + 1)
+        )
+
+        day = loan.loan_date.date()
+        dialect_insert = UPSERT_INSERTS.get(self.db.get_bind().dialect.name)
+        for model, key, value in (
+            (BookDailyLoans, "book_id", loan.book_id),
+            (UserDailyLoans, "user_id", loan.user_id),
+        ):
+            if dialect_insert is not None:
+                # Une seule instruction : deux emprunts simultanés du même jour
+                # ne peuvent pas insérer chacun la ligne de l'agrégat
+                statement = dialect_insert(model).values(day=day, loan_count=1, **{key: value})
+                self.db.execute(statement.on_conflict_do_update(
+                    index_elements=[model.day, getattr(model, key)],
+                    set_={"loan_count": model.loan_count + 1, "updated_at": datetime.utcnow()},
+                ))
+                continue
+            result = self.db.execute(
+                update(model).where(
+                    model.day == day,
+                    getattr(model, key) == value
+                ).values(loan_count=model.loan_count + 1)
+            )
+            if result.rowcount == 0:
+                self.db.add(model(day=day, loan_count=1, **{key: value}))
+        self.db.flush()
+
+    def archive_where(self, *criteria: Any) -> int:
+        """
+        Déplace les emprunts qui vérifient `criteria` dans loan_archive
+        (INSERT ... SELECT puis DELETE, sans les charger) et retourne leur nombre.
+        """
+        columns = ["id", "user_id", "book_id", "loan_date", "return_date", "due_date", "extended",
+                   "created_at", "updated_at"]
+        self.db.execute(insert(LoanArchive).from_select(
+            columns, select(*(getattr(Loan, name) for name in columns)).where(*criteria)
+        ))
+        archived = self.db.execute(delete(Loan).where(*criteria)).rowcount
+        self._save()
+        return archived
 
     def get_with_details(self, *, id: int) -> Optional[Loan]:
         """
@@ -70,13 +131,14 @@ class LoanRepository(BaseRepository[Loan, None, None]):
 
         # Emprunts par mois (12 derniers mois)
         start_date = now - timedelta(days=365)
+        month = month_bucket(Loan.loan_date)
         loans_by_month = self.db.query(
-            func.strftime("%Y-%m", Loan.loan_date).label("month"),
+            month.label("month"),
             func.count(Loan.id).label("count")
         ).filter(
             Loan.loan_date >= start_date
         ).group_by(
-            func.strftime("%Y-%m", Loan.loan_date)
+            month
         ).all()
 
         loans_by_month_dict = {month: count for month, count in loans_by_month}
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import update
+
+from .base import BaseRepository
+from ..db.unit_of_work import unit_of_work
+from ..models.tokens import RefreshToken
+
+
+class RefreshTokenRepository(BaseRepository[RefreshToken, None, None]):
+    def get_by_hash(self, *, token_hash: str) -> Optional[RefreshToken]:
+        """
+        Récupère un jeton de rafraîchissement par son empreinte.
+        """
+        return self.db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).first()
+
+    def add(self, *, user_id: int, token_hash: str, expires_at: datetime) -> RefreshToken:
+        """
+        Enregistre un nouveau jeton de rafraîchissement.
+        """
+        token = RefreshToken(user_id=user_id, token_hash=token_hash, expires_at=expires_at)
+        self.db.add(token)
+        self._save(token)
+        return token
+
+    def rotate(
+        self, *, token_hash: str, user_id: int, new_token_hash: str, expires_at: datetime
+    ) -> Optional[RefreshToken]:
+        """
+        Révoque le jeton `token_hash` et le remplace par `new_token_hash`, dans
+        une même transaction (unit_of_work) : si l'émission du nouveau jeton
+        échoue, la révocation est annulée. La révocation est conditionnelle :
+        si le jeton a déjà été révoqué (rafraîchissement concurrent), rien
+        n'est fait et None est retourné.
+        """
+        now = datetime.utcnow()
+        with unit_of_work(self.db):
+            result = self.db.execute(
+                update(RefreshToken)
+                .where(RefreshToken.token_hash == token_hash, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=now, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                return None
+
+            token = RefreshToken(user_id=user_id, token_hash=new_token_hash, expires_at=expires_at)
+            self.db.add(token)
+            self._save(token)
+        return token
+
+    def revoke(self, *, token_hash: str) -> bool:
+        """
+        Révoque un jeton. Retourne False s'il était déjà révoqué ou inconnu.
+        """
+        now = datetime.utcnow()
+        result = self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.token_hash == token_hash, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        self._save()
+        return result.rowcount == 1
+
+    def revoke_all_for_user(self, *, user_id: int) -> List[RefreshToken]:
+        """
+        Révoque tous les jetons actifs d'un utilisateur et les retourne.
+        """
+        now = datetime.utcnow()
+        tokens = (
+            self.db.query(RefreshToken)
+            .filter(
+                RefreshToken.user_id == user_id,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .all()
+        )
+        for token in tokens:
+            token.revoked_at = now
+        self._save()
+        return tokens
+
+    def delete_expired(self) -> int:
+        """
+        Supprime les jetons expirés. Retourne le nombre de lignes supprimées.
+        """
+        count = (
+            self.db.query(RefreshToken)
+            .filter(RefreshToken.expires_at <= datetime.utcnow())
+            .delete(synchronize_session=False)
+        )
+        self._save()
+        return count
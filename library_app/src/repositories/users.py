@@ -1,12 +1,37 @@
+from typing import Any, Optional
+
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 
-from .base import BaseRepository
+from .base import BaseRepository, lookup_statement
+from .loans import LoanRepository
+from ..db.unit_of_work import unit_of_work
+from ..models.loans import Loan
+from ..models.stats import UserDailyLoans
+from ..models.tokens import RefreshToken
 from ..models.users import User
 
 
 class UserRepository(BaseRepository[User, None, None]):
-    def get_by_email(self, *, email: str) -> User:
+    dependent_columns = (Loan.user_id, UserDailyLoans.user_id, RefreshToken.user_id)
+
+    def get_by_email(self, *, email: str, include_deleted: bool = False) -> User:
+        """
+        Récupère un utilisateur par son email (y compris supprimé logiquement
+        si `include_deleted`, l'email restant unique).
+        """
+        return self.db.execute(
+            lookup_statement(User, "email", include_deleted), {"value": email}
+        ).scalars().first()
+
+    def soft_delete(self, *, id: Any) -> Optional[User]:
         """
-        Récupère un utilisateur par son email.
+        Supprime logiquement un utilisateur, archive ses emprunts et supprime
+        ses jetons de rafraîchissement, en une transaction.
         """
-        return self.db.query(User).filter(User.email == email).first()
+        with unit_of_work(self.db):
+            user = super().soft_delete(id=id)
+            if user is not None:
+                LoanRepository(Loan, self.db).archive_where(Loan.user_id == id)
+                self.db.execute(delete(RefreshToken).where(RefreshToken.user_id == id))
+        return user
@@ -0,0 +1,308 @@
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.books import Book
+from ..models.categories import Category, book_category
+from ..models.loans import Loan
+
+# Valeur sentinelle pour les dates absentes (emprunt non retourné)
+MISSING_DATE = -1
+
+SECONDS_PER_DAY = 24 * 3600
+
+# Colonnes de l'instantané : nom du fichier .npy -> type NumPy
+SNAPSHOT_COLUMNS = {
+    "loan_book_id": np.int32,
+    "loan_user_id": np.int32,
+    "loan_date": np.int64,
+    "due_date": np.int64,
+    "return_date": np.int64,
+    "book_id": np.int32,
+    "book_publication_year": np.int16,
+    "bc_book_id": np.int32,
+    "bc_category_id": np.int32,
+}
+
+CURRENT_FILE = "CURRENT"
+
+
+def _to_epoch(value: Optional[datetime]) -> int:
+    """
+    Convertit une date en secondes depuis l'epoch (MISSING_DATE si absente).
+    """
+    if value is None:
+        return MISSING_DATE
+    return int((value - datetime(1970, 1, 1)).total_seconds())
+
+
+def new_generation_name(prefix: str) -> str:
+    """
+    Nom unique (et croissant) pour une nouvelle génération de fichiers.
+    """
+    return "%s-%s" % (prefix, datetime.utcnow().strftime("%Y%m%d%H%M%S%f"))
+
+
+def current_generation(directory: str) -> Optional[str]:
+    """
+    Nom de la génération publiée dans `directory` (None si aucune).
+    """
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish_generation(directory: str, name: str) -> None:
+    """
+    Publie atomiquement la génération `name` : les lecteurs voient l'ancienne
+    ou la nouvelle, jamais un état intermédiaire. Les générations plus
+    anciennes que la précédente sont supprimées (la précédente est conservée
+    pour les lecteurs qui l'ont encore ouverte).
+    """
+    previous = current_generation(directory)
+    tmp_current = os.path.join(directory, CURRENT_FILE + ".tmp")
+    with open(tmp_current, "w") as f:
+        f.write(name)
+    os.replace(tmp_current, os.path.join(directory, CURRENT_FILE))
+
+    prefix = name.rsplit("-", 1)[0] + "-"
+    for entry in os.listdir(directory):
+        if entry.startswith(prefix) and entry not in (name, previous):
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+
+
+class LoanSnapshot:
+    """
+    Instantané en colonnes NumPy des tables loan, book et book_category.
+
+    Les colonnes sont persistées en fichiers .npy et relues en mémoire mappée,
+    de sorte que les requêtes analytiques ne touchent jamais la base SQLite.
+    """
+    def __init__(self, name: str, columns: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        self.name = name
+        self.columns = columns
+        self.meta = meta
+
+    def __getattr__(self, item: str) -> np.ndarray:
+        try:
+            return self.columns[item]
+        except KeyError:
+            raise AttributeError(item)
+
+    @property
+    def created_at(self) -> int:
+        return self.meta["created_at"]
+
+    @property
+    def categories(self) -> Dict[int, str]:
+        return {int(id): name for id, name in self.meta["categories"].items()}
+
+    @classmethod
+    def build(cls, db: Session, directory: str) -> "LoanSnapshot":
+        """
+        Construit un nouvel instantané à partir de la base et le publie dans `directory`.
+        """
+        loans = db.execute(
+            select(Loan.book_id, Loan.user_id, Loan.loan_date, Loan.due_date, Loan.return_date)
+        ).all()
+        books = db.execute(select(Book.id, Book.publication_year).order_by(Book.id)).all()
+        links = db.execute(
+            select(book_category.c.book_id, book_category.c.category_id).order_by(book_category.c.book_id)
+        ).all()
+        categories = db.execute(select(Category.id, Category.name)).all()
+
+        columns = {
+            "loan_book_id": [row.book_id for row in loans],
+            "loan_user_id": [row.user_id for row in loans],
+            "loan_date": [_to_epoch(row.loan_date) for row in loans],
+            "due_date": [_to_epoch(row.due_date) for row in loans],
+            "return_date": [_to_epoch(row.return_date) for row in loans],
+            "book_id": [row.id for row in books],
+            "book_publication_year": [row.publication_year for row in books],
+            "bc_book_id": [row.book_id for row in links],
+            "bc_category_id": [row.category_id for row in links],
+        }
+        arrays = {
+            name: np.asarray(values, dtype=SNAPSHOT_COLUMNS[name])
+            for name, values in columns.items()
+        }
+        meta = {
+            "created_at": _to_epoch(datetime.utcnow()),
+            "loan_count": len(loans),
+            "book_count": len(books),
+            "categories": {str(id): name for id, name in categories},
+        }
+
+        name = new_generation_name("snapshot")
+        path = os.path.join(directory, name)
+        os.makedirs(path)
+        for column, array in arrays.items():
+            np.save(os.path.join(path, column + ".npy"), array)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+        publish_generation(directory, name)
+        return cls.load(directory)
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["LoanSnapshot"]:
+        """
+        Charge l'instantané courant en mémoire mappée (None s'il n'existe pas).
+        """
+        name = current_generation(directory)
+        if not name:
+            return None
+        path = os.path.join(directory, name)
+        columns = {
+            column: np.load(os.path.join(path, column + ".npy"), mmap_mode="r")
+            for column in SNAPSHOT_COLUMNS
+        }
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        return cls(name, columns, meta)
+
+
+class AnalyticsService:
+    """
+    Service d'analyse vectorisée de l'historique des emprunts.
+    """
+    _snapshot: Optional[LoanSnapshot] = None
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or settings.ANALYTICS_DIR
+
+    def refresh(self, db: Session) -> Dict[str, Any]:
+        """
+        Reconstruit l'instantané à partir de la base de données.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        snapshot = LoanSnapshot.build(db, self.directory)
+        AnalyticsService._snapshot = snapshot
+        return self._describe(snapshot)
+
+    def get_snapshot(self) -> Optional[LoanSnapshot]:
+        """
+        Retourne l'instantané courant, rechargé s'il a été republié entre-temps.
+        """
+        name = current_generation(self.directory)
+        snapshot = AnalyticsService._snapshot
+        if snapshot is None or snapshot.name != name:
+            snapshot = LoanSnapshot.load(self.directory)
+            AnalyticsService._snapshot = snapshot
+        return snapshot
+
+    def get_snapshot_info(self) -> Optional[Dict[str, Any]]:
+        snapshot = self.get_snapshot()
+        return self._describe(snapshot) if snapshot else None
+
+    def get_return_latency(
+        self,
+        snapshot: LoanSnapshot,
+        bins: Sequence[float] = (0, 1, 3, 7, 14, 21, 28, 42, 60, 90),
+        percentiles: Sequence[float] = (50, 75, 90, 95, 99),
+    ) -> Dict[str, Any]:
+        """
+        Distribution des délais de retour (en jours) des emprunts retournés.
+        """
+        returned = snapshot.return_date != MISSING_DATE
+        latency = (snapshot.return_date[returned] - snapshot.loan_date[returned]) / SECONDS_PER_DAY
+
+        edges = np.asarray(bins, dtype=np.float64)
+        # Le dernier intervalle est ouvert pour compter les retours très tardifs
+        edges = np.append(edges, np.inf)
+        counts, _ = np.histogram(latency, bins=edges)
+
+        return {
+            "returned_loans": int(latency.size),
+            "histogram": [
+                {
+                    "min_days": float(low),
+                    "max_days": None if np.isinf(high) else float(high),
+                    "count": int(count),
+                }
+                for low, high, count in zip(edges[:-1], edges[1:], counts)
+            ],
+            "percentiles": {
+                "p%g" % p: round(float(v), 2)
+                for p, v in zip(percentiles, np.percentile(latency, percentiles))
+            } if latency.size else {},
+            "mean_days": round(float(latency.mean()), 2) if latency.size else None,
+        }
+
+    def get_late_returns_by_category(self, snapshot: LoanSnapshot) -> List[Dict[str, Any]]:
+        """
+        Taux de retards par catégorie (retour après échéance, ou non rendu et échu
+        à la date de l'instantané).
+        """
+        returned = snapshot.return_date != MISSING_DATE
+        late = np.where(
+            returned,
+            snapshot.return_date > snapshot.due_date,
+            snapshot.due_date < snapshot.created_at,
+        )
+
+        # Agrégation par livre, puis report sur les catégories via book_category
+        size = int(max(snapshot.loan_book_id.max(initial=0), snapshot.bc_book_id.max(initial=0))) + 1
+        loans_per_book = np.bincount(snapshot.loan_book_id, minlength=size)
+        late_per_book = np.bincount(snapshot.loan_book_id, weights=late, minlength=size)
+
+        category_size = int(snapshot.bc_category_id.max(initial=0)) + 1
+        loans_per_category = np.bincount(
+            snapshot.bc_category_id, weights=loans_per_book[snapshot.bc_book_id], minlength=category_size
+        )
+        late_per_category = np.bincount(
+            snapshot.bc_category_id, weights=late_per_book[snapshot.bc_book_id], minlength=category_size
+        )
+
+        names = snapshot.categories
+        result = []
+        for category_id in np.flatnonzero(loans_per_category):
+            total = int(loans_per_category[category_id])
+            late_count = int(late_per_category[category_id])
+            result.append({
+                "category_id": int(category_id),
+                "category": names.get(int(category_id)),
+                "loan_count": total,
+                "late_count": late_count,
+                "late_rate": round(late_count / total, 4),
+            })
+        result.sort(key=lambda row: row["late_rate"], reverse=True)
+        return result
+
+    def get_seasonality(self, snapshot: LoanSnapshot) -> Dict[str, Any]:
+        """
+        Répartition des emprunts par mois de l'année et par jour de la semaine.
+        """
+        loan_dates = np.asarray(snapshot.loan_date).astype("datetime64[s]")
+        months = loan_dates.astype("datetime64[M]").astype(np.int64) % 12
+        # Le 1er janvier 1970 était un jeudi : on décale pour que lundi = 0
+        weekdays = (loan_dates.astype("datetime64[D]").astype(np.int64) + 3) % 7
+
+        return {
+            "by_month": [
+                {"month": month + 1, "loan_count": int(count)}
+                for month, count in enumerate(np.bincount(months, minlength=12))
+            ],
+            "by_weekday": [
+                {"weekday": weekday, "loan_count": int(count)}
+                for weekday, count in enumerate(np.bincount(weekdays, minlength=7))
+            ],
+        }
+
+    @staticmethod
+    def _describe(snapshot: LoanSnapshot) -> Dict[str, Any]:
+        return {
+            "snapshot": snapshot.name,
+            "created_at": datetime.utcfromtimestamp(snapshot.created_at).isoformat(),
+            "loan_count": snapshot.meta["loan_count"],
+            "book_count": snapshot.meta["book_count"],
+        }
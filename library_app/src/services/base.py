@@ -1,11 +1,10 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
 
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from ..models.base import Base
-from ..repositories.base import BaseRepository
+from ..repositories.base import AsyncBaseRepository, BaseRepository
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -52,4 +51,77 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Supprime un objet.
         """
-        return self.repository.remove(id=id)
\ No newline at end of file
+        return self.repository.remove(id=id)
+
+    def soft_delete(self, *, id: Any) -> Optional[ModelType]:
+        """
+        Supprime logiquement un objet (deleted_at renseigné).
+        """
+        return self.repository.soft_delete(id=id)
+
+    def create_many(self, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]], **kwargs: Any) -> List[int]:
+        """
+        Crée plusieurs objets en masse et retourne leurs IDs.
+        """
+        return self.repository.create_many(objs_in, **kwargs)
+
+    def update_many(self, values_by_id: Dict[Any, Union[UpdateSchemaType, Dict[str, Any]]], **kwargs: Any) -> List[int]:
+        """
+        Met à jour plusieurs objets par ID et retourne les IDs mis à jour.
+        """
+        return self.repository.update_many(values_by_id, **kwargs)
+
+    def upsert_many(self, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]], **kwargs: Any) -> List[int]:
+        """
+        Crée ou met à jour plusieurs objets selon une clé unique.
+        """
+        return self.repository.upsert_many(objs_in, **kwargs)
+
+    def delete_where(self, *criteria: Any) -> List[int]:
+        """
+        Supprime les objets qui vérifient `criteria` et retourne leurs IDs.
+        """
+        return self.repository.delete_where(*criteria)
+
+
+class AsyncBaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Service de base asynchrone, sur un AsyncBaseRepository.
+    """
+    def __init__(self, repository: AsyncBaseRepository):
+        self.repository = repository
+
+    async def get(self, id: Any) -> Optional[ModelType]:
+        """
+        Récupère un objet par son ID.
+        """
+        return await self.repository.get(id=id)
+
+    async def get_multi(self, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        """
+        Récupère plusieurs objets avec pagination.
+        """
+        return await self.repository.get_multi(skip=skip, limit=limit)
+
+    async def create(self, *, obj_in: CreateSchemaType) -> ModelType:
+        """
+        Crée un nouvel objet.
+        """
+        return await self.repository.create(obj_in=obj_in)
+
+    async def update(
+        self,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """
+        Met à jour un objet existant.
+        """
+        return await self.repository.update(db_obj=db_obj, obj_in=obj_in)
+
+    async def remove(self, *, id: int) -> Optional[ModelType]:
+        """
+        Supprime un objet.
+        """
+        return await self.repository.remove(id=id)
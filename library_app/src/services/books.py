@@ -1,10 +1,11 @@
 from typing import List, Optional, Any, Dict, Union
 from sqlalchemy.orm import Session
 
-from ..repositories.books import BookRepository
+from ..repositories.books import AsyncBookRepository, BookRepository
 from ..models.books import Book
 from ..api.schemas.books import BookCreate, BookUpdate
-from .base import BaseService
+from ..utils.pagination import Page, PaginationParams, paginate_async
+from .base import AsyncBaseService, BaseService
 
 
 class BookService(BaseService[Book, BookCreate, BookUpdate]):
@@ -37,8 +38,8 @@ class BookService(BaseService[Book, BookCreate, BookUpdate]):
         """
         Crée un nouveau livre, en vérifiant que l'ISBN n'est pas déjà utilisé.
         """
-        # Vérifier si l'ISBN est déjà utilisé
-        existing_book = self.get_by_isbn(isbn=obj_in.isbn)
+        # Vérifier si l'ISBN est déjà utilisé (y compris par un livre supprimé logiquement)
+        existing_book = self.repository.get_by_isbn(isbn=obj_in.isbn, include_deleted=True)
         if existing_book:
             raise ValueError("L'ISBN est déjà utilisé")
 
@@ -56,4 +57,26 @@ class BookService(BaseService[Book, BookCreate, BookUpdate]):
         if new_quantity < 0:
             raise ValueError("La quantité ne peut pas être négative")
 
-        return self.repository.update(db_obj=book, obj_in={"quantity": new_quantity})
\ No newline at end of file
+        return self.repository.update(db_obj=book, obj_in={"quantity": new_quantity})
+
+
+class AsyncBookService(AsyncBaseService[Book, BookCreate, BookUpdate]):
+    """
+    Service asynchrone de consultation des livres.
+    """
+    def __init__(self, repository: AsyncBookRepository):
+        super().__init__(repository)
+        self.repository = repository
+
+    async def get_by_isbn(self, *, isbn: str) -> Optional[Book]:
+        """
+        Récupère un livre par son ISBN.
+        """
+        return await self.repository.get_by_isbn(isbn=isbn)
+
+    async def search(self, *, params: PaginationParams, **criteria: Any) -> Page:
+        """
+        Recherche paginée de livres (sans critère : tout le catalogue).
+        """
+        statement = self.repository.search_statement(**criteria)
+        return await paginate_async(self.repository.db, statement, params, Book)
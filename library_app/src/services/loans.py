@@ -2,6 +2,7 @@ from typing import List, Optional, Any, Dict, Union
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
+from ..db.unit_of_work import unit_of_work
 from ..repositories.loans import LoanRepository
 from ..repositories.books import BookRepository
 from ..repositories.users import UserRepository
@@ -99,11 +100,17 @@ class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
             "return_date": None
         }
 
-        loan = self.loan_repository.create(obj_in=loan_data)
+        # Emprunt, compteurs et stock validés ensemble, en un seul commit
+        with unit_of_work(self.loan_repository.db):
+            loan = self.loan_repository.create(obj_in=loan_data)
 
-        # Mettre à jour la quantité de livres disponibles
-        book.quantity -= 1
-        self.book_repository.update(db_obj=book, obj_in={"quantity": book.quantity})
+            # Mettre à jour les compteurs, le score de tendance et les agrégats
+            # utilisés par les statistiques
+            self.loan_repository.record_checkout(loan=loan)
+
+            # Mettre à jour la quantité de livres disponibles
+            book.quantity -= 1
+            self.book_repository.update(db_obj=book, obj_in={"quantity": book.quantity})
 
         return loan
 
@@ -120,15 +127,13 @@ class LoanService(BaseService[Loan, LoanCreate, LoanUpdate]):
         if loan.return_date:
             raise ValueError("L'emprunt a déjà été retourné")
 
-        # Marquer l'emprunt comme retourné
-        loan_data = {"return_date": datetime.utcnow()}
-        loan = self.loan_repository.update(db_obj=loan, obj_in=loan_data)
+        with unit_of_work(self.loan_repository.db):
+            # Marquer l'emprunt comme retourné
+            loan_data = {"return_date": datetime.utcnow()}
+            loan = self.loan_repository.update(db_obj=loan, obj_in=loan_data)
 
-        # Mettre à jour la quantité de livres disponibles
-        book = self.book_repository.get(id=loan.book_id)
-        if book:
-            book.quantity += 1
-            self.book_repository.update(db_obj=book, obj_in={"quantity": book.quantity})
+            # Mettre à jour la quantité de livres disponibles (incrément en SQL, sans charger le livre)
+            self.book_repository.update_columns(id=loan.book_id, values={"quantity": Book.quantity + 1})
 
         return loan
 
@@ -0,0 +1,269 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models.books import Book
+from ..models.loans import Loan
+from .analytics import current_generation, new_generation_name, publish_generation
+
+# Valeur de remplissage des lignes de voisins incomplètes
+NO_BOOK = -1
+# Nombre maximal de couples (livre, co-livre) matérialisés à la fois par merge
+CO_BORROWING_CHUNK_SIZE = 1 << 22
+
+
+def _gather_rows(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Concatène les lignes `rows` d'une matrice CSR (indptr, indices) sans boucle Python.
+    """
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype)
+    # Position de chaque élément dans `indices` : début de sa ligne + rang dans la ligne
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return indices[offsets + np.arange(total)]
+
+
+def _to_csr(rows: np.ndarray, cols: np.ndarray, n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Construit une matrice CSR binaire à partir de couples (ligne, colonne) triés et uniques.
+    """
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, cols.astype(np.int32)
+
+
+class CoBorrowingIndex:
+    """
+    Index « les lecteurs ont aussi emprunté ».
+
+    La matrice utilisateur x livre des emprunts est conservée au format CSR
+    (une ligne par utilisateur, triée par ID de livre) ; la co-occurrence
+    livre x livre en découle sans jamais être matérialisée. Seuls les N
+    meilleurs voisins de chaque livre sont stockés, dans une table dense
+    indexée par ID de livre : la lecture se fait en temps constant.
+    """
+    FILES = ("pairs_user", "pairs_book", "related", "related_scores")
+
+    def __init__(self, name: Optional[str], arrays: Dict[str, np.ndarray], meta: Dict[str, Any]):
+        self.name = name
+        self.pairs_user = arrays["pairs_user"]
+        self.pairs_book = arrays["pairs_book"]
+        self.related = arrays["related"]
+        self.related_scores = arrays["related_scores"]
+        self.meta = meta
+
+    @classmethod
+    def empty(cls, top_n: int) -> "CoBorrowingIndex":
+        arrays = {
+            "pairs_user": np.empty(0, dtype=np.int32),
+            "pairs_book": np.empty(0, dtype=np.int32),
+            "related": np.full((0, top_n), NO_BOOK, dtype=np.int32),
+            "related_scores": np.zeros((0, top_n), dtype=np.int32),
+        }
+        return cls(None, arrays, {"last_loan_id": 0, "top_n": top_n})
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["CoBorrowingIndex"]:
+        """
+        Charge l'index publié en mémoire mappée (None s'il n'existe pas).
+        """
+        name = current_generation(directory)
+        if not name:
+            return None
+        path = os.path.join(directory, name)
+        arrays = {
+            file: np.load(os.path.join(path, file + ".npy"), mmap_mode="r")
+            for file in cls.FILES
+        }
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        return cls(name, arrays, meta)
+
+    def save(self, directory: str) -> None:
+        """
+        Écrit l'index dans une nouvelle génération et la publie.
+        """
+        name = new_generation_name("recommendations")
+        path = os.path.join(directory, name)
+        os.makedirs(path)
+        for file in self.FILES:
+            np.save(os.path.join(path, file + ".npy"), getattr(self, file))
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(self.meta, f)
+        publish_generation(directory, name)
+        self.name = name
+
+    def get_related_ids(self, book_id: int) -> List[int]:
+        """
+        IDs des livres les plus co-empruntés avec `book_id`, du plus au moins fréquent.
+        """
+        if book_id < 0 or book_id >= self.related.shape[0]:
+            return []
+        row = self.related[book_id]
+        return [int(id) for id in row[row != NO_BOOK]]
+
+    def merge(
+        self,
+        users: np.ndarray,
+        books: np.ndarray,
+        last_loan_id: int,
+        *,
+        chunk_size: int = CO_BORROWING_CHUNK_SIZE
+    ) -> int:
+        """
+        Intègre de nouveaux couples (utilisateur, livre) et recalcule les voisins
+        des seuls livres dont la co-occurrence a changé. Retourne le nombre de
+        livres recalculés.
+
+        Les lignes de la co-occurrence sont calculées par lots de livres dont
+        le nombre de couples (livre, co-livre) ne dépasse pas `chunk_size`.
+        """
+        top_n = self.meta["top_n"]
+        old_user = np.asarray(self.pairs_user)
+        old_book = np.asarray(self.pairs_book)
+
+        # Couples (utilisateur, livre) uniques, triés par utilisateur puis livre
+        all_user = np.concatenate([old_user, users.astype(np.int32)])
+        all_book = np.concatenate([old_book, books.astype(np.int32)])
+        keys = np.unique(all_user.astype(np.int64) << 32 | all_book.astype(np.int64))
+        pairs_user = (keys >> 32).astype(np.int32)
+        pairs_book = (keys & 0xFFFFFFFF).astype(np.int32)
+
+        # Couples réellement nouveaux : ceux qui ne figuraient pas dans l'index
+        old_keys = old_user.astype(np.int64) << 32 | old_book.astype(np.int64)
+        new_keys = keys[~np.isin(keys, old_keys, assume_unique=True)]
+        self.pairs_user, self.pairs_book = pairs_user, pairs_book
+        self.meta["last_loan_id"] = max(self.meta["last_loan_id"], int(last_loan_id))
+        if new_keys.size == 0:
+            return 0
+
+        n_users = int(pairs_user.max()) + 1
+        n_books = max(int(pairs_book.max()) + 1, self.related.shape[0])
+        user_indptr, user_books = _to_csr(pairs_user, pairs_book, n_users)
+        by_book = np.lexsort((pairs_user, pairs_book))
+        book_indptr, book_users = _to_csr(pairs_book[by_book], pairs_user[by_book], n_books)
+
+        # Livres touchés : les nouveaux livres et tous ceux des lecteurs concernés
+        affected_users = np.unique(new_keys >> 32)
+        dirty = np.unique(np.concatenate([
+            (new_keys & 0xFFFFFFFF),
+            _gather_rows(user_indptr, user_books, affected_users),
+        ])).astype(np.int64)
+
+        related = np.full((n_books, top_n), NO_BOOK, dtype=np.int32)
+        related_scores = np.zeros((n_books, top_n), dtype=np.int32)
+        previous = self.related.shape[0]
+        related[:previous] = self.related
+        related_scores[:previous] = self.related_scores
+        related[dirty] = NO_BOOK
+        related_scores[dirty] = 0
+
+        # Taille de chaque ligne de la co-occurrence avant agrégation :
+        # somme des nombres de livres des lecteurs du livre
+        user_degrees = np.diff(user_indptr)
+        work = np.bincount(pairs_book, weights=user_degrees[pairs_user], minlength=n_books)
+        cumulative_work = np.cumsum(work[dirty])
+        start = 0
+        while start < dirty.size:
+            done = cumulative_work[start - 1] if start else 0
+            stop = max(start + 1, int(np.searchsorted(cumulative_work, done + chunk_size, side="right")))
+            chunk = dirty[start:stop]
+
+            # Produit (utilisateur x livre)ᵀ · (utilisateur x livre) restreint aux
+            # lignes `chunk` : chaque lecteur d'un livre apporte tous ses livres
+            reader_counts = book_indptr[chunk + 1] - book_indptr[chunk]
+            readers = _gather_rows(book_indptr, book_users, chunk)
+            co_books = _gather_rows(user_indptr, user_books, readers).astype(np.int64)
+            rows = np.repeat(np.repeat(np.arange(chunk.size), reader_counts), user_degrees[readers])
+            keep = co_books != chunk[rows]
+            cells, counts = np.unique(rows[keep] * n_books + co_books[keep], return_counts=True)
+            rows, candidates = cells // n_books, cells % n_books
+
+            # Tri par livre, puis nombre de lecteurs communs décroissant, puis par ID
+            order = np.lexsort((candidates, -counts, rows))
+            rows, candidates, counts = rows[order], candidates[order], counts[order]
+            ranks = np.arange(rows.size) - np.searchsorted(rows, rows)
+            best = ranks < top_n
+            related[chunk[rows[best]], ranks[best]] = candidates[best]
+            related_scores[chunk[rows[best]], ranks[best]] = counts[best]
+            start = stop
+
+        self.related, self.related_scores = related, related_scores
+        return int(dirty.size)
+
+
+class RecommendationService:
+    """
+    Service de recommandations « les lecteurs ont aussi emprunté ».
+    """
+    _index: Optional[CoBorrowingIndex] = None
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or os.path.join(settings.ANALYTICS_DIR, "recommendations")
+
+    def get_index(self) -> Optional[CoBorrowingIndex]:
+        """
+        Retourne l'index publié, rechargé s'il a été republié entre-temps.
+        """
+        name = current_generation(self.directory)
+        index = RecommendationService._index
+        if name is None:
+            return None
+        if index is None or index.name != name:
+            index = CoBorrowingIndex.load(self.directory)
+            RecommendationService._index = index
+        return index
+
+    def refresh(self, db: Session, *, full: bool = False) -> Dict[str, Any]:
+        """
+        Met à jour l'index à partir des emprunts créés depuis la dernière
+        exécution (ou reconstruit tout si `full`).
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        index = None if full else self.get_index()
+        if index is None:
+            index = CoBorrowingIndex.empty(settings.RECOMMENDATIONS_TOP_N)
+        else:
+            index = CoBorrowingIndex(None, {
+                file: np.asarray(getattr(index, file)) for file in CoBorrowingIndex.FILES
+            }, dict(index.meta))
+
+        last_loan_id = index.meta["last_loan_id"]
+        rows = db.execute(
+            select(Loan.user_id, Loan.book_id, Loan.id).where(Loan.id > last_loan_id)
+        ).all()
+        users = np.asarray([row.user_id for row in rows], dtype=np.int32)
+        books = np.asarray([row.book_id for row in rows], dtype=np.int32)
+        max_loan_id = max((row.id for row in rows), default=last_loan_id)
+
+        updated_books = index.merge(users, books, max_loan_id)
+        index.save(self.directory)
+        RecommendationService._index = index
+
+        return {
+            "generation": index.name,
+            "new_loans": len(rows),
+            "updated_books": updated_books,
+            "last_loan_id": index.meta["last_loan_id"],
+        }
+
+    def get_related_books(self, db: Session, *, book_id: int) -> List[Book]:
+        """
+        Récupère les livres les plus souvent empruntés par les lecteurs de `book_id`.
+        """
+        index = self.get_index()
+        if index is None:
+            return []
+        ids = index.get_related_ids(book_id)
+        if not ids:
+            return []
+        books = {book.id: book for book in db.query(Book).filter(Book.id.in_(ids)).all()}
+        return [books[id] for id in ids if id in books]
@@ -1,11 +1,137 @@
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
-from sqlalchemy import func
+from typing import Dict, Any, List, Optional
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
 from ..models.books import Book
 from ..models.users import User
 from ..models.loans import Loan
+from ..models.stats import BookDailyLoans, UserDailyLoans
+from ..db.functions import month_bucket
+from ..utils.trending import current_popularity
+
+
+# Requêtes communes à StatsService et AsyncStatsService : seule l'exécution diffère
+
+def _window_start(days: int) -> date:
+    """
+    Premier jour inclus dans une fenêtre des `days` derniers jours.
+    """
+    return datetime.utcnow().date() - timedelta(days=days - 1)
+
+
+def general_stats_statement() -> Select:
+    """
+    Toutes les statistiques générales en une seule requête (sous-requêtes scalaires).
+    """
+    return select(
+        select(func.sum(Book.quantity)).scalar_subquery().label("total_books"),
+        select(func.count(Book.id)).scalar_subquery().label("unique_books"),
+        select(func.count(User.id)).scalar_subquery().label("total_users"),
+        select(func.count(User.id)).where(User.is_active == True).scalar_subquery().label("active_users"),
+        select(func.count(Loan.id)).scalar_subquery().label("total_loans"),
+        select(func.count(Loan.id)).where(Loan.return_date == None).scalar_subquery().label("active_loans"),
+        select(func.count(Loan.id)).where(
+            Loan.return_date == None,
+            Loan.due_date < datetime.utcnow()
+        ).scalar_subquery().label("overdue_loans"),
+    )
+
+
+def most_borrowed_books_statement(limit: int, days: Optional[int]) -> Select:
+    """
+    Livres les plus empruntés (id, title, author, loan_count).
+    """
+    if days:
+        # Fenêtre glissante : somme des agrégats quotidiens
+        loan_count = func.sum(BookDailyLoans.loan_count).label("loan_count")
+        return select(
+            Book.id, Book.title, Book.author, loan_count
+        ).join(
+            BookDailyLoans, BookDailyLoans.book_id == Book.id
+        ).where(
+            BookDailyLoans.day >= _window_start(days)
+        ).group_by(Book.id).order_by(loan_count.desc(), Book.id).limit(limit)
+    # Le compteur est indexé : pas de parcours de la table loan
+    return select(
+        Book.id, Book.title, Book.author, Book.loan_count.label("loan_count")
+    ).where(
+        Book.loan_count > 0
+    ).order_by(Book.loan_count.desc(), Book.id).limit(limit)
+
+
+def most_active_users_statement(limit: int, days: Optional[int]) -> Select:
+    """
+    Utilisateurs les plus actifs (id, full_name, email, loan_count).
+    """
+    if days:
+        loan_count = func.sum(UserDailyLoans.loan_count).label("loan_count")
+        return select(
+            User.id, User.full_name, User.email, loan_count
+        ).join(
+            UserDailyLoans, UserDailyLoans.user_id == User.id
+        ).where(
+            UserDailyLoans.day >= _window_start(days)
+        ).group_by(User.id).order_by(loan_count.desc(), User.id).limit(limit)
+    return select(
+        User.id, User.full_name, User.email, User.loan_count.label("loan_count")
+    ).where(
+        User.loan_count > 0
+    ).order_by(User.loan_count.desc(), User.id).limit(limit)
+
+
+def trending_books_statement(limit: int) -> Select:
+    """
+    Livres au plus fort score de popularité.
+    """
+    return select(
+        Book.id, Book.title, Book.author, Book.trending_score
+    ).where(
+        Book.trending_score > 0
+    ).order_by(Book.trending_score.desc(), Book.id).limit(limit)
+
+
+def _general_stats(row) -> Dict[str, Any]:
+    return {key: value or 0 for key, value in row._mapping.items()}
+
+
+def _books_with_loan_count(rows) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": book.id,
+            "title": book.title,
+            "author": book.author,
+            "loan_count": book.loan_count
+        }
+        for book in rows
+    ]
+
+
+def _users_with_loan_count(rows) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": user.id,
+            "full_name": user.full_name,
+            "email": user.email,
+            "loan_count": user.loan_count
+        }
+        for user in rows
+    ]
+
+
+def _trending_books(rows) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    return [
+        {
+            "id": book.id,
+            "title": book.title,
+            "author": book.author,
+            "popularity": round(current_popularity(book.trending_score, now), 4)
+        }
+        for book in rows
+    ]
 
 
 class StatsService:
@@ -19,68 +145,28 @@ class StatsService:
         """
         Récupère des statistiques générales sur la bibliothèque.
         """
-        total_books = self.db.query(func.sum(Book.quantity)).scalar() or 0
-        unique_books = self.db.query(func.count(Book.id)).scalar() or 0
-        total_users = self.db.query(func.count(User.id)).scalar() or 0
-        active_users = self.db.query(func.count(User.id)).filter(User.is_active == True).scalar() or 0
-        total_loans = self.db.query(func.count(Loan.id)).scalar() or 0
-        active_loans = self.db.query(func.count(Loan.id)).filter(Loan.return_date == None).scalar() or 0
-        overdue_loans = self.db.query(func.count(Loan.id)).filter(
-            Loan.return_date == None,
-            Loan.due_date < datetime.utcnow()
-        ).scalar() or 0
-
-        return {
-            "total_books": total_books,
-            "unique_books": unique_books,
-            "total_users": total_users,
-            "active_users": active_users,
-            "total_loans": total_loans,
-            "active_loans": active_loans,
-            "overdue_loans": overdue_loans
-        }
+        return _general_stats(self.db.execute(general_stats_statement()).one())
 
-    def get_most_borrowed_books(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_most_borrowed_books(self, limit: int = 10, days: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Récupère les livres les plus empruntés.
+        Récupère les livres les plus empruntés, depuis toujours ou sur les
+        `days` derniers jours.
         """
-        result = self.db.query(
-            Book.id,
-            Book.title,
-            Book.author,
-            func.count(Loan.id).label("loan_count")
-        ).join(Loan).group_by(Book.id).order_by(func.count(Loan.id).desc()).limit(limit).all()
+        return _books_with_loan_count(self.db.execute(most_borrowed_books_statement(limit, days)))
 
-        return [
-            {
-                "id": book.id,
-                "title": book.title,
-                "author": book.author,
-                "loan_count": book.loan_count
-            }
-            for book in result
-        ]
-
-    def get_most_active_users(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_most_active_users(self, limit: int = 10, days: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Récupère les utilisateurs les plus actifs.
+        Récupère les utilisateurs les plus actifs, depuis toujours ou sur les
+        `days` derniers jours.
         """
-        result = self.db.query(
-            User.id,
-            User.full_name,
-            User.email,
-            func.count(Loan.id).label("loan_count")
-        ).join(Loan).group_by(User.id).order_by(func.count(Loan.id).desc()).limit(limit).all()
+        return _users_with_loan_count(self.db.execute(most_active_users_statement(limit, days)))
 
-        return [
-            {
-                "id": user.id,
-                "full_name": user.full_name,
-                "email": user.email,
-                "loan_count": user.loan_count
-            }
-            for user in result
-        ]
+    def get_trending_books(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Récupère les livres populaires en ce moment (emprunts récents pondérés
+        par une décroissance exponentielle).
+        """
+        return _trending_books(self.db.execute(trending_books_statement(limit)))
 
     def get_monthly_loans(self, months: int = 12) -> List[Dict[str, Any]]:
         """
@@ -88,17 +174,17 @@ class StatsService:
         """
         start_date = datetime.utcnow() - timedelta(days=30 * months)
 
-        # Cette requête est simplifiée et peut ne pas fonctionner avec tous les SGBD
-        # Pour une solution plus robuste, utilisez des fonctions spécifiques au SGBD
+        # month_bucket est compilé selon le dialecte (SQLite, PostgreSQL)
+        month = month_bucket(Loan.loan_date)
         result = self.db.query(
-            func.strftime("%Y-%m", Loan.loan_date).label("month"),
+            month.label("month"),
             func.count(Loan.id).label("loan_count")
         ).filter(
             Loan.loan_date >= start_date
         ).group_by(
-            func.strftime("%Y-%m", Loan.loan_date)
+            month
         ).order_by(
-            func.strftime("%Y-%m", Loan.loan_date)
+            month
         ).all()
 
         return [
@@ -107,4 +193,38 @@ class StatsService:
                 "loan_count": loan_count
             }
             for month, loan_count in result
-        ]
\ No newline at end of file
+        ]
+
+
+class AsyncStatsService:
+    """
+    Statistiques les plus consultées, sur une session asynchrone.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_general_stats(self) -> Dict[str, Any]:
+        """
+        Récupère des statistiques générales sur la bibliothèque.
+        """
+        return _general_stats((await self.db.execute(general_stats_statement())).one())
+
+    async def get_most_borrowed_books(self, limit: int = 10, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Récupère les livres les plus empruntés, depuis toujours ou sur les
+        `days` derniers jours.
+        """
+        return _books_with_loan_count(await self.db.execute(most_borrowed_books_statement(limit, days)))
+
+    async def get_most_active_users(self, limit: int = 10, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Récupère les utilisateurs les plus actifs, depuis toujours ou sur les
+        `days` derniers jours.
+        """
+        return _users_with_loan_count(await self.db.execute(most_active_users_statement(limit, days)))
+
+    async def get_trending_books(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Récupère les livres populaires en ce moment.
+        """
+        return _trending_books(await self.db.execute(trending_books_statement(limit)))
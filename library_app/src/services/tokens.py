@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Tuple
+
+from ..db.unit_of_work import on_commit
+from ..repositories.tokens import RefreshTokenRepository
+from ..models.tokens import RefreshToken
+from ..utils.security import create_refresh_token, hash_refresh_token, revoked_refresh_tokens
+from ..config import settings
+from .base import BaseService
+
+
+class RefreshTokenService(BaseService[RefreshToken, None, None]):
+    """
+    Service pour la gestion des jetons de rafraîchissement.
+
+    Chaque jeton ne sert qu'une fois : /auth/refresh le révoque et en émet un
+    nouveau (rotation). La présentation d'un jeton déjà révoqué signale un vol
+    probable : tous les jetons de l'utilisateur sont alors révoqués.
+    """
+    def __init__(self, repository: RefreshTokenRepository):
+        super().__init__(repository)
+        self.repository = repository
+
+    def issue(self, *, user_id: int) -> str:
+        """
+        Émet un nouveau jeton de rafraîchissement pour un utilisateur.
+        """
+        token = create_refresh_token()
+        self.repository.add(
+            user_id=user_id,
+            token_hash=hash_refresh_token(token),
+            expires_at=self._expires_at(),
+        )
+        return token
+
+    def rotate(self, *, token: str) -> Tuple[int, str]:
+        """
+        Échange un jeton valide contre un nouveau. Retourne (ID utilisateur, nouveau jeton).
+        """
+        token_hash = hash_refresh_token(token)
+
+        revoked_user_id = revoked_refresh_tokens.get_user_id(token_hash)
+        if revoked_user_id is not None:
+            self._revoke_all(revoked_user_id)
+            raise ValueError("Jeton de rafraîchissement révoqué")
+
+        db_token = self.repository.get_by_hash(token_hash=token_hash)
+        if not db_token or db_token.expires_at <= datetime.utcnow():
+            raise ValueError("Jeton de rafraîchissement invalide ou expiré")
+        if db_token.revoked_at is not None:
+            self._revoke_all(db_token.user_id)
+            raise ValueError("Jeton de rafraîchissement révoqué")
+
+        user_id, expires_at = db_token.user_id, db_token.expires_at
+        new_token = create_refresh_token()
+        rotated = self.repository.rotate(
+            token_hash=token_hash,
+            user_id=user_id,
+            new_token_hash=hash_refresh_token(new_token),
+            expires_at=self._expires_at(),
+        )
+        self._remember_revoked(token_hash, user_id, expires_at)
+        if not rotated:
+            # Un rafraîchissement concurrent a déjà consommé ce jeton
+            self._revoke_all(user_id)
+            raise ValueError("Jeton de rafraîchissement révoqué")
+        return user_id, new_token
+
+    def revoke(self, *, token: str) -> None:
+        """
+        Révoque un jeton (déconnexion).
+        """
+        token_hash = hash_refresh_token(token)
+        db_token = self.repository.get_by_hash(token_hash=token_hash)
+        if db_token and self.repository.revoke(token_hash=token_hash):
+            self._remember_revoked(token_hash, db_token.user_id, db_token.expires_at)
+
+    def _revoke_all(self, user_id: int) -> None:
+        for db_token in self.repository.revoke_all_for_user(user_id=user_id):
+            self._remember_revoked(db_token.token_hash, user_id, db_token.expires_at)
+
+    def _remember_revoked(self, token_hash: str, user_id: int, expires_at: datetime) -> None:
+        """
+        Ajoute le jeton à la liste des révocations en mémoire, une fois la
+        révocation validée (voir on_commit).
+        """
+        on_commit(
+            self.repository.db,
+            ("revoked_refresh_token", token_hash),
+            partial(revoked_refresh_tokens.add, token_hash, user_id, expires_at),
+        )
+
+    @staticmethod
+    def _expires_at() -> datetime:
+        return datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
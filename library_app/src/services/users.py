@@ -1,10 +1,14 @@
-from typing import Optional, List, Any, Dict, Union
+from functools import partial
+from typing import Optional, List, Any, Dict, Sequence, Union
+
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from ..repositories.users import UserRepository
 from ..models.users import User
 from ..api.schemas.users import UserCreate, UserUpdate
-from ..utils.security import get_password_hash, verify_password
+from ..db.unit_of_work import on_commit
+from ..utils.security import get_password_hash, verify_password, invalidate_principal
 from .base import BaseService
 
 
@@ -22,21 +26,17 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         """
         return self.repository.get_by_email(email=email)
 
-    def create(self, *, obj_in: UserCreate) -> User:
+    def create(self, *, obj_in: Union[UserCreate, Dict[str, Any]]) -> User:
         """
-        Crée un nouvel utilisateur avec un mot de passe hashé.
+        Crée un nouvel utilisateur avec un mot de passe hashé (`obj_in` peut
+        aussi être le résultat de hash_password, calculé au préalable).
         """
-        # Vérifier si l'email est déjà utilisé
-        existing_user = self.get_by_email(email=obj_in.email)
+        user_data = self.hash_password(obj_in)
+        # Vérifier si l'email est déjà utilisé (y compris par un utilisateur supprimé logiquement)
+        existing_user = self.repository.get_by_email(email=user_data["email"], include_deleted=True)
         if existing_user:
             raise ValueError("L'email est déjà utilisé")
 
-        # Hasher le mot de passe
-        hashed_password = get_password_hash(obj_in.password)
-        user_data = obj_in.dict()
-        del user_data["password"]
-        user_data["hashed_password"] = hashed_password
-
         return self.repository.create(obj_in=user_data)
 
     def update(
@@ -48,17 +48,92 @@ class UserService(BaseService[User, UserCreate, UserUpdate]):
         """
         Met à jour un utilisateur, en hashant le nouveau mot de passe si fourni.
         """
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
+        update_data = self.hash_password(obj_in, exclude_unset=True)
+        user = super().update(db_obj=db_obj, obj_in=update_data)
+        self._invalidate_principal(user.id)
+        return user
 
-        if "password" in update_data and update_data["password"]:
-            hashed_password = get_password_hash(update_data["password"])
-            update_data["hashed_password"] = hashed_password
-            del update_data["password"]
+    def remove(self, *, id: int) -> User:
+        """
+        Supprime un utilisateur et le retire du cache d'authentification.
+        """
+        user = super().remove(id=id)
+        self._invalidate_principal(id)
+        return user
 
-        return super().update(db_obj=db_obj, obj_in=update_data)
+    def soft_delete(self, *, id: Any) -> Optional[User]:
+        """
+        Supprime logiquement un utilisateur et le retire du cache d'authentification.
+        """
+        user = super().soft_delete(id=id)
+        self._invalidate_principal(id)
+        return user
+
+    def create_many(self, objs_in: Sequence[Union[UserCreate, Dict[str, Any]]], **kwargs: Any) -> List[int]:
+        """
+        Crée plusieurs utilisateurs en masse, mots de passe hashés.
+        """
+        return super().create_many([self.hash_password(obj_in) for obj_in in objs_in], **kwargs)
+
+    def update_many(self, values_by_id: Dict[Any, Union[UserUpdate, Dict[str, Any]]], **kwargs: Any) -> List[int]:
+        """
+        Met à jour plusieurs utilisateurs et les retire du cache d'authentification.
+        """
+        ids = super().update_many(
+            {id: self.hash_password(obj_in, exclude_unset=True) for id, obj_in in values_by_id.items()},
+            **kwargs
+        )
+        for id in ids:
+            self._invalidate_principal(id)
+        return ids
+
+    def upsert_many(
+        self,
+        objs_in: Sequence[Union[UserCreate, Dict[str, Any]]],
+        *,
+        index_elements: Sequence[str] = ("email",),
+        **kwargs: Any
+    ) -> List[int]:
+        """
+        Crée ou met à jour plusieurs utilisateurs (par email par défaut).
+        """
+        ids = super().upsert_many(
+            [self.hash_password(obj_in) for obj_in in objs_in], index_elements=index_elements, **kwargs
+        )
+        for id in ids:
+            self._invalidate_principal(id)
+        return ids
+
+    def delete_where(self, *criteria: Any) -> List[int]:
+        """
+        Supprime les utilisateurs qui vérifient `criteria` et les retire du
+        cache d'authentification.
+        """
+        ids = super().delete_where(*criteria)
+        for id in ids:
+            self._invalidate_principal(id)
+        return ids
+
+    def _invalidate_principal(self, user_id: int) -> None:
+        """
+        Retire l'utilisateur du cache d'authentification une fois la
+        modification validée (voir on_commit) : avant, une requête
+        concurrente y remettrait la ligne d'avant la modification.
+        """
+        on_commit(self.repository.db, ("principal", user_id), partial(invalidate_principal, user_id))
+
+    @staticmethod
+    def hash_password(obj_in: Union[BaseModel, Dict[str, Any]], exclude_unset: bool = False) -> Dict[str, Any]:
+        """
+        Données d'un utilisateur où le mot de passe en clair est remplacé par
+        son hash. Les routes l'appellent avant run_write : bcrypt ne s'exécute
+        pas dans le thread écrivain.
+        """
+        data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=exclude_unset)
+        password = data.pop("password", None)
+        if password:
+            data["hashed_password"] = get_password_hash(password)
+        return data
 
     def authenticate(self, *, email: str, password: str) -> Optional[User]:
         """
@@ -1,8 +1,12 @@
+from collections import OrderedDict
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
 import time
 import hashlib
 import json
+import threading
+
+from .metrics import cache_requests_total
 
 # Cache en mémoire simple
 cache_store: Dict[str, Tuple[float, Any]] = {}
@@ -33,7 +37,9 @@ def cache(expiry: int = DEFAULT_EXPIRY):
             if key in cache_store:
                 expiry_time, value = cache_store[key]
                 if expiry_time > now:
+                    cache_requests_total.inc(cache=func.__qualname__, result="hit")
                     return value
+            cache_requests_total.inc(cache=func.__qualname__, result="miss")
 
             # Exécuter la fonction et mettre en cache le résultat
             result = func(*args, **kwargs)
@@ -54,4 +60,57 @@ def invalidate_cache(prefix: str = None) -> None:
         cache_store = {k: v for k, v in cache_store.items() if not k.startswith(prefix)}
     else:
         # Invalider tout le cache
-        cache_store = {}
\ No newline at end of file
+        cache_store = {}
+
+
+class TTLCache:
+    """
+    Cache en mémoire borné en nombre d'entrées, avec expiration (TTL).
+
+    Les entrées les moins récemment utilisées sont évincées en premier.
+    Le cache est propre à chaque processus.
+    """
+    def __init__(self, maxsize: int, ttl: float, name: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Nom sous lequel les consultations sont comptées (cache_requests_total)
+        self.name = name
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Retourne la valeur associée à `key`, ou None si absente ou expirée.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._data[key]
+                entry = None
+            if entry is not None:
+                self._data.move_to_end(key)
+        if self.name:
+            cache_requests_total.inc(cache=self.name, result="miss" if entry is None else "hit")
+        return None if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """
+        Supprime les entrées pour lesquelles `predicate(clé, valeur)` est vrai.
+        """
+        with self._lock:
+            for key in [k for k, (_, v) in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,89 @@
+import gzip
+import zlib
+from typing import Dict, Iterable, Optional
+
+try:
+    import brotli
+except ImportError:  # Dépendance optionnelle : gzip seul sinon
+    brotli = None
+
+# Encodages proposés, par ordre de préférence à qualité égale
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """
+    Encodages d'un en-tête Accept-Encoding avec leur qualité (q=), par
+    exemple "gzip, br;q=0.8" -> {"gzip": 1.0, "br": 0.8}.
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def choose_encoding(accept_encoding: str, available: Iterable[str] = ENCODINGS) -> Optional[str]:
+    """
+    Encodage à utiliser parmi `available` (dans leur ordre de préférence)
+    selon l'en-tête Accept-Encoding du client ; None pour ne pas compresser.
+    """
+    accepted = accepted_encodings(accept_encoding)
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compressible(content_type: str, allowed_types: Iterable[str]) -> bool:
+    """
+    Indique si le type de contenu (paramètres charset... ignorés) figure
+    dans la liste : type exact ("application/json") ou préfixe ("text/").
+    """
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return any(
+        media_type.startswith(allowed) if allowed.endswith("/") else media_type == allowed
+        for allowed in allowed_types
+    )
+
+
+def compress(data: bytes, encoding: str, *, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    """
+    Compresse `data` en une fois (gzip ou br).
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+class StreamCompressor:
+    """
+    Compression incrémentale d'une réponse envoyée en plusieurs morceaux.
+    """
+    def __init__(self, encoding: str, *, gzip_level: int = 6, brotli_quality: int = 4):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._compress, self._finish = self._compressor.process, self._compressor.finish
+        else:
+            # wbits=31 : en-tête et somme de contrôle gzip
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+            self._compress, self._finish = self._compressor.compress, self._compressor.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        return self._finish()
@@ -0,0 +1,37 @@
+import hashlib
+import time
+from typing import Dict, Optional
+
+# Réponses propres à l'utilisateur authentifié, à revalider à chaque usage
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(versions: Dict[str, int], period: int = 0) -> str:
+    """
+    ETag faible dérivé des versions des tables lues par la réponse et, si
+    `period` est positif, de la période de temps courante : une réponse qui
+    dépend de l'heure (popularité, retards) change au moins une fois par
+    période. Faible (W/) : la compression modifie les octets envoyés.
+    """
+    key = ";".join("%s:%d" % item for item in sorted(versions.items()))
+    if period > 0:
+        key += "|%d" % (time.time() // period)
+    return 'W/"%s"' % hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Indique si l'en-tête If-None-Match désigne `etag` (comparaison faible).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
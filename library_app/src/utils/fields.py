@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, selectinload
+
+
+@dataclass(frozen=True)
+class FieldSelection:
+    """
+    Champs demandés par `fields=` sur une liste, classés selon ce qu'ils
+    coûtent à charger : colonnes du modèle, relations, champs calculés.
+    """
+    model: Type
+    schema: Type[BaseModel]
+    columns: Tuple[str, ...]
+    relationships: Tuple[str, ...]
+    derived: Tuple[str, ...]
+
+    @property
+    def only_columns(self) -> bool:
+        """
+        Seulement des colonnes : un SELECT de ces colonnes suffit, sans objets ORM.
+        """
+        return not self.relationships and not self.derived
+
+    def options(self) -> List[Any]:
+        """
+        Options de chargement ORM : load_only des colonnes demandées (sauf si
+        un champ calculé peut dépendre des autres) et selectinload des seules
+        relations demandées.
+        """
+        options = [selectinload(getattr(self.model, name)) for name in self.relationships]
+        if not self.derived:
+            # La clé primaire est toujours chargée, même sans colonne demandée
+            names = self.columns or ("id",)
+            options.append(load_only(*(getattr(self.model, name) for name in names)))
+        return options
+
+    def dump(self, objs: Sequence[Any]) -> List[Dict[str, Any]]:
+        """
+        Sérialise les objets ORM en ne lisant que les champs demandés.
+        """
+        return [self.schema.model_validate(obj, from_attributes=True).model_dump() for obj in objs]
+
+
+def parse_fields(value: Optional[str], schema: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """
+    Liste `fields=id,title,quantity` validée contre les champs du schéma de
+    réponse (ValueError pour un champ inconnu), dans l'ordre du schéma.
+    """
+    if not value:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested - set(schema.model_fields)
+    if unknown:
+        raise ValueError("Champs inconnus : %s" % ", ".join(sorted(unknown)))
+    return tuple(name for name in schema.model_fields if name in requested) or None
+
+
+@lru_cache(maxsize=256)
+def select_fields(model: Type, schema: Type[BaseModel], fields: Tuple[str, ...]) -> FieldSelection:
+    """
+    Sélection de `fields` (voir parse_fields), avec un schéma réduit à ces
+    champs construit une fois par combinaison.
+    """
+    mapper = inspect(model)
+    columns = tuple(name for name in fields if name in mapper.column_attrs)
+    relationships = tuple(name for name in fields if name in mapper.relationships)
+    derived = tuple(name for name in fields if name not in columns and name not in relationships)
+    partial = create_model(
+        "%sFields" % schema.__name__,
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields},
+    )
+    return FieldSelection(model, partial, columns, relationships, derived)
@@ -1,30 +1,155 @@
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 
-# Configurer le logger
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('sql.log')
-    ]
-)
-
-logger = logging.getLogger('sqlalchemy.engine')
-
-# Activer la journalisation des requêtes SQL
-@event.listens_for(Engine, "before_cursor_execute")
-def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    conn.info.setdefault('query_start_time', []).append(time.time())
-    logger.debug("SQL: %s", statement)
-    logger.debug("Parameters: %s", parameters)
-
-@event.listens_for(Engine, "after_cursor_execute")
-def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    total = time.time() - conn.info['query_start_time'].pop(-1)
-    logger.debug("Total execution time: %.3f ms", total * 1000)
-    if total > 0.1:  # Log slow queries (> 100ms)
-        logger.warning("Slow query detected (%.3f ms): %s", total * 1000, statement)
+from ..config import settings
+from .profiling import record_query
+from .slow_queries import EXPLAIN_OPTION, slow_query_log
+
+# Identifiant de la requête HTTP en cours (positionné par RequestContextMiddleware)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+logger = logging.getLogger("library")
+sql_logger = logging.getLogger("library.sql")
+
+# Attributs standard d'un LogRecord : tout le reste provient de `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formate chaque enregistrement en une ligne JSON (horodatage, niveau,
+    logger, message, request_id et champs passés via `extra`).
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Ajoute le request_id courant à l'enregistrement. Appliqué sur le
+    QueueHandler, donc dans le thread qui émet le log (le thread d'écriture
+    n'a pas accès au contexte de la requête).
+    """
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+def setup_logging() -> None:
+    """
+    Configure la journalisation de l'application (appelée au démarrage).
+
+    Les loggers n'écrivent que dans une file en mémoire ; un thread dédié
+    (QueueListener) formate les enregistrements et les écrit sur la console
+    et dans un fichier à rotation par taille. Sans effet si déjà configurée.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    formatter = JsonFormatter()
+    handlers = [logging.StreamHandler()]
+    if settings.LOG_FILE:
+        directory = os.path.dirname(settings.LOG_FILE)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handlers.append(logging.handlers.RotatingFileHandler(
+            settings.LOG_FILE,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        ))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(settings.LOG_LEVEL)
+    sql_logger.setLevel(settings.SQL_LOG_LEVEL)
+    # Le logger interne de SQLAlchemy journaliserait chaque requête au niveau INFO
+    if not settings.SQL_ECHO:
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    Vide la file et arrête le thread d'écriture (appelée à l'arrêt).
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        _listener = None
+        _queue_handler = None
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Mesure la durée des requêtes SQL d'un moteur et les attribue à la
+    requête HTTP en cours (voir utils.profiling).
+
+    Les requêtes lentes (au-delà de SLOW_QUERY_THRESHOLD_MS) sont toujours
+    journalisées et consignées dans slow_query_log ; au niveau DEBUG, seule une fraction SQL_LOG_SAMPLE_RATE
+    des requêtes l'est.
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        if context is not None and context.execution_options.get(EXPLAIN_OPTION):
+            return
+        record_query(statement, duration_ms)
+        if duration_ms > settings.SLOW_QUERY_THRESHOLD_MS:
+            entry = slow_query_log.record(conn.engine, statement, parameters, duration_ms)
+            sql_logger.warning(
+                "Slow query",
+                extra={
+                    "duration_ms": round(duration_ms, 3),
+                    "fingerprint": entry["fingerprint"],
+                    "parameters": entry["parameters"],
+                },
+            )
+        elif (
+            sql_logger.isEnabledFor(logging.DEBUG)
+            and random.random() < settings.SQL_LOG_SAMPLE_RATE
+        ):
+            sql_logger.debug(
+                "SQL",
+                extra={"duration_ms": round(duration_ms, 3), "statement": statement, "parameters": parameters},
+            )
@@ -0,0 +1,257 @@
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import anyio.to_thread
+
+# Bornes (en secondes) des histogrammes de latence
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Métrique nommée, éventuellement déclinée par étiquettes (labels).
+    """
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError("Étiquettes attendues pour %s : %s" % (self.name, ", ".join(self.labelnames)))
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues, extra: Iterable[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{%s}" % ",".join('%s="%s"' % (name, _escape(value)) for name, value in pairs)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            "# HELP %s %s" % (self.name, self.documentation),
+            "# TYPE %s %s" % (self.name, self.type),
+        ] + self.samples()
+
+
+class Counter(Metric):
+    """
+    Valeur qui ne fait qu'augmenter (nombre de requêtes, secondes cumulées...).
+    """
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return ["%s%s %s" % (self.name, self._labels(key), _format_value(value)) for key, value in items]
+
+
+class Gauge(Metric):
+    """
+    Valeur instantanée, fixée directement ou calculée à la lecture (`set_function`).
+    """
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function: Optional[Callable[[], Optional[float]]] = None
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def set_function(self, function: Callable[[], Optional[float]]) -> None:
+        """
+        Calcule la valeur (sans étiquettes) à chaque lecture ; None l'omet.
+        """
+        self._function = function
+
+    def samples(self) -> List[str]:
+        if self._function is not None:
+            value = self._function()
+            return [] if value is None else ["%s %s" % (self.name, _format_value(value))]
+        with self._lock:
+            items = list(self._values.items())
+        return ["%s%s %s" % (self.name, self._labels(key), _format_value(value)) for key, value in items]
+
+
+class Histogram(Metric):
+    """
+    Distribution d'observations dans des intervalles fixes (format cumulatif
+    de Prometheus : _bucket{le=...}, _sum, _count).
+    """
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                # Comptes par intervalle (le dernier est +Inf), somme, nombre
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def get_count(self, **labels) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, (list(entry[0]), entry[1], entry[2])) for key, entry in self._values.items()]
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                lines.append("%s_bucket%s %d" % (
+                    self.name, self._labels(key, [("le", _format_value(bound))]), cumulative
+                ))
+            lines.append("%s_sum%s %s" % (self.name, self._labels(key), _format_value(total)))
+            lines.append("%s_count%s %d" % (self.name, self._labels(key), count))
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registre des métriques du processus, exporté au format texte de Prometheus.
+    """
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError("Métrique déjà enregistrée : %s" % metric.name)
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Requêtes HTTP
+http_requests_total = registry.counter(
+    "http_requests_total", "Requêtes HTTP traitées.", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "Durée de traitement des requêtes HTTP.", ("method", "route")
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "Requêtes HTTP en cours de traitement."
+)
+
+# SQL
+sql_queries_total = registry.counter(
+    "sql_queries_total", "Requêtes SQL exécutées, par route.", ("route",)
+)
+sql_time_seconds_total = registry.counter(
+    "sql_time_seconds_total", "Temps passé dans les requêtes SQL, par route.", ("route",)
+)
+db_pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds", "Attente pour obtenir une connexion du pool.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+db_pool_connections_in_use = registry.gauge(
+    "db_pool_connections_in_use", "Connexions du pool actuellement empruntées."
+)
+db_write_batch_size = registry.histogram(
+    "db_write_batch_size", "Écritures validées par transaction du thread écrivain.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+# Cache
+cache_requests_total = registry.counter(
+    "cache_requests_total", "Consultations des caches en mémoire.", ("cache", "result")
+)
+
+
+def _threadpool_statistic(attribute: str) -> Callable[[], Optional[float]]:
+    """
+    Lit une statistique du limiteur de threads d'anyio (threadpool des routes
+    synchrones). Disponible uniquement depuis la boucle d'événements.
+    """
+    def read() -> Optional[float]:
+        try:
+            statistics = anyio.to_thread.current_default_thread_limiter().statistics()
+        except Exception:
+            return None
+        return getattr(statistics, attribute)
+    return read
+
+
+registry.gauge(
+    "threadpool_threads_busy", "Threads du threadpool occupés par une route synchrone."
+).set_function(_threadpool_statistic("borrowed_tokens"))
+registry.gauge(
+    "threadpool_threads_total", "Taille du threadpool des routes synchrones."
+).set_function(_threadpool_statistic("total_tokens"))
+registry.gauge(
+    "threadpool_tasks_waiting", "Appels en attente d'un thread libre."
+).set_function(_threadpool_statistic("tasks_waiting"))
@@ -1,6 +1,10 @@
-from typing import Generic, TypeVar, List, Optional, Dict, Any
+from typing import Generic, TypeVar, List, Optional, Dict, Any, Sequence, Tuple, Type
 from pydantic import BaseModel
-from sqlalchemy.orm import Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import Select
+from .fields import FieldSelection
 from fastapi import Query as QueryParam
 
 T = TypeVar('T')
@@ -31,6 +35,34 @@ class Page(BaseModel, Generic[T]):
         arbitrary_types_allowed = True
 
 
+def _apply_sort(query, params: PaginationParams, schema):
+    """
+    Applique le tri demandé (Query ou Select), si la colonne existe.
+    """
+    if params.sort_by and hasattr(schema, params.sort_by):
+        column = getattr(schema, params.sort_by)
+        query = query.order_by(column.desc() if params.sort_desc else column)
+    return query
+
+
+def _page_fields(items: List[Any], total: int, params: PaginationParams) -> Dict[str, Any]:
+    # Calculer le nombre de pages
+    pages = (total + params.limit - 1) // params.limit if params.limit > 0 else 1
+    page = (params.skip // params.limit) + 1 if params.limit > 0 else 1
+
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "size": params.limit,
+        "pages": pages
+    }
+
+
+def _page(items: List[Any], total: int, params: PaginationParams) -> Page:
+    return Page(**_page_fields(items, total, params))
+
+
 def paginate(query: Query, params: PaginationParams, schema) -> Page:
     """
     Pagine une requête SQLAlchemy.
@@ -39,25 +71,98 @@ def paginate(query: Query, params: PaginationParams, schema) -> Page:
     total = query.count()
 
     # Appliquer le tri si spécifié
-    if params.sort_by:
-        if hasattr(schema, params.sort_by):
-            column = getattr(schema, params.sort_by)
-            if params.sort_desc:
-                query = query.order_by(column.desc())
-            else:
-                query = query.order_by(column)
+    query = _apply_sort(query, params, schema)
 
     # Appliquer la pagination
     items = query.offset(params.skip).limit(params.limit).all()
 
-    # Calculer le nombre de pages
-    pages = (total + params.limit - 1) // params.limit if params.limit > 0 else 1
-    page = (params.skip // params.limit) + 1 if params.limit > 0 else 1
+    return _page(items, total, params)
+
+
+async def paginate_async(db: AsyncSession, statement: Select, params: PaginationParams, schema) -> Page:
+    """
+    Pagine une requête select() sur une session asynchrone.
+    """
+    total = await db.scalar(
+        select(func.count()).select_from(statement.order_by(None).subquery())
+    )
+    statement = _apply_sort(statement, params, schema)
+    items = list(await db.scalars(statement.offset(params.skip).limit(params.limit)))
+    return _page(items, total or 0, params)
+
+
+def _rows_statements(
+    model, schema: Type[BaseModel], params: PaginationParams, criteria: Sequence[Any]
+) -> Tuple[Select, Select]:
+    """
+    Requêtes de comptage et de page de paginate_rows.
+    """
+    count = select(func.count()).select_from(model).where(*criteria)
+    statement = select(*(getattr(model, name) for name in schema.model_fields)).where(*criteria)
+    statement = _apply_sort(statement, params, model)
+    return count, statement.offset(params.skip).limit(params.limit)
+
+
+def _fields_statements(
+    selection: FieldSelection, params: PaginationParams, criteria: Sequence[Any]
+) -> Tuple[Select, Select]:
+    """
+    Requêtes de comptage et de page de paginate_fields (objets ORM).
+    """
+    model = selection.model
+    count = select(func.count()).select_from(model).where(*criteria)
+    statement = _apply_sort(select(model).options(*selection.options()).where(*criteria), params, model)
+    return count, statement.offset(params.skip).limit(params.limit)
+
+
+def paginate_rows(
+    db: Session, model, schema: Type[BaseModel], params: PaginationParams, *criteria: Any
+) -> Dict[str, Any]:
+    """
+    Pagine directement en dictionnaires les colonnes de `model` nommées par
+    les champs de `schema` : ni objets ORM ni validation Pydantic, la page
+    est prête à être sérialisée (FastJSONResponse).
+    """
+    count, statement = _rows_statements(model, schema, params, criteria)
+    rows = db.execute(statement).mappings()
+    return _page_fields([dict(row) for row in rows], db.scalar(count) or 0, params)
+
 
-    return Page(
-        items=items,
-        total=total,
-        page=page,
-        size=params.limit,
-        pages=pages
-    )
\ No newline at end of file
+async def paginate_rows_async(
+    db: AsyncSession, model, schema: Type[BaseModel], params: PaginationParams, *criteria: Any
+) -> Dict[str, Any]:
+    """
+    Équivalent de paginate_rows sur une session asynchrone.
+    """
+    count, statement = _rows_statements(model, schema, params, criteria)
+    rows = (await db.execute(statement)).mappings()
+    return _page_fields([dict(row) for row in rows], await db.scalar(count) or 0, params)
+
+
+def paginate_fields(
+    db: Session, selection: FieldSelection, params: PaginationParams, *criteria: Any
+) -> Dict[str, Any]:
+    """
+    Pagine en ne chargeant que les champs de `selection` (`fields=`) : un
+    SELECT des colonnes demandées si ce ne sont que des colonnes, sinon les
+    objets ORM restreints par load_only, avec les seules relations demandées.
+    """
+    if selection.only_columns:
+        return paginate_rows(db, selection.model, selection.schema, params, *criteria)
+    count, statement = _fields_statements(selection, params, criteria)
+    items = db.execute(statement).scalars().all()
+    return _page_fields(selection.dump(items), db.scalar(count) or 0, params)
+
+
+async def paginate_fields_async(
+    db: AsyncSession, selection: FieldSelection, params: PaginationParams, *criteria: Any
+) -> Dict[str, Any]:
+    """
+    Équivalent de paginate_fields sur une session asynchrone (les relations
+    demandées sont chargées par selectinload, jamais paresseusement).
+    """
+    if selection.only_columns:
+        return await paginate_rows_async(db, selection.model, selection.schema, params, *criteria)
+    count, statement = _fields_statements(selection, params, criteria)
+    items = (await db.scalars(statement)).all()
+    return _page_fields(selection.dump(items), await db.scalar(count) or 0, params)
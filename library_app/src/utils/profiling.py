@@ -0,0 +1,141 @@
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..config import settings
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Forme normalisée d'une requête SQL : littéraux remplacés par `?`, listes
+    `IN (...)` réduites à un seul paramètre, espaces compactés. Deux requêtes
+    qui ne diffèrent que par leurs valeurs ont la même empreinte.
+    """
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(?)", statement)
+    return _SPACES.sub(" ", statement).strip()
+
+
+class QueryStats:
+    """
+    Requêtes SQL exécutées pendant une requête HTTP (ou un bloc de code).
+    """
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+
+    def add(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.shapes[fingerprint(statement)] += 1
+
+    def repeated_shapes(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """
+        Formes de SELECT répétées au moins `threshold` fois : le signe typique
+        d'un N+1 (chargement paresseux d'une relation dans une boucle).
+        """
+        threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        return {
+            shape: count for shape, count in self.shapes.items()
+            if count >= threshold and shape.upper().startswith("SELECT")
+        }
+
+
+# Statistiques de la requête HTTP en cours (positionné par QueryProfilingMiddleware)
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def record_query(statement: str, duration_ms: float) -> None:
+    """
+    Attribue une requête SQL à la requête HTTP en cours (s'il y en a une).
+    """
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.add(statement, duration_ms)
+
+
+class RouteQueryMetrics:
+    """
+    Agrégats par route : nombre de requêtes HTTP, de requêtes SQL, temps SQL
+    et nombre de requêtes HTTP suspectées de N+1.
+    """
+    def __init__(self):
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, stats: QueryStats, n_plus_one: Dict[str, int]) -> None:
+        with self._lock:
+            entry = self._routes.setdefault(route, {
+                "requests": 0,
+                "queries": 0,
+                "max_queries": 0,
+                "sql_time_ms": 0.0,
+                "n_plus_one_requests": 0,
+                "n_plus_one_shapes": Counter(),
+            })
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+            entry["sql_time_ms"] += stats.total_ms
+            if n_plus_one:
+                entry["n_plus_one_requests"] += 1
+                entry["n_plus_one_shapes"].update(n_plus_one.keys())
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Agrégats par route, de la plus coûteuse en SQL à la moins coûteuse.
+        """
+        with self._lock:
+            result = [
+                {
+                    "route": route,
+                    "requests": entry["requests"],
+                    "queries": entry["queries"],
+                    "avg_queries": round(entry["queries"] / entry["requests"], 2),
+                    "max_queries": entry["max_queries"],
+                    "sql_time_ms": round(entry["sql_time_ms"], 3),
+                    "n_plus_one_requests": entry["n_plus_one_requests"],
+                    "n_plus_one_shapes": [shape for shape, _ in entry["n_plus_one_shapes"].most_common(5)],
+                }
+                for route, entry in self._routes.items()
+            ]
+        result.sort(key=lambda row: row["sql_time_ms"], reverse=True)
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+route_query_metrics = RouteQueryMetrics()
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[QueryStats]:
+    """
+    Compte les requêtes exécutées par `engine` pendant le bloc, quel que soit
+    le thread qui les exécute (utile avec TestClient).
+    """
+    stats = QueryStats()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats.add(statement, 0.0)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield stats
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
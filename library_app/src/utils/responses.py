@@ -0,0 +1,28 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # Dépendance optionnelle : sérialiseur de pydantic-core sinon
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Sérialise `content` en JSON compact (UTF-8) : orjson s'il est installé,
+    sinon le sérialiseur natif de pydantic-core. Les dates sont écrites au
+    format ISO 8601, comme avec l'encodeur par défaut.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse sérialisée par `dumps` plutôt que par le module json.
+    """
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
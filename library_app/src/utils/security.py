@@ -1,16 +1,115 @@
+import hashlib
+import multiprocessing
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Callable, Dict, Tuple, Union, Optional
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from ..config import settings
+from .cache import TTLCache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = "HS256"
 
 
+@dataclass(frozen=True)
+class Principal:
+    """
+    Instantané immuable de l'utilisateur authentifié, mis en cache entre les requêtes.
+    """
+    id: int
+    is_active: bool
+    is_admin: bool
+
+
+# Cache des utilisateurs authentifiés, indexé par (ID utilisateur, token)
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    name="principal",
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """
+    Retire du cache toutes les entrées d'un utilisateur (modifié ou supprimé).
+    """
+    principal_cache.invalidate(lambda key, principal: principal.id == user_id)
+
+
+class PasswordHashingBusy(Exception):
+    """
+    Levée quand trop d'opérations bcrypt sont déjà en cours ou en attente.
+    """
+
+
+class PasswordHasher:
+    """
+    Exécute bcrypt dans un pool de processus borné.
+
+    bcrypt est volontairement coûteux en CPU : exécuté dans le threadpool
+    des routes, un afflux de connexions bloquerait les autres requêtes.
+    Au plus `workers` opérations s'exécutent en parallèle et `queue_size`
+    attendent ; au-delà, PasswordHashingBusy est levée immédiatement. Elle
+    l'est aussi quand une opération dépasse `timeout` (file trop lente).
+    Avec workers=0, les opérations sont exécutées directement (sans pool).
+    """
+    def __init__(self, workers: int, queue_size: int, timeout: float):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_size) if workers > 0 else None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def run(self, func: Callable, *args) -> Any:
+        if self._slots is None:
+            return func(*args)
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusy()
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # La place est rendue quand la tâche quitte le pool, pas quand l'appelant
+        # abandonne : une tâche expirée mais en cours reste comptée
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordHashingBusy() from None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # "spawn" : pas de fork d'un processus serveur multi-thread
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS,
+)
+
+
 def create_access_token(
     subject: Union[str, Any], expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -29,15 +128,81 @@ def create_access_token(
     return encoded_jwt
 
 
+def create_refresh_token() -> str:
+    """
+    Génère un jeton de rafraîchissement aléatoire (opaque, 256 bits).
+    """
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Empreinte SHA-256 d'un jeton de rafraîchissement. Le jeton étant aléatoire
+    et de forte entropie, un hachage rapide suffit (pas besoin de bcrypt).
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class RevocationList:
+    """
+    Ensemble en mémoire des jetons de rafraîchissement révoqués et non expirés.
+
+    Seuls les 16 premiers octets de l'empreinte sont conservés ; les entrées
+    expirées sont purgées au fil des ajouts. La base reste la référence
+    (colonne revoked_at) : cet ensemble évite une requête pour les jetons
+    déjà connus comme révoqués dans ce processus.
+    """
+    def __init__(self):
+        self._entries: Dict[bytes, Tuple[datetime, int]] = {}
+        self._lock = threading.Lock()
+        self._prune_at = 1024
+
+    @staticmethod
+    def _key(token_hash: str) -> bytes:
+        return bytes.fromhex(token_hash)[:16]
+
+    def add(self, token_hash: str, user_id: int, expires_at: datetime) -> None:
+        with self._lock:
+            self._entries[self._key(token_hash)] = (expires_at, user_id)
+            if len(self._entries) >= self._prune_at:
+                now = datetime.utcnow()
+                self._entries = {
+                    key: entry for key, entry in self._entries.items() if entry[0] > now
+                }
+                self._prune_at = max(1024, 2 * len(self._entries))
+
+    def get_user_id(self, token_hash: str) -> Optional[int]:
+        """
+        ID de l'utilisateur du jeton s'il est révoqué, None sinon.
+        """
+        entry = self._entries.get(self._key(token_hash))
+        return entry[1] if entry else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+revoked_refresh_tokens = RevocationList()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Vérifie si un mot de passe en clair correspond à un hash.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.run(_verify, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """
     Génère un hash à partir d'un mot de passe en clair.
     """
+    return password_hasher.run(_hash, password)
+
+
+# Fonctions de module (sérialisables) exécutées dans les processus du pool
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
\ No newline at end of file
@@ -0,0 +1,177 @@
+import queue
+import threading
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+
+from ..config import settings
+from .profiling import fingerprint
+
+# Préfixe d'explication du plan selon le dialecte (EXPLAIN n'exécute pas la requête)
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+    "mysql": "EXPLAIN ",
+    "mariadb": "EXPLAIN ",
+}
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+# Option d'exécution posée sur la connexion d'explication (ignorée par les hooks)
+EXPLAIN_OPTION = "slow_query_explain"
+
+
+def redact_parameter(value: Any) -> Any:
+    """
+    Version journalisable d'un paramètre : nombres, booléens et dates sont
+    conservés, les chaînes et données binaires sont masquées.
+    """
+    if value is None or isinstance(value, (bool, int, float, date, datetime)):
+        return value
+    if isinstance(value, str):
+        return "<str:%d>" % len(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "<bytes:%d>" % len(value)
+    return "<%s>" % type(value).__name__
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """
+    Masque les paramètres d'une requête (tuple, dict ou liste pour executemany).
+    """
+    if isinstance(parameters, dict):
+        return {key: redact_parameter(value) for key, value in parameters.items()}
+    if isinstance(parameters, list):
+        # executemany : seule la première ligne est conservée
+        return {"rows": len(parameters), "first": redact_parameters(parameters[0]) if parameters else None}
+    if isinstance(parameters, tuple):
+        return [redact_parameter(value) for value in parameters]
+    return redact_parameter(parameters)
+
+
+class SlowQueryLog:
+    """
+    Table bornée des requêtes lentes, regroupées par empreinte.
+
+    Pour chaque empreinte : nombre d'occurrences, durées maximale et cumulée,
+    l'exécution la plus lente (requête, paramètres masqués) et son plan.
+    Le plan est obtenu à chaque nouveau maximum, avec les paramètres de cette
+    exécution, par un thread dédié et sur une autre connexion : la requête
+    lente elle-même n'est pas ralentie. Au-delà de `capacity` empreintes, la
+    moins lente est évincée.
+    """
+    def __init__(self, capacity: int, explain: bool = True):
+        self.capacity = capacity
+        self.explain = explain
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._jobs: "queue.Queue" = queue.Queue(maxsize=100)
+        self._worker: Optional[threading.Thread] = None
+
+    def record(self, engine: Engine, statement: str, parameters: Any, duration_ms: float) -> Dict[str, Any]:
+        """
+        Enregistre une exécution lente et retourne l'entrée de son empreinte.
+        """
+        shape = fingerprint(statement)
+        now = datetime.utcnow()
+        with self._lock:
+            entry = self._entries.get(shape)
+            if entry is None:
+                entry = self._entries[shape] = {
+                    "fingerprint": shape,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "first_seen": now,
+                    "plan": None,
+                    "sample": 0,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["last_seen"] = now
+            # Nouveau maximum : le plan précédent ne correspond plus aux
+            # paramètres conservés, il est recalculé avec ceux-ci
+            explain = duration_ms >= entry["max_ms"]
+            if explain:
+                entry["max_ms"] = duration_ms
+                entry["statement"] = statement
+                entry["parameters"] = redact_parameters(parameters)
+                entry["plan"] = None
+                entry["sample"] += 1
+            sample = entry["sample"]
+            if len(self._entries) > self.capacity:
+                fastest = min(self._entries.values(), key=lambda e: e["max_ms"])
+                del self._entries[fastest["fingerprint"]]
+
+        if explain and self.explain and shape in self._entries:
+            self._submit(engine, shape, sample, statement, parameters)
+        return entry
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Empreintes de la plus lente à la moins lente.
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()]
+        for entry in entries:
+            del entry["sample"]
+            entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 3)
+            entry["total_ms"] = round(entry["total_ms"], 3)
+            entry["max_ms"] = round(entry["max_ms"], 3)
+        entries.sort(key=lambda e: e["max_ms"], reverse=True)
+        return entries
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def wait(self) -> None:
+        """
+        Attend la fin des explications en cours (tests, arrêt).
+        """
+        self._jobs.join()
+
+    def _submit(self, engine: Engine, shape: str, sample: int, statement: str, parameters: Any) -> None:
+        prefix = EXPLAIN_PREFIXES.get(engine.dialect.name)
+        # Un moteur asynchrone ne peut pas être utilisé depuis le thread d'explication
+        if prefix is None or engine.dialect.is_async or not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return
+        if isinstance(parameters, list):
+            parameters = parameters[0] if parameters else ()
+        try:
+            self._jobs.put_nowait((engine, shape, sample, prefix + statement, parameters))
+        except queue.Full:
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="slow-query-explain", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            engine, shape, sample, explain_statement, parameters = self._jobs.get()
+            try:
+                plan = self._explain(engine, explain_statement, parameters)
+                with self._lock:
+                    entry = self._entries.get(shape)
+                    # Un maximum plus récent attend déjà son propre plan
+                    if entry is not None and entry["sample"] == sample:
+                        entry["plan"] = plan
+            finally:
+                self._jobs.task_done()
+
+    @staticmethod
+    def _explain(engine: Engine, explain_statement: str, parameters: Any) -> List[str]:
+        try:
+            with engine.connect() as conn:
+                conn = conn.execution_options(**{EXPLAIN_OPTION: True})
+                rows = conn.exec_driver_sql(explain_statement, parameters).all()
+        except Exception as e:
+            return ["EXPLAIN impossible : %s" % e]
+        if engine.dialect.name == "sqlite":
+            # (id, parent, notused, detail) : seul le détail est lisible
+            return [str(row[-1]) for row in rows]
+        return [" | ".join(str(value) for value in row) for row in rows]
+
+
+slow_query_log = SlowQueryLog(capacity=settings.SLOW_QUERY_LOG_SIZE, explain=settings.SLOW_QUERY_EXPLAIN)
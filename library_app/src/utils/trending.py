@@ -0,0 +1,56 @@
+import math
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import case, literal
+from sqlalchemy.sql import ColumnElement
+
+from ..config import settings
+from ..db.functions import log_add_exp
+
+# Date de référence des scores de tendance stockés
+TRENDING_EPOCH = datetime(2025, 1, 1)
+
+
+def _decay_exponent(now: datetime) -> float:
+    """
+    Exposant de décroissance accumulé entre TRENDING_EPOCH et `now`.
+    """
+    half_life_seconds = settings.TRENDING_HALF_LIFE_DAYS * 24 * 3600
+    return math.log(2) * (now - TRENDING_EPOCH).total_seconds() / half_life_seconds
+
+
+def bump_trending_score(score: Optional[float], now: Optional[datetime] = None) -> float:
+    """
+    Ajoute un emprunt à un score de tendance stocké, en O(1).
+
+    Le score est stocké sous forme logarithmique et rapporté à TRENDING_EPOCH :
+    la décroissance n'a donc jamais besoin d'être appliquée en base, et l'ordre
+    des scores stockés est celui des popularités actuelles (tri indexable).
+    La valeur 0 signifie « jamais emprunté ».
+    """
+    x = _decay_exponent(now or datetime.utcnow())
+    if not score:
+        return x
+    # log(exp(score) + exp(x)) sans débordement
+    return max(score, x) + math.log1p(math.exp(-abs(score - x)))
+
+
+def bumped_trending_score(score: ColumnElement, now: Optional[datetime] = None) -> ColumnElement:
+    """
+    Équivalent SQL de bump_trending_score, pour incrémenter le score dans
+    l'UPDATE lui-même : deux emprunts simultanés du même livre comptent
+    chacun, sans relire le score.
+    """
+    x = literal(_decay_exponent(now or datetime.utcnow()))
+    return case((score == 0, x), else_=log_add_exp(score, x))
+
+
+def current_popularity(score: Optional[float], now: Optional[datetime] = None) -> float:
+    """
+    Popularité actuelle d'un livre : nombre d'emprunts pondérés par
+    exp(-λ·âge), la décroissance étant appliquée paresseusement à la lecture.
+    """
+    if not score:
+        return 0.0
+    return math.exp(score - _decay_exponent(now or datetime.utcnow()))
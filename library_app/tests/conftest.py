@@ -1,11 +1,17 @@
+from contextlib import contextmanager
+
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from src.models.base import Base
-from src.db.session import get_db
+from src.db.session import get_db, get_read_db
 from src.main import app
+from src.models.users import User
+from src.utils.logging import instrument_engine
+from src.utils.profiling import count_queries
+from src.utils.security import create_access_token, invalidate_principal
 
 
 @pytest.fixture(scope="session")
@@ -19,6 +25,7 @@ def engine():
         poolclass=StaticPool,
     )
     Base.metadata.create_all(engine)
+    instrument_engine(engine)
     return engine
 
 
@@ -49,10 +56,53 @@ def client(db_session):
         finally:
             pass
 
+    # Lectures et écritures partagent la session (et la transaction) du test
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     from fastapi.testclient import TestClient
     with TestClient(app) as client:
         yield client
 
-    app.dependency_overrides = {}
\ No newline at end of file
+    app.dependency_overrides = {}
+
+
+@pytest.fixture
+def auth_headers(db_session):
+    """
+    Crée un utilisateur et renvoie les en-têtes d'authentification des routes :
+
+        headers = auth_headers("reader@example.com", is_admin=True)
+    """
+    def create(email: str, is_admin: bool = False) -> dict:
+        user = User(email=email, hashed_password="x", full_name="Test User", is_admin=is_admin)
+        db_session.add(user)
+        db_session.commit()
+        # Les ids sont réutilisés d'un test à l'autre (transaction annulée) :
+        # le cache des utilisateurs authentifiés ne doit pas servir un ancien utilisateur
+        invalidate_principal(user.id)
+        return {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+    return create
+
+
+@pytest.fixture
+def query_budget(engine):
+    """
+    Vérifie qu'un bloc n'exécute pas plus de `max_queries` requêtes SQL :
+
+        with query_budget(3):
+            client.get("/api/v1/books/")
+    """
+    @contextmanager
+    def check(max_queries: int):
+        with count_queries(engine) as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            "%d requêtes SQL exécutées (budget : %d) :\n%s" % (
+                stats.count, max_queries,
+                "\n".join("%dx %s" % (n, shape) for shape, n in stats.shapes.most_common()),
+            )
+        )
+
+    return check
@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+
+from src.models.books import Book
+from src.models.categories import Category
+from src.models.loans import Loan
+from src.models.users import User
+from src.services.analytics import AnalyticsService, LoanSnapshot, MISSING_DATE, SNAPSHOT_COLUMNS
+
+DAY = 24 * 3600
+
+
+def make_snapshot(loans, links, categories, created_at):
+    """
+    Construit un instantané en mémoire à partir de tuples
+    (book_id, loan_day, due_day, return_day).
+    """
+    columns = {
+        "loan_book_id": [book_id for book_id, _, _, _ in loans],
+        "loan_user_id": [1 for _ in loans],
+        "loan_date": [loan * DAY for _, loan, _, _ in loans],
+        "due_date": [due * DAY for _, _, due, _ in loans],
+        "return_date": [MISSING_DATE if ret is None else ret * DAY for _, _, _, ret in loans],
+        "book_id": sorted({book_id for book_id, _, _, _ in loans}),
+        "book_publication_year": [2000 for _ in {book_id for book_id, _, _, _ in loans}],
+        "bc_book_id": [book_id for book_id, _ in links],
+        "bc_category_id": [category_id for _, category_id in links],
+    }
+    arrays = {name: np.asarray(values, dtype=SNAPSHOT_COLUMNS[name]) for name, values in columns.items()}
+    meta = {
+        "created_at": created_at * DAY,
+        "loan_count": len(loans),
+        "book_count": len(columns["book_id"]),
+        "categories": {str(id): name for id, name in categories.items()},
+    }
+    return LoanSnapshot("test", arrays, meta)
+
+
+def test_return_latency_and_late_rates():
+    """
+    Teste l'histogramme des délais de retour et les taux de retard par catégorie.
+    """
+    snapshot = make_snapshot(
+        loans=[
+            (1, 0, 14, 2),      # retourné en 2 jours
+            (1, 0, 14, 10),     # retourné en 10 jours
+            (2, 0, 14, 20),     # retourné en retard
+            (2, 30, 44, None),  # non rendu, échu à la date de l'instantané
+            (3, 90, 104, None), # non rendu, pas encore échu
+        ],
+        links=[(1, 1), (2, 1), (2, 2), (3, 2)],
+        categories={1: "Roman", 2: "Policier"},
+        created_at=100,
+    )
+    service = AnalyticsService()
+
+    latency = service.get_return_latency(snapshot, bins=(0, 7, 14))
+    assert latency["returned_loans"] == 3
+    assert [row["count"] for row in latency["histogram"]] == [1, 1, 1]
+    assert latency["histogram"][-1]["max_days"] is None
+    assert latency["percentiles"]["p50"] == 10.0
+
+    rates = {row["category"]: row for row in service.get_late_returns_by_category(snapshot)}
+    assert rates["Roman"]["loan_count"] == 4
+    assert rates["Roman"]["late_count"] == 2
+    assert rates["Policier"]["loan_count"] == 3
+    assert rates["Policier"]["late_count"] == 2
+    assert rates["Policier"]["late_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+
+def test_seasonality():
+    """
+    Teste la répartition des emprunts par mois et par jour de la semaine.
+    """
+    # Jour 0 = jeudi 1er janvier 1970, jour 32 = lundi 2 février 1970
+    snapshot = make_snapshot(
+        loans=[(1, 0, 14, None), (1, 32, 46, None), (1, 33, 47, None)],
+        links=[],
+        categories={},
+        created_at=40,
+    )
+    seasonality = AnalyticsService().get_seasonality(snapshot)
+
+    by_month = {row["month"]: row["loan_count"] for row in seasonality["by_month"]}
+    assert by_month[1] == 1
+    assert by_month[2] == 2
+    by_weekday = {row["weekday"]: row["loan_count"] for row in seasonality["by_weekday"]}
+    assert by_weekday[3] == 1  # jeudi
+    assert by_weekday[0] == 1  # lundi
+    assert by_weekday[1] == 1  # mardi
+
+
+def test_snapshot_build_and_load(db_session: Session, tmp_path):
+    """
+    Teste la construction de l'instantané et sa relecture en mémoire mappée.
+    """
+    category = Category(name="Analytics Category")
+    book = Book(title="Analytics Book", author="Author", isbn="7770001112223", publication_year=2001, quantity=3)
+    book.categories.append(category)
+    user = User(email="analytics@example.com", hashed_password="x", full_name="Analytics User")
+    db_session.add_all([category, book, user])
+    db_session.flush()
+    loan_date = datetime.utcnow() - timedelta(days=30)
+    db_session.add(Loan(
+        user_id=user.id,
+        book_id=book.id,
+        loan_date=loan_date,
+        due_date=loan_date + timedelta(days=14),
+        return_date=loan_date + timedelta(days=20),
+    ))
+    db_session.commit()
+
+    service = AnalyticsService(directory=str(tmp_path))
+    assert service.get_snapshot() is None
+
+    info = service.refresh(db_session)
+    snapshot = service.get_snapshot()
+    assert snapshot.name == info["snapshot"]
+    assert isinstance(snapshot.loan_date, np.memmap)
+    assert book.id in snapshot.book_id
+
+    rates = {row["category_id"]: row for row in service.get_late_returns_by_category(snapshot)}
+    assert rates[category.id]["late_count"] == 1
+    assert rates[category.id]["late_rate"] == 1.0
+
+    # Une nouvelle publication remplace l'instantané courant
+    info = service.refresh(db_session)
+    assert service.get_snapshot().name == info["snapshot"]
@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.api.dependencies import get_current_active_user_async, get_current_admin_user_async
+from src.api.middleware import ETagMiddleware
+from src.api.routes.books_async import router as books_async_router
+from src.api.routes.stats_async import router as stats_async_router
+from src.api.schemas.books import BookSummary
+from src.db.session import async_database_url, get_async_db
+from src.models.base import Base
+from src.models.books import Book
+from src.models.categories import Category
+from src.repositories.books import AsyncBookRepository
+from src.services.books import AsyncBookService
+from src.services.stats import AsyncStatsService, StatsService
+from src.utils.pagination import PaginationParams
+from src.utils.security import Principal
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """
+    Base SQLite sur fichier (partagée entre moteurs synchrone et asynchrone)
+    avec trois livres, dont deux dans la catégorie « Roman ».
+    """
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    novel = Category(name="Roman")
+    db.add_all([
+        Book(title="Les Misérables", author="Victor Hugo", isbn="9780000000001",
+             publication_year=1862, quantity=2, categories=[novel]),
+        Book(title="Notre-Dame de Paris", author="Victor Hugo", isbn="9780000000002",
+             publication_year=1831, quantity=1, categories=[novel], loan_count=3),
+        Book(title="Du contrat social", author="Rousseau", isbn="9780000000003",
+             publication_year=1762, quantity=4),
+    ])
+    db.commit()
+    db.close()
+    engine.dispose()
+    return url
+
+
+def run_with_session(url, coroutine):
+    """
+    Exécute `coroutine(session)` sur une AsyncSession ouverte sur `url`.
+    """
+    async def main():
+        engine = create_async_engine(async_database_url(url))
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                return await coroutine(db)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./library.db") == "sqlite+aiosqlite:///./library.db"
+    assert async_database_url("postgresql://u@h/db") == "postgresql+asyncpg://u@h/db"
+
+
+def test_async_book_service_search(database_url):
+    """
+    La recherche asynchrone applique les mêmes critères que la recherche synchrone.
+    """
+    async def search(db):
+        service = AsyncBookService(AsyncBookRepository(Book, db))
+        params = PaginationParams(skip=0, limit=10, sort_by="publication_year")
+        everything = await service.search(params=params)
+        hugo = await service.search(params=params, query="hugo", category_id=1)
+        book = await service.get_by_isbn(isbn="9780000000002")
+        return everything, hugo, book
+
+    everything, hugo, book = run_with_session(database_url, search)
+
+    assert everything.total == 3
+    assert [b.publication_year for b in everything.items] == [1762, 1831, 1862]
+    assert hugo.total == 2
+    # Catégories chargées avec le livre : accessibles hors de la session
+    assert [c.name for c in book.categories] == ["Roman"]
+
+
+def test_async_stats_match_sync(database_url):
+    """
+    Les statistiques asynchrones sont identiques aux statistiques synchrones.
+    """
+    async def stats(db):
+        service = AsyncStatsService(db)
+        return await service.get_general_stats(), await service.get_most_borrowed_books()
+
+    general, most_borrowed = run_with_session(database_url, stats)
+
+    engine = create_engine(database_url)
+    db = sessionmaker(bind=engine)()
+    try:
+        assert general == StatsService(db).get_general_stats()
+        assert most_borrowed == StatsService(db).get_most_borrowed_books()
+    finally:
+        db.close()
+        engine.dispose()
+    assert general["total_books"] == 7
+    assert [row["title"] for row in most_borrowed] == ["Notre-Dame de Paris"]
+
+
+def test_async_routes(database_url):
+    """
+    Les routes asynchrones de consultation répondent comme les routes synchrones.
+    """
+    app = FastAPI()
+    app.add_middleware(ETagMiddleware)
+    app.include_router(books_async_router, prefix="/books")
+    app.include_router(stats_async_router, prefix="/stats")
+
+    engine = create_async_engine(async_database_url(database_url))
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with factory() as db:
+            yield db
+
+    admin = Principal(id=1, is_active=True, is_admin=True)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_active_user_async] = lambda: admin
+    app.dependency_overrides[get_current_admin_user_async] = lambda: admin
+
+    with TestClient(app) as client:
+        page = client.get("/books/", params={"limit": 2}).json()
+        assert page["total"] == 3 and page["pages"] == 2 and len(page["items"]) == 2
+
+        found = client.get("/books/search/", params={"author": "rousseau"}).json()
+        assert [b["isbn"] for b in found["items"]] == ["9780000000003"]
+
+        # Vue résumée : mêmes champs que la route synchrone, sans catégories
+        summary = client.get("/books/", params={"view": "summary", "sort_by": "publication_year"}).json()
+        assert summary["total"] == 3
+        assert set(summary["items"][0]) == set(BookSummary.model_fields)
+        assert [b["publication_year"] for b in summary["items"]] == [1762, 1831, 1862]
+        found = client.get("/books/search/", params={"author": "hugo", "view": "summary"}).json()
+        assert found["total"] == 2 and "categories" not in found["items"][0]
+
+        # Champs choisis : colonnes seules, puis avec relation et champ calculé
+        titles = client.get("/books/", params={"fields": "id,title", "sort_by": "id"}).json()
+        assert titles["items"][0] == {"id": 1, "title": "Les Misérables"}
+        related = client.get("/books/", params={"fields": "categories,popularity", "sort_by": "id"}).json()
+        assert set(related["items"][0]) == {"categories", "popularity"}
+        assert related["items"][0]["categories"][0]["name"] == "Roman"
+        assert client.get("/books/", params={"fields": "hashed_password"}).status_code == 400
+
+        assert client.get("/books/1").json()["categories"][0]["name"] == "Roman"
+        assert client.get("/books/999").status_code == 404
+        assert client.get("/stats/general").json()["unique_books"] == 3
+
+        # GET conditionnels, comme sur les routes synchrones
+        for path in ("/books/", "/books/1", "/books/search/?author=hugo", "/stats/general", "/stats/trending"):
+            response = client.get(path)
+            etag = response.headers["etag"]
+            assert response.headers["cache-control"] == "private, no-cache"
+            assert client.get(path, headers={"If-None-Match": etag}).status_code == 304
+
+    asyncio.run(engine.dispose())
@@ -0,0 +1,104 @@
+import numpy as np
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+
+from src.models.books import Book
+from src.models.loans import Loan
+from src.models.users import User
+from src.services.recommendations import CoBorrowingIndex, RecommendationService
+
+
+def brute_force_related(pairs, book_id, top_n):
+    """
+    Calcule les voisins d'un livre par comptage naïf des lecteurs communs.
+    """
+    readers = {user for user, book in pairs if book == book_id}
+    counts = {}
+    for user, book in set(pairs):
+        if user in readers and book != book_id:
+            counts[book] = counts.get(book, 0) + 1
+    return [book for book, _ in sorted(counts.items(), key=lambda item: (-item[1], item[0]))][:top_n]
+
+
+def test_merge_matches_brute_force():
+    """
+    Teste que l'index incrémental donne les mêmes voisins qu'un calcul naïf.
+    """
+    rng = np.random.default_rng(42)
+    pairs = [(int(u), int(b)) for u, b in zip(rng.integers(1, 40, 400), rng.integers(1, 60, 400))]
+    first, second = pairs[:250], pairs[250:]
+
+    index = CoBorrowingIndex.empty(top_n=5)
+    index.merge(np.array([u for u, _ in first]), np.array([b for _, b in first]), last_loan_id=250)
+    updated = index.merge(np.array([u for u, _ in second]), np.array([b for _, b in second]), last_loan_id=400)
+
+    assert 0 < updated < 60
+    assert index.meta["last_loan_id"] == 400
+    for book_id in range(1, 60):
+        assert index.get_related_ids(book_id) == brute_force_related(pairs, book_id, 5)
+
+    # Réintégrer des couples déjà connus ne recalcule rien
+    assert index.merge(np.array([first[0][0]]), np.array([first[0][1]]), last_loan_id=401) == 0
+    assert index.get_related_ids(10_000) == []
+
+
+def test_merge_chunks_match_single_pass():
+    """
+    Teste que le calcul par lots donne les mêmes voisins et scores qu'un seul lot.
+    """
+    rng = np.random.default_rng(7)
+    users, books = rng.integers(1, 30, 300), rng.integers(1, 50, 300)
+
+    single = CoBorrowingIndex.empty(top_n=4)
+    single.merge(users, books, last_loan_id=300)
+    chunked = CoBorrowingIndex.empty(top_n=4)
+    chunked.merge(users, books, last_loan_id=300, chunk_size=16)
+
+    np.testing.assert_array_equal(chunked.related, single.related)
+    np.testing.assert_array_equal(chunked.related_scores, single.related_scores)
+    pairs = list(zip(users.tolist(), books.tolist()))
+    for book_id in range(1, 50):
+        assert chunked.get_related_ids(book_id) == brute_force_related(pairs, book_id, 4)
+
+
+def test_related_books_refresh(db_session: Session, tmp_path):
+    """
+    Teste la construction de l'index depuis la base puis sa mise à jour incrémentale.
+    """
+    books = [
+        Book(title=f"Related {i}", author="Author", isbn=f"88800011122{i:02d}", publication_year=2000, quantity=5)
+        for i in range(4)
+    ]
+    users = [User(email=f"reader{i}@example.com", hashed_password="x", full_name="Reader") for i in range(3)]
+    db_session.add_all(books + users)
+    db_session.flush()
+
+    def borrow(user, book):
+        loan_date = datetime.utcnow() - timedelta(days=3)
+        db_session.add(Loan(user_id=user.id, book_id=book.id, loan_date=loan_date, due_date=loan_date + timedelta(days=14)))
+
+    borrow(users[0], books[0])
+    borrow(users[0], books[1])
+    borrow(users[1], books[0])
+    borrow(users[1], books[1])
+    borrow(users[1], books[2])
+    db_session.commit()
+
+    service = RecommendationService(directory=str(tmp_path))
+    assert service.get_related_books(db_session, book_id=books[0].id) == []
+
+    service.refresh(db_session)
+    related = service.get_related_books(db_session, book_id=books[0].id)
+    assert [book.id for book in related][:2] == [books[1].id, books[2].id]
+
+    # Nouvel emprunt : seul le delta est relu
+    borrow(users[2], books[0])
+    borrow(users[2], books[3])
+    borrow(users[0], books[3])
+    db_session.commit()
+    info = service.refresh(db_session)
+    assert info["new_loans"] == 3
+
+    related = service.get_related_books(db_session, book_id=books[0].id)
+    assert [book.id for book in related][:3] == [books[1].id, books[3].id, books[2].id]
+    assert [book.id for book in service.get_related_books(db_session, book_id=books[3].id)][:1] == [books[0].id]
@@ -0,0 +1,209 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+
+from src.config import settings
+from src.db.functions import month_bucket, day_bucket
+from src.models.books import Book
+from src.models.loans import Loan
+from src.models.users import User
+from src.repositories.loans import LoanRepository
+from src.services.stats import StatsService
+from src.utils.pagination import PaginationParams, paginate
+from src.utils.trending import bump_trending_score, current_popularity
+
+
+def add_stats_data(db_session: Session, isbn: str, email: str):
+    """
+    Crée un livre, un utilisateur et des emprunts répartis sur deux mois.
+    """
+    book = Book(title="Stats Book", author="Author", isbn=isbn, publication_year=2020, quantity=5)
+    user = User(email=email, hashed_password="x", full_name="Stats User")
+    db_session.add_all([book, user])
+    db_session.flush()
+
+    now = datetime.utcnow().replace(day=15, hour=12)
+    last_month = (now.replace(day=1) - timedelta(days=1)).replace(day=15)
+    for loan_date in (now, now - timedelta(days=1), last_month):
+        db_session.add(Loan(
+            user_id=user.id,
+            book_id=book.id,
+            loan_date=loan_date,
+            due_date=loan_date + timedelta(days=14),
+        ))
+    db_session.commit()
+    return now, last_month
+
+
+def test_get_monthly_loans(db_session: Session):
+    """
+    Teste le regroupement des emprunts par mois sur SQLite.
+    """
+    service = StatsService(db_session)
+    before = {row["month"]: row["loan_count"] for row in service.get_monthly_loans(months=3)}
+
+    now, last_month = add_stats_data(db_session, "5550001112223", "stats@example.com")
+    monthly = service.get_monthly_loans(months=3)
+
+    months = [row["month"] for row in monthly]
+    assert months == sorted(months)
+    counts = {row["month"]: row["loan_count"] for row in monthly}
+    assert counts[last_month.strftime("%Y-%m")] - before.get(last_month.strftime("%Y-%m"), 0) == 1
+    assert counts[now.strftime("%Y-%m")] - before.get(now.strftime("%Y-%m"), 0) == 2
+
+
+def test_day_bucket_sqlite(db_session: Session):
+    """
+    Teste la troncature au jour sur SQLite.
+    """
+    now, _ = add_stats_data(db_session, "5550001112224", "stats-day@example.com")
+    day = db_session.execute(
+        select(day_bucket(Loan.loan_date)).where(Loan.loan_date == now)
+    ).scalar()
+
+    assert day == now.strftime("%Y-%m-%d")
+
+
+def test_month_bucket_compiles_per_dialect():
+    """
+    Teste la compilation de month_bucket pour SQLite et PostgreSQL.
+    """
+    month = month_bucket(Loan.loan_date)
+    stmt = select(month.label("month"), func.count(Loan.id)).group_by(month)
+
+    sqlite_sql = str(stmt.compile(dialect=sqlite.dialect()))
+    assert "strftime('%Y-%m', loan.loan_date)" in sqlite_sql
+
+    postgresql_sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "to_char(loan.loan_date, 'YYYY-MM')" in postgresql_sql
+    assert "strftime" not in postgresql_sql
+    # Le GROUP BY doit reprendre exactement l'expression du SELECT
+    assert "GROUP BY to_char(loan.loan_date, 'YYYY-MM')" in postgresql_sql
+
+
+def test_most_borrowed_books_from_counters(db_session: Session):
+    """
+    Teste le classement des livres et utilisateurs à partir des compteurs
+    maintenus par LoanRepository.record_checkout.
+    """
+    repository = LoanRepository(Loan, db_session)
+    popular = Book(title="Popular", author="Author", isbn="5550001112225", publication_year=2020, quantity=5)
+    quiet = Book(title="Quiet", author="Author", isbn="5550001112226", publication_year=2020, quantity=5)
+    user = User(email="topk@example.com", hashed_password="x", full_name="Top User")
+    db_session.add_all([popular, quiet, user])
+    db_session.flush()
+
+    now = datetime.utcnow()
+    checkouts = [(popular, now), (popular, now - timedelta(days=60)), (quiet, now)]
+    for book, loan_date in checkouts:
+        loan = Loan(user_id=user.id, book_id=book.id, loan_date=loan_date, due_date=loan_date + timedelta(days=14))
+        db_session.add(loan)
+        db_session.flush()
+        repository.record_checkout(loan=loan)
+    db_session.commit()
+
+    assert popular.loan_count == 2
+    assert quiet.loan_count == 1
+    assert user.loan_count == 3
+    # Score de tendance incrémenté en SQL, comme bump_trending_score
+    assert popular.trending_score == pytest.approx(
+        bump_trending_score(bump_trending_score(0.0, now), now - timedelta(days=60))
+    )
+    assert quiet.trending_score == pytest.approx(bump_trending_score(0.0, now))
+
+    service = StatsService(db_session)
+    all_time = {row["id"]: row["loan_count"] for row in service.get_most_borrowed_books(limit=100)}
+    assert all_time[popular.id] == 2
+    assert all_time[quiet.id] == 1
+
+    # Sur 30 jours, l'emprunt vieux de 60 jours n'est plus compté
+    last_30_days = {row["id"]: row["loan_count"] for row in service.get_most_borrowed_books(limit=100, days=30)}
+    assert last_30_days[popular.id] == 1
+    assert last_30_days[quiet.id] == 1
+
+    users = {row["id"]: row["loan_count"] for row in service.get_most_active_users(limit=100)}
+    assert users[user.id] == 3
+    users_30_days = {row["id"]: row["loan_count"] for row in service.get_most_active_users(limit=100, days=30)}
+    assert users_30_days[user.id] == 2
+
+
+def test_daily_loans_upserted(db_session: Session, engine):
+    """
+    Teste que les agrégats quotidiens sont mis à jour par un INSERT ... ON
+    CONFLICT : une ligne par jour, incrémentée à chaque emprunt.
+    """
+    from src.models.stats import BookDailyLoans, UserDailyLoans
+    from src.utils.profiling import count_queries
+
+    repository = LoanRepository(Loan, db_session)
+    book = Book(title="Daily", author="Author", isbn="5550001112227", publication_year=2020, quantity=5)
+    user = User(email="daily@example.com", hashed_password="x", full_name="Daily User")
+    db_session.add_all([book, user])
+    db_session.flush()
+
+    now = datetime.utcnow()
+    with count_queries(engine) as stats:
+        for _ in range(3):
+            loan = Loan(user_id=user.id, book_id=book.id, loan_date=now, due_date=now + timedelta(days=14))
+            db_session.add(loan)
+            db_session.flush()
+            repository.record_checkout(loan=loan)
+    db_session.commit()
+
+    assert sum("ON CONFLICT" in shape for shape in stats.shapes) == 2
+    book_rows = db_session.execute(
+        select(BookDailyLoans.day, BookDailyLoans.loan_count).where(BookDailyLoans.book_id == book.id)
+    ).all()
+    user_rows = db_session.execute(
+        select(UserDailyLoans.day, UserDailyLoans.loan_count).where(UserDailyLoans.user_id == user.id)
+    ).all()
+    assert book_rows == [(now.date(), 3)]
+    assert user_rows == [(now.date(), 3)]
+
+
+def test_trending_score_decay():
+    """
+    Teste la mise à jour O(1) du score de tendance et sa décroissance à la lecture.
+    """
+    now = datetime(2026, 3, 1)
+    half_life = timedelta(days=settings.TRENDING_HALF_LIFE_DAYS)
+
+    score = bump_trending_score(0.0, now)
+    assert current_popularity(score, now) == pytest.approx(1.0)
+    assert current_popularity(score, now + half_life) == pytest.approx(0.5)
+
+    score = bump_trending_score(score, now + half_life)
+    assert current_popularity(score, now + half_life) == pytest.approx(1.5)
+
+    # Un emprunt récent pèse plus que deux emprunts anciens
+    recent = bump_trending_score(0.0, now + 2 * half_life)
+    assert recent > score
+    assert current_popularity(0.0, now) == 0.0
+
+
+def test_get_trending_books(db_session: Session):
+    """
+    Teste le classement des livres tendance et le tri par popularité.
+    """
+    now = datetime.utcnow()
+    old_hit = Book(title="Old Hit", author="Author", isbn="5550001112227", publication_year=2020, quantity=5)
+    new_hit = Book(title="New Hit", author="Author", isbn="5550001112228", publication_year=2020, quantity=5)
+    old_score = 0.0
+    for days_ago in (60, 61, 62):
+        old_score = bump_trending_score(old_score, now - timedelta(days=days_ago))
+    old_hit.trending_score = old_score
+    new_hit.trending_score = bump_trending_score(0.0, now - timedelta(days=1))
+    db_session.add_all([old_hit, new_hit])
+    db_session.commit()
+
+    trending = StatsService(db_session).get_trending_books(limit=100)
+    ids = [row["id"] for row in trending]
+    assert ids.index(new_hit.id) < ids.index(old_hit.id)
+    assert new_hit.popularity > old_hit.popularity > 0
+
+    # La popularité est triable en SQL (paramètre sort_by de /books/)
+    page = paginate(db_session.query(Book), PaginationParams(sort_by="popularity", sort_desc=True), Book)
+    sorted_ids = [book.id for book in page.items]
+    assert sorted_ids.index(new_hit.id) < sorted_ids.index(old_hit.id)
@@ -0,0 +1,95 @@
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models.tokens import RefreshToken
+from src.models.users import User
+from src.repositories.tokens import RefreshTokenRepository
+from src.services.tokens import RefreshTokenService
+from src.utils import security
+from src.utils.security import hash_refresh_token
+
+
+def create_user(db_session: Session, email: str) -> User:
+    user = User(
+        email=email,
+        hashed_password=security.pwd_context.hash("password123"),
+        full_name="Refresh User"
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def test_refresh_token_rotation(db_session: Session):
+    """
+    Teste l'émission et la rotation d'un jeton de rafraîchissement.
+    """
+    user = create_user(db_session, "rotation@example.com")
+    service = RefreshTokenService(RefreshTokenRepository(RefreshToken, db_session))
+
+    token = service.issue(user_id=user.id)
+    stored = service.repository.get_by_hash(token_hash=hash_refresh_token(token))
+    assert stored.user_id == user.id
+    assert stored.token_hash != token
+
+    user_id, new_token = service.rotate(token=token)
+    assert user_id == user.id
+    assert new_token != token
+    assert service.repository.get_by_hash(token_hash=hash_refresh_token(token)).revoked_at is not None
+
+    # Un jeton inconnu est refusé
+    with pytest.raises(ValueError):
+        service.rotate(token="inconnu")
+
+
+def test_refresh_token_reuse_revokes_all(db_session: Session):
+    """
+    Teste que la réutilisation d'un jeton déjà échangé révoque tous les jetons de l'utilisateur.
+    """
+    user = create_user(db_session, "reuse@example.com")
+    service = RefreshTokenService(RefreshTokenRepository(RefreshToken, db_session))
+
+    token = service.issue(user_id=user.id)
+    other_device = service.issue(user_id=user.id)
+    _, new_token = service.rotate(token=token)
+
+    with pytest.raises(ValueError):
+        service.rotate(token=token)
+    with pytest.raises(ValueError):
+        service.rotate(token=new_token)
+    with pytest.raises(ValueError):
+        service.rotate(token=other_device)
+
+
+def test_refresh_endpoint_skips_bcrypt(client, db_session: Session, monkeypatch):
+    """
+    Teste /auth/login, /auth/refresh et /auth/logout : le rafraîchissement n'appelle pas bcrypt.
+    """
+    create_user(db_session, "kiosk@example.com")
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "kiosk@example.com", "password": "password123"}
+    )
+    assert response.status_code == 200
+    tokens = response.json()
+    assert tokens["refresh_token"]
+    assert tokens["expires_in"] > 0
+
+    def no_bcrypt(func, *args):
+        raise AssertionError("bcrypt ne doit pas être appelé")
+
+    monkeypatch.setattr(security.password_hasher, "run", no_bcrypt)
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    refreshed = response.json()
+    assert refreshed["refresh_token"] != tokens["refresh_token"]
+
+    response = client.get(
+        "/api/v1/books/", headers={"Authorization": f"Bearer {refreshed['access_token']}"}
+    )
+    assert response.status_code == 200
+
+    response = client.post("/api/v1/auth/logout", json={"refresh_token": refreshed["refresh_token"]})
+    assert response.status_code == 204
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": refreshed["refresh_token"]})
+    assert response.status_code == 401
@@ -140,4 +140,25 @@ def test_create_user_email_already_used(db_session: Session):
 
     # Tentative de création avec le même email
     with pytest.raises(ValueError):
-        service.create(obj_in=user_in)
\ No newline at end of file
+        service.create(obj_in=user_in)
+
+def test_upsert_many_users(db_session: Session):
+    """
+    Teste l'upsert d'utilisateurs par email, mots de passe hashés.
+    """
+    repository = UserRepository(User, db_session)
+    service = UserService(repository)
+
+    existing = service.create(obj_in=UserCreate(
+        email="bulk1@example.com", password="password123", full_name="Bulk One"
+    ))
+    ids = service.upsert_many([
+        UserCreate(email="bulk1@example.com", password="newpassword123", full_name="Bulk Renamed"),
+        UserCreate(email="bulk2@example.com", password="password456", full_name="Bulk Two"),
+    ])
+
+    assert ids[0] == existing.id
+    db_session.expire_all()
+    assert service.get(id=ids[0]).full_name == "Bulk Renamed"
+    assert service.authenticate(email="bulk1@example.com", password="newpassword123") is not None
+    assert service.authenticate(email="bulk2@example.com", password="password456").id == ids[1]
@@ -145,3 +145,108 @@ def test_book_categories(db_session: Session):
     book_with_categories = book_repository.get_with_categories(id=book.id)
     assert len(book_with_categories.categories) == 1
     assert book_with_categories.categories[0].name == "Python"
+
+
+def test_update_sends_only_changed_columns(db_session: Session, engine):
+    """
+    Teste que la mise à jour n'envoie que les colonnes modifiées, ignore les
+    champs sans colonne et n'émet aucun UPDATE si rien ne change.
+    """
+    from src.api.schemas.books import BookUpdate
+    from src.utils.profiling import count_queries
+
+    repository = BookRepository(Book, db_session)
+    book = repository.create(obj_in={
+        "title": "Update Test Book",
+        "author": "Update Author",
+        "isbn": "5556667778889",
+        "publication_year": 2019,
+        "quantity": 2
+    })
+
+    with count_queries(engine) as stats:
+        repository.update(db_obj=book, obj_in=BookUpdate(quantity=4, category_ids=[1]))
+    updates = [shape for shape in stats.shapes if shape.startswith("UPDATE")]
+    assert updates == ["UPDATE book SET quantity=?, updated_at=? WHERE book.id = ?"]
+    assert book.quantity == 4
+
+    with count_queries(engine) as stats:
+        repository.update(db_obj=book, obj_in={"quantity": 4, "title": "Update Test Book"})
+    assert not [shape for shape in stats.shapes if shape.startswith("UPDATE")]
+
+
+def test_update_columns_without_loading(db_session: Session):
+    """
+    Teste l'UPDATE ciblé, avec une expression SQL comme valeur.
+    """
+    repository = BookRepository(Book, db_session)
+    book = repository.create(obj_in={
+        "title": "Increment Book",
+        "author": "Increment Author",
+        "isbn": "5556667778890",
+        "publication_year": 2018,
+        "quantity": 1
+    })
+
+    assert repository.update_columns(id=book.id, values={"quantity": Book.quantity + 2}) == 1
+    assert repository.get(id=book.id).quantity == 3
+    assert repository.update_columns(id=-1, values={"quantity": 0}) == 0
+
+
+def bulk_book(n: int, **values) -> dict:
+    return {
+        "title": f"Bulk Book {n}",
+        "author": "Bulk Author",
+        "isbn": f"{7770000000000 + n}",
+        "publication_year": 2000,
+        "quantity": 1,
+        **values
+    }
+
+
+def test_bulk_create_update_delete(db_session: Session):
+    """
+    Teste la création, la mise à jour et la suppression en masse, par
+    tranches, et l'invalidation du cache des statistiques.
+    """
+    from src.utils import cache as cache_module
+
+    repository = BookRepository(Book, db_session)
+    cache_module.cache_store["src.repositories.books.get_stats:bulk"] = (float("inf"), {})
+
+    ids = repository.create_many([bulk_book(n) for n in range(5)], chunk_size=2)
+    assert len(ids) == 5
+    assert [repository.get(id=id).isbn for id in ids] == [bulk_book(n)["isbn"] for n in range(5)]
+    assert "src.repositories.books.get_stats:bulk" not in cache_module.cache_store
+
+    updated = repository.update_many({ids[0]: {"quantity": 4}, ids[1]: {"title": "Renamed"}, -1: {"quantity": 9}})
+    assert updated == [ids[0], ids[1]]
+    db_session.expire_all()
+    assert repository.get(id=ids[0]).quantity == 4
+    assert repository.get(id=ids[1]).title == "Renamed"
+
+    deleted = repository.delete_where(Book.author == "Bulk Author", Book.quantity == 1)
+    assert sorted(deleted) == sorted(ids[1:])
+    assert repository.get(id=ids[0]) is not None
+    with pytest.raises(ValueError):
+        repository.delete_where()
+
+
+def test_upsert_many_by_isbn(db_session: Session):
+    """
+    Teste l'upsert par ISBN : mise à jour des livres existants, création des
+    autres, la dernière occurrence d'un ISBN l'emportant.
+    """
+    repository = BookRepository(Book, db_session)
+    existing = repository.create(obj_in=bulk_book(10))
+
+    ids = repository.upsert_many([
+        bulk_book(10, quantity=3),
+        bulk_book(11),
+        bulk_book(10, quantity=6, title="Upserted"),
+    ])
+    assert ids[0] == existing.id and len(ids) == 2
+    db_session.expire_all()
+    book = repository.get(id=ids[0])
+    assert (book.quantity, book.title) == (6, "Upserted")
+    assert repository.get(id=ids[1]).isbn == bulk_book(11)["isbn"]
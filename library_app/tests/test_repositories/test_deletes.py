@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.models.books import Book
+from src.models.categories import Category, book_category
+from src.models.loans import Loan, LoanArchive
+from src.models.users import User
+from src.repositories.books import BookRepository
+from src.repositories.loans import LoanRepository
+from src.repositories.users import UserRepository
+from src.utils.profiling import count_queries
+
+HISTORY_SIZE = 20000
+
+
+@pytest.fixture
+def history(db_session: Session):
+    """
+    Un livre et un utilisateur avec HISTORY_SIZE emprunts en commun, plus un
+    second livre emprunté une fois par le même utilisateur.
+    """
+    books = BookRepository(Book, db_session)
+    users = UserRepository(User, db_session)
+    book = books.create(obj_in={
+        "title": "Long History", "author": "Author", "isbn": "4440000000001",
+        "publication_year": 2000, "quantity": 1
+    })
+    other_book = books.create(obj_in={
+        "title": "Other Book", "author": "Author", "isbn": "4440000000002",
+        "publication_year": 2000, "quantity": 1
+    })
+    user = users.create(obj_in={
+        "email": "history@example.com", "hashed_password": "x", "full_name": "History User"
+    })
+    category = Category(name="History Category")
+    book.categories.append(category)
+    db_session.commit()
+
+    start = datetime(2020, 1, 1)
+    loans = [
+        {
+            "user_id": user.id,
+            "book_id": book.id,
+            "loan_date": start + timedelta(hours=n),
+            "due_date": start + timedelta(hours=n, days=14),
+            "return_date": start + timedelta(hours=n, days=7),
+        }
+        for n in range(HISTORY_SIZE)
+    ]
+    loans.append({
+        "user_id": user.id, "book_id": other_book.id,
+        "loan_date": start, "due_date": start + timedelta(days=14),
+    })
+    LoanRepository(Loan, db_session).create_many(loans)
+    return book, other_book, user
+
+
+def count(db: Session, statement) -> int:
+    return db.scalar(select(func.count()).select_from(statement.subquery()))
+
+
+def loaded_loans(db: Session) -> int:
+    return len([obj for obj in db.identity_map.values() if isinstance(obj, Loan)])
+
+
+def test_remove_book_deletes_history_without_loading_it(db_session: Session, engine, history):
+    """
+    Teste que la suppression d'un livre supprime ses emprunts et catégories
+    en quelques requêtes, sans charger un seul emprunt.
+    """
+    book, other_book, user = history
+    repository = BookRepository(Book, db_session)
+
+    with count_queries(engine) as stats:
+        deleted = repository.remove(id=book.id)
+
+    assert deleted.id == book.id
+    assert [category.name for category in deleted.categories] == ["History Category"]
+    assert stats.count <= 10
+    assert loaded_loans(db_session) == 0
+    assert count(db_session, select(Loan).where(Loan.book_id == book.id)) == 0
+    assert count(db_session, select(book_category).where(book_category.c.book_id == book.id)) == 0
+    assert count(db_session, select(Loan).where(Loan.book_id == other_book.id)) == 1
+    assert repository.get(id=book.id) is None
+
+
+def test_soft_delete_user_archives_history(db_session: Session, engine, history):
+    """
+    Teste la suppression logique d'un utilisateur : il disparaît des
+    requêtes, ses emprunts sont déplacés dans loan_archive en masse.
+    """
+    book, other_book, user = history
+    repository = UserRepository(User, db_session)
+
+    with count_queries(engine) as stats:
+        deleted = repository.soft_delete(id=user.id)
+
+    assert deleted.deleted_at is not None
+    assert stats.count <= 10
+    assert loaded_loans(db_session) == 0
+    assert count(db_session, select(Loan).where(Loan.user_id == user.id)) == 0
+    assert count(db_session, select(LoanArchive).where(LoanArchive.user_id == user.id)) == HISTORY_SIZE + 1
+
+    # Exclu des requêtes, sauf demande explicite (unicité de l'email)
+    assert repository.get(id=user.id) is None
+    assert repository.get_by_email(email="history@example.com") is None
+    assert repository.get_by_email(email="history@example.com", include_deleted=True).id == user.id
+    # Les livres ne sont pas touchés
+    assert BookRepository(Book, db_session).get(id=other_book.id) is not None
+
+
+def test_soft_delete_book_archives_only_its_loans(db_session: Session, history):
+    """
+    Teste que la suppression logique d'un livre n'archive que ses emprunts.
+    """
+    book, other_book, user = history
+    repository = BookRepository(Book, db_session)
+
+    repository.soft_delete(id=book.id)
+
+    assert repository.get(id=book.id) is None
+    assert repository.get_by_isbn(isbn=book.isbn, include_deleted=True) is not None
+    assert count(db_session, select(LoanArchive).where(LoanArchive.book_id == book.id)) == HISTORY_SIZE
+    assert count(db_session, select(Loan).where(Loan.user_id == user.id)) == 1
+    # Les catégories du livre supprimé logiquement sont conservées
+    assert count(db_session, select(book_category).where(book_category.c.book_id == book.id)) == 1
+
+
+def test_delete_book_route_returns_deleted_book(client, db_session: Session, auth_headers):
+    """
+    Teste que DELETE /books/{id} renvoie le livre supprimé avec ses
+    catégories, sur une session qui expire ses objets au commit.
+    """
+    headers = auth_headers("delete-admin@example.com", is_admin=True)
+    db_session.add(Book(
+        title="Deleted", author="Author", isbn="4440000000003", publication_year=2000,
+        quantity=1, categories=[Category(name="Deleted Category")]
+    ))
+    db_session.commit()
+    book_id = db_session.scalar(select(Book.id).where(Book.isbn == "4440000000003"))
+    # Nouvelle requête : aucun objet du test ne reste dans la session
+    db_session.expunge_all()
+
+    response = client.delete(f"/api/v1/books/{book_id}", headers=headers)
+    assert response.status_code == 200
+    assert [category["name"] for category in response.json()["categories"]] == ["Deleted Category"]
+    assert db_session.get(Book, book_id) is None
@@ -1,7 +1,9 @@
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from src.models.users import User
+from src.repositories.base import lookup_statement
 from src.repositories.users import UserRepository
 
 def test_create_user(db_session: Session):
@@ -62,4 +64,26 @@ def test_update_user(db_session: Session):
     )
     
     assert updated_user.full_name == "Updated Name"
-    assert updated_user.is_active is False
\ No newline at end of file
+    assert updated_user.is_active is False
+
+def test_get_by_email_reuses_prebuilt_statement(db_session: Session):
+    """
+    Teste que la recherche par email exécute la requête construite une fois,
+    sans réécriture par le filtre de suppression logique, et exclut bien les
+    utilisateurs supprimés.
+    """
+    repository = UserRepository(User, db_session)
+    user = repository.create(obj_in={
+        "email": "prebuilt@example.com", "hashed_password": "x", "full_name": "Prebuilt"
+    })
+    statements = []
+    event.listen(db_session, "do_orm_execute", lambda state: statements.append(state.statement))
+
+    assert repository.get_by_email(email="prebuilt@example.com").id == user.id
+    assert repository.get_by_email(email="prebuilt@example.com").id == user.id
+    assert statements == [lookup_statement(User, "email", False)] * 2
+
+    repository.soft_delete(id=user.id)
+    assert repository.get_by_email(email="prebuilt@example.com") is None
+    assert repository.get(id=user.id) is None
+    assert repository.get_by_email(email="prebuilt@example.com", include_deleted=True).id == user.id
@@ -0,0 +1,68 @@
+import gzip
+
+import brotli
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.models.books import Book
+from src.utils.compression import StreamCompressor, choose_encoding, compressible
+
+
+def test_choose_encoding_and_content_types():
+    """
+    Teste la négociation de l'encodage et la liste des types compressés.
+    """
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("gzip;q=1.0, br;q=0.5") == "gzip"
+    assert choose_encoding("br;q=0, gzip") == "gzip"
+    assert choose_encoding("*") == "br"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("") is None
+
+    types = ["application/json", "text/"]
+    assert compressible("application/json", types)
+    assert compressible("text/html; charset=utf-8", types)
+    assert not compressible("application/json-seq", types)
+    assert not compressible("image/png", types)
+
+    compressor = StreamCompressor("gzip")
+    data = compressor.compress(b"a" * 1000) + compressor.compress(b"b" * 1000) + compressor.finish()
+    assert gzip.decompress(data) == b"a" * 1000 + b"b" * 1000
+
+
+def test_api_responses_are_compressed(client, db_session: Session, auth_headers):
+    """
+    Teste qu'une grande page de livres est compressée selon Accept-Encoding,
+    et qu'une petite réponse ne l'est pas.
+    """
+    headers = auth_headers("compression@example.com")
+    db_session.add_all([
+        Book(title=f"Compressed {i}", author="Author", isbn=f"55500011100{i:02d}",
+             publication_year=2000, quantity=1, description="Description " * 50)
+        for i in range(20)
+    ])
+    db_session.commit()
+
+    plain = client.get("/api/v1/books/", headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+    for encoding, decompress in (("gzip", gzip.decompress), ("br", brotli.decompress)):
+        response = client.get("/api/v1/books/", headers={**headers, "Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["vary"] == "Accept-Encoding"
+        # httpx décode la réponse : on compare aussi la taille transmise
+        assert response.json() == plain.json()
+        assert int(response.headers["content-length"]) < len(plain.content) / 5
+
+    small = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_compression_can_be_disabled(client, monkeypatch):
+    """
+    Teste que COMPRESSION=False désactive la compression.
+    """
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 0)
+    assert client.get("/", headers={"Accept-Encoding": "gzip"}).headers["content-encoding"] == "gzip"
+    monkeypatch.setattr(settings, "COMPRESSION", False)
+    assert "content-encoding" not in client.get("/", headers={"Accept-Encoding": "gzip"}).headers
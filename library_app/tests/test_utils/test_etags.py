@@ -0,0 +1,107 @@
+from sqlalchemy.orm import Session
+
+from src.models.books import Book
+from src.models.categories import Category
+from src.models.versions import MODIFIED_TABLES_KEY, read_versions
+from src.utils.etags import etag_matches, make_etag
+from src.utils.profiling import count_queries
+
+
+def new_book(isbn: str) -> Book:
+    return Book(title="ETag", author="Author", isbn=isbn, publication_year=2000, quantity=1)
+
+
+def test_versions_bumped_once_per_commit(db_session: Session):
+    """
+    Teste que la version d'une table augmente d'un à chaque commit qui la
+    modifie (flush, UPDATE en masse, relation plusieurs-à-plusieurs), et pas
+    pour une transaction annulée.
+    """
+    tables = ("book", "category", "book_category")
+    before = read_versions(db_session, tables)
+
+    book = new_book("9990001110001")
+    db_session.add(book)
+    db_session.flush()
+    book.quantity = 2
+    db_session.commit()
+    after_insert = read_versions(db_session, tables)
+    assert after_insert == {**before, "book": before["book"] + 1}
+
+    book.categories.append(Category(name="ETag"))
+    db_session.commit()
+    after_category = read_versions(db_session, tables)
+    assert after_category["category"] == before["category"] + 1
+    assert after_category["book_category"] == before["book_category"] + 1
+
+    db_session.query(Book).filter(Book.id == book.id).update({"quantity": 3})
+    db_session.commit()
+    assert read_versions(db_session, tables)["book"] == after_category["book"] + 1
+
+    # Une transaction annulée oublie les tables qu'elle a modifiées
+    db_session.query(Book).filter(Book.id == book.id).update({"quantity": 4})
+    assert db_session.info[MODIFIED_TABLES_KEY] == {"book"}
+    db_session.rollback()
+    assert MODIFIED_TABLES_KEY not in db_session.info
+
+
+def test_etag_matching():
+    """
+    Teste la comparaison faible des ETags et leur dépendance aux versions.
+    """
+    etag = make_etag({"book": 3})
+    assert etag.startswith('W/"')
+    assert etag != make_etag({"book": 4})
+    assert etag_matches(etag, etag)
+    assert etag_matches('"other", ' + etag[2:], etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('W/"other"', etag)
+
+
+def test_conditional_get_on_books(client, db_session: Session, engine, auth_headers):
+    """
+    Teste qu'un GET avec l'ETag courant renvoie 304 sans lire les livres,
+    et qu'une écriture change l'ETag.
+    """
+    headers = auth_headers("etag@example.com")
+    db_session.add(new_book("9990001110002"))
+    db_session.commit()
+
+    response = client.get("/api/v1/books/", headers=headers)
+    etag = response.headers["etag"]
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    with count_queries(engine) as stats:
+        response = client.get("/api/v1/books/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert not any("FROM book" in shape for shape in stats.shapes)
+
+    # Même version pour une page ou une vue différente : l'ETag vaut par URL
+    assert client.get("/api/v1/books/?view=summary", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    db_session.add(new_book("9990001110003"))
+    db_session.commit()
+    response = client.get("/api/v1/books/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["total"] == 2
+
+
+def test_conditional_get_on_stats(client, db_session: Session, auth_headers):
+    """
+    Teste les GET conditionnels sur les statistiques, après l'authentification.
+    """
+    headers = auth_headers("etag-admin@example.com", is_admin=True)
+
+    etag = client.get("/api/v1/stats/general", headers=headers).headers["etag"]
+    assert client.get("/api/v1/stats/general", headers={**headers, "If-None-Match": etag}).status_code == 304
+    # Sans authentification : 401, pas 304
+    assert client.get("/api/v1/stats/general", headers={"If-None-Match": etag}).status_code == 401
+
+    db_session.add(new_book("9990001110004"))
+    db_session.commit()
+    assert client.get("/api/v1/stats/general", headers={**headers, "If-None-Match": etag}).status_code == 200
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from src.models.books import Book
+from src.models.categories import Category
+from src.models.loans import Loan
+from src.models.users import User
+from src.utils.profiling import count_queries
+
+
+def add_books(db_session: Session) -> list:
+    category = Category(name="Fields")
+    books = [
+        Book(title=f"Fields {i}", author="Author", isbn=f"66600011100{i:02d}", publication_year=2000,
+             quantity=i, description="Long " * 100, categories=[category])
+        for i in range(3)
+    ]
+    db_session.add_all(books)
+    db_session.commit()
+    return books
+
+
+def selects(stats) -> list:
+    return [shape for shape in stats.shapes if shape.upper().startswith("SELECT")]
+
+
+def test_books_fields_projects_columns(client, db_session: Session, engine, auth_headers):
+    """
+    Teste que `fields=` ne lit en base et ne renvoie que les colonnes demandées.
+    """
+    headers = auth_headers("fields@example.com")
+    books = add_books(db_session)
+
+    with count_queries(engine) as stats:
+        response = client.get("/api/v1/books/?fields=quantity,id,title&sort_by=isbn", headers=headers)
+
+    assert response.status_code == 200
+    page = response.json()
+    assert page["total"] == 3
+    assert page["items"] == [{"id": book.id, "title": book.title, "quantity": book.quantity} for book in books]
+    assert any(shape.startswith("SELECT book.") for shape in selects(stats))
+    assert not any("book.description" in shape for shape in selects(stats))
+    assert not any("book_category" in shape for shape in selects(stats))
+
+
+def test_books_fields_with_relationship_and_derived_field(client, db_session: Session, engine, auth_headers):
+    """
+    Teste qu'une relation demandée est chargée (en une requête) et qu'un
+    champ calculé (popularity) reste disponible.
+    """
+    headers = auth_headers("fields-relations@example.com")
+    add_books(db_session)
+
+    with count_queries(engine) as stats:
+        items = client.get("/api/v1/books/?fields=title,categories", headers=headers).json()["items"]
+
+    assert [list(item) for item in items] == [["title", "categories"]] * 3
+    assert items[0]["categories"][0]["name"] == "Fields"
+    assert not any("book.description" in shape for shape in selects(stats))
+    assert sum("book_category" in shape for shape in selects(stats)) == 1
+
+    items = client.get("/api/v1/books/?fields=id,popularity", headers=headers).json()["items"]
+    assert all(set(item) == {"id", "popularity"} for item in items)
+
+
+def test_fields_rejects_unknown_or_private_fields(client, db_session: Session, auth_headers):
+    """
+    Teste qu'un champ absent du schéma de réponse est refusé (400).
+    """
+    headers = auth_headers("fields-admin@example.com", is_admin=True)
+
+    assert client.get("/api/v1/books/?fields=id,nope", headers=headers).status_code == 400
+    assert client.get("/api/v1/users/?fields=id,hashed_password", headers=headers).status_code == 400
+
+
+def test_users_and_loans_fields(client, db_session: Session, auth_headers):
+    """
+    Teste `fields=` sur les listes d'utilisateurs et d'emprunts.
+    """
+    headers = auth_headers("fields-lists@example.com", is_admin=True)
+    user = db_session.query(User).filter(User.email == "fields-lists@example.com").one()
+    book = add_books(db_session)[0]
+    loan_date = datetime(2024, 1, 2)
+    loan = Loan(user_id=user.id, book_id=book.id, loan_date=loan_date, due_date=loan_date + timedelta(days=14))
+    db_session.add(loan)
+    db_session.commit()
+
+    users = client.get("/api/v1/users/?fields=email,id", headers=headers).json()
+    assert users == [{"email": "fields-lists@example.com", "id": user.id}]
+
+    loans = client.get("/api/v1/loans/?fields=id,due_date", headers=headers).json()
+    assert loans == [{"id": loan.id, "due_date": "2024-01-16T00:00:00"}]
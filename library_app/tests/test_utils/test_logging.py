@@ -0,0 +1,64 @@
+import json
+import logging
+
+from sqlalchemy import create_engine, text
+
+from src.config import settings
+from src.utils.logging import JsonFormatter, RequestIdFilter, instrument_engine, request_id_var
+
+
+def test_json_formatter_includes_request_id_and_extra():
+    """
+    Teste le format JSON des enregistrements et la propagation du request_id.
+    """
+    record = logging.LogRecord("library.test", logging.INFO, __file__, 1, "Bonjour %s", ("monde",), None)
+    record.duration_ms = 1.5
+
+    token = request_id_var.set("abc123")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    data = json.loads(JsonFormatter().format(record))
+    assert data["message"] == "Bonjour monde"
+    assert data["level"] == "INFO"
+    assert data["request_id"] == "abc123"
+    assert data["duration_ms"] == 1.5
+
+
+def test_request_id_header(client):
+    """
+    Teste que chaque réponse porte un X-Request-ID, repris de la requête s'il est fourni.
+    """
+    response = client.get("/")
+    assert len(response.headers["X-Request-ID"]) == 32
+
+    response = client.get("/", headers={"X-Request-ID": "kiosk-42"})
+    assert response.headers["X-Request-ID"] == "kiosk-42"
+
+    # Un identifiant invalide est remplacé
+    response = client.get("/", headers={"X-Request-ID": "a b"})
+    assert response.headers["X-Request-ID"] != "a b"
+
+
+def test_sql_debug_logs_are_sampled(caplog, monkeypatch):
+    """
+    Teste l'échantillonnage des logs SQL de niveau DEBUG.
+    """
+    engine = create_engine("sqlite:///:memory:")
+    instrument_engine(engine)
+
+    with caplog.at_level(logging.DEBUG, logger="library.sql"):
+        monkeypatch.setattr(settings, "SQL_LOG_SAMPLE_RATE", 0.0)
+        with engine.connect() as conn:
+            for _ in range(20):
+                conn.execute(text("SELECT 1"))
+        assert not [r for r in caplog.records if r.name == "library.sql"]
+
+        monkeypatch.setattr(settings, "SQL_LOG_SAMPLE_RATE", 1.0)
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        records = [r for r in caplog.records if r.name == "library.sql"]
+        assert len(records) == 1
+        assert records[0].statement == "SELECT 1"
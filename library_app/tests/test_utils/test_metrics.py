@@ -0,0 +1,48 @@
+from src.utils.metrics import MetricsRegistry
+
+
+def test_registry_renders_prometheus_text():
+    """
+    Teste le format texte des compteurs, jauges et histogrammes.
+    """
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requêtes.", ("route", "status"))
+    in_flight = registry.gauge("in_flight", "En cours.")
+    latency = registry.histogram("latency_seconds", "Latence.", ("route",), buckets=(0.1, 1.0))
+
+    requests.inc(route="/books/", status=200)
+    requests.inc(2, route="/books/", status=200)
+    requests.inc(route='/a"b', status=404)
+    in_flight.inc()
+    latency.observe(0.05, route="/books/")
+    latency.observe(0.5, route="/books/")
+    latency.observe(3, route="/books/")
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/books/",status="200"} 3' in text
+    assert 'requests_total{route="/a\\"b",status="404"} 1' in text
+    assert "in_flight 1" in text
+    assert 'latency_seconds_bucket{route="/books/",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/books/",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/books/",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/books/"} 3' in text
+    assert 'latency_seconds_sum{route="/books/"} 3.55' in text
+
+
+def test_metrics_endpoint(client):
+    """
+    Teste l'exposition des métriques après quelques requêtes.
+    """
+    client.get("/")
+    client.get("/api/v1/books/999999")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'http_requests_total{method="GET",route="/",status="200"}' in text
+    assert 'http_requests_total{method="GET",route="/api/v1/books/{id}",status="401"}' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/",le="+Inf"}' in text
+    assert "http_requests_in_flight 1" in text
+    assert "threadpool_threads_total 40" in text
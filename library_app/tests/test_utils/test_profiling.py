@@ -0,0 +1,66 @@
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.models.books import Book
+from src.models.categories import Category
+from src.utils.profiling import QueryStats, fingerprint, route_query_metrics
+
+
+def test_fingerprint_normalizes_values():
+    """
+    Teste que les requêtes ne différant que par leurs valeurs ont la même empreinte.
+    """
+    assert fingerprint("SELECT * FROM book WHERE id = 12") == fingerprint("SELECT *  FROM book\nWHERE id = 7")
+    assert fingerprint("SELECT * FROM book WHERE title = 'L''Étranger'") == "SELECT * FROM book WHERE title = ?"
+    assert fingerprint("SELECT * FROM book WHERE id IN (?, ?, ?)") == "SELECT * FROM book WHERE id IN (?)"
+    assert fingerprint("SELECT book_1.id FROM book AS book_1") == "SELECT book_1.id FROM book AS book_1"
+
+    stats = QueryStats()
+    for id in range(6):
+        stats.add("SELECT * FROM category WHERE book_id = %d" % id, 0.1)
+    stats.add("UPDATE book SET quantity = 1", 0.1)
+    assert stats.count == 7
+    assert list(stats.repeated_shapes(threshold=5).values()) == [6]
+
+
+def test_query_headers_and_route_metrics(client, db_session: Session, monkeypatch, auth_headers):
+    """
+    Teste les en-têtes de diagnostic (mode DEBUG) et les agrégats par route.
+    """
+    headers = auth_headers("profiling@example.com")
+    book = Book(title="Profiling", author="Author", isbn="7770001110099", publication_year=2000, quantity=1)
+    db_session.add(book)
+    db_session.commit()
+
+    response = client.get(f"/api/v1/books/{book.id}", headers=headers)
+    assert "X-Query-Count" not in response.headers
+
+    monkeypatch.setattr(settings, "DEBUG", True)
+    response = client.get(f"/api/v1/books/{book.id}", headers=headers)
+    assert response.status_code == 200
+    assert int(response.headers["X-Query-Count"]) >= 1
+    assert float(response.headers["X-Query-Time-Ms"]) >= 0
+    assert response.headers["X-N-Plus-One"] == "0"
+
+    routes = {row["route"]: row for row in route_query_metrics.snapshot()}
+    assert routes["/api/v1/books/{id}"]["requests"] >= 2
+
+
+def test_books_list_query_budget(client, db_session: Session, query_budget, auth_headers):
+    """
+    Teste que la liste des livres ne charge pas les catégories livre par livre.
+    """
+    headers = auth_headers("budget@example.com")
+    category = Category(name="Budget")
+    db_session.add_all([
+        Book(title=f"Budget {i}", author="Author", isbn=f"77700022200{i:02d}",
+             publication_year=2000, quantity=1, categories=[category])
+        for i in range(10)
+    ])
+    db_session.commit()
+
+    # Utilisateur, versions des tables (ETag), comptage, page de livres,
+    # catégories de la page
+    with query_budget(5):
+        response = client.get("/api/v1/books/?limit=50", headers=headers)
+    assert response.status_code == 200
@@ -0,0 +1,64 @@
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from src.db.session import get_db, get_read_db
+from src.db.sqlite import apply_sqlite_pragmas, read_only_pragmas, sqlite_pragmas, sqlite_read_only_url
+from src.main import app
+
+
+def dependencies(dependant):
+    for dependency in dependant.dependencies:
+        yield dependency.call
+        yield from dependencies(dependency)
+
+
+def test_sqlite_read_only_url():
+    assert sqlite_read_only_url("sqlite:///./library.db") == "sqlite:///file:./library.db?mode=ro&uri=true"
+    assert sqlite_read_only_url("sqlite:////var/lib/library.db") == "sqlite:///file:/var/lib/library.db?mode=ro&uri=true"
+    assert sqlite_read_only_url("sqlite:///:memory:") is None
+    assert "journal_mode" not in read_only_pragmas(sqlite_pragmas("production"))
+
+
+def test_read_only_engine_sees_commits_and_rejects_writes(tmp_path):
+    """
+    Teste qu'une connexion mode=ro voit les écritures validées du pool
+    principal (WAL) mais ne peut pas écrire.
+    """
+    url = f"sqlite:///{tmp_path / 'routing.db'}"
+    pragmas = sqlite_pragmas("production")
+    writer = create_engine(url)
+    apply_sqlite_pragmas(writer, pragmas)
+    reader = create_engine(sqlite_read_only_url(url))
+    apply_sqlite_pragmas(reader, read_only_pragmas(pragmas))
+
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+
+    with reader.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 1
+        with writer.begin() as write_conn:
+            write_conn.execute(text("INSERT INTO t VALUES (2)"))
+        conn.rollback()
+        assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 2
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO t VALUES (3)"))
+
+    reader.dispose()
+    writer.dispose()
+
+
+def test_get_routes_use_the_read_pool():
+    """
+    Teste qu'aucune route GET n'emprunte une connexion au pool d'écriture.
+    """
+    get_routes = [
+        route for route in app.routes
+        if isinstance(route, APIRoute) and "GET" in route.methods
+    ]
+    assert get_routes
+    for route in get_routes:
+        assert get_db not in set(dependencies(route.dependant)), route.path
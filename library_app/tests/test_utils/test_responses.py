@@ -0,0 +1,74 @@
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from src.models.books import Book
+from src.models.categories import Category
+from src.models.loans import Loan
+from src.models.users import User
+from src.utils.responses import dumps
+
+
+def test_dumps_matches_default_encoding():
+    """
+    Teste que le sérialiseur rapide produit le même JSON que l'encodeur par défaut.
+    """
+    content = {"title": "L'Étranger", "date": datetime(2024, 5, 1, 12, 30, 15, 250), "pages": None, "score": 1.5}
+    assert json.loads(dumps(content)) == {**content, "date": "2024-05-01T12:30:15.000250"}
+    assert dumps({"é": [1, 2]}) == '{"é":[1,2]}'.encode()
+
+
+def test_books_summary_view(client, db_session: Session, auth_headers):
+    """
+    Teste que `view=summary` renvoie des livres réduits, sans catégories,
+    triés et paginés comme la vue complète, hors livres supprimés.
+    """
+    headers = auth_headers("summary@example.com")
+    category = Category(name="Summary")
+    books = [
+        Book(title=f"Summary {i}", author="Author", isbn=f"88800011100{i:02d}",
+             publication_year=2000, quantity=i, categories=[category])
+        for i in range(3)
+    ]
+    books[2].deleted_at = datetime.utcnow()
+    db_session.add_all(books)
+    db_session.commit()
+
+    full = client.get("/api/v1/books/?sort_by=isbn", headers=headers).json()
+    summary = client.get("/api/v1/books/?sort_by=isbn&view=summary", headers=headers).json()
+
+    assert summary["total"] == full["total"] == 2
+    assert summary["items"] == [
+        {"id": book.id, "title": book.title, "author": "Author", "isbn": book.isbn,
+         "publication_year": 2000, "quantity": book.quantity}
+        for book in books[:2]
+    ]
+    assert [item["id"] for item in full["items"]] == [book.id for book in books[:2]]
+    assert full["items"][0]["categories"][0]["name"] == "Summary"
+
+    search = client.get("/api/v1/books/search/?query=Summary 1&view=summary", headers=headers).json()
+    assert [item["isbn"] for item in search["items"]] == [books[1].isbn]
+
+
+def test_loans_summary_view(client, db_session: Session, auth_headers):
+    """
+    Teste que `view=summary` renvoie des emprunts réduits, dates en ISO 8601.
+    """
+    headers = auth_headers("summary-admin@example.com", is_admin=True)
+    user = User(email="summary-reader@example.com", hashed_password="x", full_name="Reader")
+    book = Book(title="Loaned", author="Author", isbn="8880002220001", publication_year=2000, quantity=1)
+    db_session.add_all([user, book])
+    db_session.flush()
+    loan_date = datetime(2024, 1, 2, 3, 4, 5)
+    loan = Loan(user_id=user.id, book_id=book.id, loan_date=loan_date, due_date=loan_date + timedelta(days=14))
+    db_session.add(loan)
+    db_session.commit()
+
+    response = client.get("/api/v1/loans/?view=summary", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json() == [{
+        "id": loan.id, "user_id": user.id, "book_id": book.id,
+        "loan_date": "2024-01-02T03:04:05", "due_date": "2024-01-16T03:04:05", "return_date": None,
+    }]
@@ -0,0 +1,179 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.models.users import User
+from src.utils import security
+from src.utils.security import PasswordHasher, PasswordHashingBusy, get_password_hash, verify_password
+
+
+def test_password_hash_and_verify():
+    """
+    Teste le hachage et la vérification via le pool de processus.
+    """
+    hashed = get_password_hash("password123")
+
+    assert hashed != "password123"
+    assert verify_password("password123", hashed)
+    assert not verify_password("wrongpassword", hashed)
+
+
+def test_password_hasher_rejects_when_saturated():
+    """
+    Teste que le pool refuse les opérations au-delà de sa capacité.
+    """
+    hasher = PasswordHasher(workers=1, queue_size=0, timeout=10)
+    try:
+        busy = threading.Thread(target=hasher.run, args=(time.sleep, 1.0))
+        busy.start()
+        time.sleep(0.2)
+
+        with pytest.raises(PasswordHashingBusy):
+            hasher.run(time.sleep, 0)
+
+        busy.join()
+        assert hasher.run(abs, -3) == 3
+    finally:
+        hasher.shutdown()
+
+
+def test_password_hasher_timeout_keeps_slot_until_done():
+    """
+    Teste qu'une opération trop lente lève PasswordHashingBusy et garde sa
+    place dans le pool jusqu'à la fin de son exécution.
+    """
+    hasher = PasswordHasher(workers=1, queue_size=0, timeout=0.2)
+    try:
+        with pytest.raises(PasswordHashingBusy):
+            hasher.run(time.sleep, 1.0)
+        # La tâche expirée occupe encore l'unique processus
+        with pytest.raises(PasswordHashingBusy):
+            hasher.run(abs, -3)
+
+        hasher.timeout = 10
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                assert hasher.run(abs, -3) == 3
+                break
+            except PasswordHashingBusy:
+                assert time.monotonic() < deadline
+                time.sleep(0.1)
+    finally:
+        hasher.shutdown()
+
+
+def test_login_returns_429_when_saturated(client, db_session: Session, monkeypatch):
+    """
+    Teste que /auth/login répond 429 quand le pool bcrypt est saturé.
+    """
+    db_session.add(User(
+        email="burst@example.com",
+        hashed_password=security.pwd_context.hash("password123"),
+        full_name="Burst User"
+    ))
+    db_session.commit()
+
+    def saturated(func, *args):
+        raise PasswordHashingBusy()
+
+    monkeypatch.setattr(security.password_hasher, "run", saturated)
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "burst@example.com", "password": "password123"}
+    )
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_current_user_is_cached_until_update(db_session: Session, monkeypatch):
+    """
+    Teste que l'utilisateur authentifié est mis en cache et invalidé à la modification.
+    """
+    from src.api.dependencies import get_current_user
+    from src.api.schemas.users import UserUpdate
+    from src.repositories.users import UserRepository
+    from src.services.users import UserService
+
+    user = User(email="principal@example.com", hashed_password="x", full_name="Principal")
+    db_session.add(user)
+    db_session.commit()
+    token = security.create_access_token(user.id)
+
+    lookups = []
+    original_get = UserRepository.get
+
+    def counting_get(self, id):
+        lookups.append(id)
+        return original_get(self, id)
+
+    monkeypatch.setattr(UserRepository, "get", counting_get)
+
+    first = get_current_user(db=db_session, token=token)
+    second = get_current_user(db=db_session, token=token)
+    assert first == second
+    assert first.id == user.id and not first.is_admin
+    assert len(lookups) == 1
+
+    service = UserService(UserRepository(User, db_session))
+    service.update(db_obj=user, obj_in=UserUpdate(is_admin=True))
+    lookups.clear()
+
+    third = get_current_user(db=db_session, token=token)
+    assert third.is_admin
+    assert len(lookups) == 1
+
+
+def test_principal_invalidated_after_commit(db_session: Session):
+    """
+    Teste que, dans un bloc unit_of_work, l'utilisateur modifié reste en
+    cache jusqu'au commit et en est retiré ensuite.
+    """
+    from src.api.dependencies import get_current_user
+    from src.api.schemas.users import UserUpdate
+    from src.db.unit_of_work import unit_of_work
+    from src.repositories.users import UserRepository
+    from src.services.users import UserService
+
+    user = User(email="uow-principal@example.com", hashed_password="x", full_name="Principal")
+    db_session.add(user)
+    db_session.commit()
+    security.invalidate_principal(user.id)
+    token = security.create_access_token(user.id)
+    assert not get_current_user(db=db_session, token=token).is_admin
+
+    def cached_ids():
+        return [principal.id for _, principal in security.principal_cache._data.values()]
+
+    service = UserService(UserRepository(User, db_session))
+    with unit_of_work(db_session):
+        service.update(db_obj=user, obj_in=UserUpdate(is_admin=True))
+        # Modification envoyée (flush) mais pas encore validée
+        assert user.id in cached_ids()
+    assert user.id not in cached_ids()
+    assert get_current_user(db=db_session, token=token).is_admin
+
+
+def test_ttl_cache_expiry_and_eviction(monkeypatch):
+    """
+    Teste l'expiration et l'éviction LRU du TTLCache.
+    """
+    from src.utils import cache
+
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    ttl_cache = cache.TTLCache(maxsize=2, ttl=10)
+
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2)
+    assert ttl_cache.get("a") == 1
+    ttl_cache.set("c", 3)
+    assert ttl_cache.get("b") is None
+    assert ttl_cache.get("a") == 1
+
+    now[0] += 11
+    assert ttl_cache.get("a") is None
+    assert len(ttl_cache) == 1
@@ -0,0 +1,78 @@
+from sqlalchemy import create_engine, text
+
+from src.config import settings
+from src.utils.logging import instrument_engine
+from src.utils.slow_queries import SlowQueryLog, redact_parameters, slow_query_log
+
+
+def test_redact_parameters():
+    """
+    Teste le masquage des paramètres des requêtes lentes.
+    """
+    assert redact_parameters(("secret@example.com", 42, None)) == ["<str:18>", 42, None]
+    assert redact_parameters({"password": "hunter22"}) == {"password": "<str:8>"}
+    assert redact_parameters([(1,), (2,)]) == {"rows": 2, "first": [1]}
+
+
+def test_slow_query_log_keeps_slowest_fingerprints():
+    """
+    Teste le regroupement par empreinte et l'éviction des empreintes les moins lentes.
+    """
+    engine = create_engine("sqlite:///:memory:")
+    log = SlowQueryLog(capacity=2, explain=False)
+    log.record(engine, "SELECT * FROM book WHERE id = ?", (1,), 150.0)
+    log.record(engine, "SELECT * FROM book WHERE id = ?", (2,), 300.0)
+    log.record(engine, "SELECT * FROM loan", (), 120.0)
+    log.record(engine, "SELECT * FROM user WHERE email = ?", ("a@b.c",), 200.0)
+
+    entries = log.snapshot()
+    assert [entry["max_ms"] for entry in entries] == [300.0, 200.0]
+    assert entries[0]["count"] == 2
+    assert entries[0]["parameters"] == [2]
+    assert entries[1]["parameters"] == ["<str:5>"]
+
+
+def test_slow_query_plan_matches_kept_parameters(monkeypatch):
+    """
+    Teste que le plan conservé est celui de l'exécution la plus lente, dont
+    les paramètres sont aussi conservés.
+    """
+    engine = create_engine("sqlite:///:memory:")
+    log = SlowQueryLog(capacity=10)
+    monkeypatch.setattr(SlowQueryLog, "_explain", staticmethod(lambda engine, statement, parameters: [repr(parameters)]))
+
+    log.record(engine, "SELECT * FROM book WHERE id = ?", (1,), 150.0)
+    log.wait()
+    assert log.snapshot()[0]["plan"] == ["(1,)"]
+
+    log.record(engine, "SELECT * FROM book WHERE id = ?", (2,), 300.0)
+    log.record(engine, "SELECT * FROM book WHERE id = ?", (3,), 100.0)
+    log.wait()
+    entry = log.snapshot()[0]
+    assert entry["parameters"] == [2]
+    assert entry["plan"] == ["(2,)"]
+
+
+def test_slow_query_plan_is_captured(tmp_path, monkeypatch):
+    """
+    Teste la capture du plan d'exécution d'une requête lente, hors du chemin critique.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    instrument_engine(engine)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("CREATE INDEX idx_item_name ON item (name)"))
+
+    slow_query_log.reset()
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", -1)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT id FROM item WHERE name = :name"), {"name": "secret"})
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 100.0)
+    slow_query_log.wait()
+
+    entry = next(e for e in slow_query_log.snapshot() if "FROM item" in e["fingerprint"])
+    assert entry["parameters"] == ["<str:6>"]
+    assert any("idx_item_name" in line for line in entry["plan"])
+    # Les requêtes d'explication ne sont pas elles-mêmes consignées
+    assert not any(e["fingerprint"].startswith("EXPLAIN") for e in slow_query_log.snapshot())
+    slow_query_log.reset()
@@ -0,0 +1,32 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.db.sqlite import apply_sqlite_pragmas, sqlite_pragmas
+
+
+def test_production_profile_is_applied_on_connect(tmp_path):
+    """
+    Teste que les PRAGMA du profil sont appliqués à chaque connexion.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    apply_sqlite_pragmas(engine, sqlite_pragmas("production", {"busy_timeout": 1234}))
+
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -20000
+    engine.dispose()
+
+
+def test_invalid_profiles_are_rejected():
+    """
+    Teste le rejet des profils inconnus et des PRAGMA mal formés.
+    """
+    assert sqlite_pragmas("default") == {}
+    with pytest.raises(ValueError):
+        sqlite_pragmas("turbo")
+    with pytest.raises(ValueError):
+        sqlite_pragmas("default", {"journal_mode": "WAL; DROP TABLE book"})
@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import sessionmaker
+
+from src.db.unit_of_work import unit_of_work
+from src.models.base import Base
+from src.models.books import Book
+from src.models.loans import Loan
+from src.models.tokens import RefreshToken
+from src.models.users import User
+from src.repositories.books import BookRepository
+from src.repositories.loans import LoanRepository
+from src.repositories.tokens import RefreshTokenRepository
+from src.repositories.users import UserRepository
+from src.services.loans import LoanService
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'uow.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def count_commits(session):
+    commits = []
+    event.listen(session, "after_commit", lambda s: commits.append(1))
+    return commits
+
+
+def new_book(isbn: str, quantity: int = 1) -> dict:
+    return {"title": "UoW", "author": "Author", "isbn": isbn, "publication_year": 2000, "quantity": quantity}
+
+
+def test_repositories_flush_and_commit_once(session_factory):
+    """
+    Teste que les écritures d'un bloc (même imbriqué) sont validées par un
+    seul commit, à la sortie du bloc extérieur.
+    """
+    with session_factory() as db:
+        commits = count_commits(db)
+        repository = BookRepository(Book, db)
+        with unit_of_work(db):
+            book = repository.create(obj_in=new_book("U1"))
+            assert book.id is not None and book.created_at is not None
+            with unit_of_work(db):
+                repository.update(db_obj=book, obj_in={"quantity": 3})
+            repository.create(obj_in=new_book("U2"))
+            assert commits == []
+        assert len(commits) == 1
+
+    with session_factory() as db:
+        assert db.scalars(select(Book.isbn).order_by(Book.isbn)).all() == ["U1", "U2"]
+        assert db.scalar(select(Book.quantity).where(Book.isbn == "U1")) == 3
+
+
+def test_exception_rolls_back_whole_unit(session_factory):
+    """
+    Teste qu'une exception dans le bloc annule toutes ses écritures.
+    """
+    with session_factory() as db:
+        repository = BookRepository(Book, db)
+        with pytest.raises(ValueError):
+            with unit_of_work(db):
+                repository.create(obj_in=new_book("U3"))
+                raise ValueError("Opération refusée")
+        # La session reste utilisable hors du bloc
+        repository.create(obj_in=new_book("U4"))
+
+    with session_factory() as db:
+        assert db.scalars(select(Book.isbn)).all() == ["U4"]
+
+
+def test_cache_invalidated_after_commit(session_factory):
+    """
+    Teste que le cache des livres est invalidé au commit du bloc, et non au
+    flush : une entrée remise en cache pendant le bloc ne survit pas au commit.
+    """
+    from src.utils import cache
+
+    key = "src.repositories.books.get_stats:concurrent"
+    with session_factory() as db:
+        repository = BookRepository(Book, db)
+        with unit_of_work(db):
+            repository.create(obj_in=new_book("U5"))
+            # Lecteur concurrent entre le flush et le commit
+            cache.cache_store[key] = (float("inf"), {"unique_books": 0})
+            repository.create(obj_in=new_book("U6"))
+            assert key in cache.cache_store
+        assert key not in cache.cache_store
+
+        # Hors d'un bloc, l'invalidation suit le commit du repository
+        cache.cache_store[key] = (float("inf"), {"unique_books": 2})
+        repository.create(obj_in=new_book("U7"))
+        assert key not in cache.cache_store
+
+
+def test_return_loan_commits_once(session_factory):
+    """
+    Teste que le retour d'un emprunt (emprunt et stock) ne fait qu'un commit.
+    """
+    with session_factory() as db:
+        user = User(email="uow@example.com", hashed_password="x", full_name="UoW")
+        book = Book(**new_book("U5", quantity=0))
+        db.add_all([user, book])
+        db.flush()
+        loan = Loan(
+            user_id=user.id, book_id=book.id,
+            loan_date=datetime.utcnow(), due_date=datetime.utcnow() + timedelta(days=14),
+        )
+        db.add(loan)
+        db.commit()
+
+        service = LoanService(LoanRepository(Loan, db), BookRepository(Book, db), UserRepository(User, db))
+        commits = count_commits(db)
+        returned = service.return_loan(loan_id=loan.id)
+        assert len(commits) == 1
+        assert returned.return_date is not None
+        assert db.get(Book, book.id).quantity == 1
+
+
+def test_token_rotation_joins_unit_of_work(session_factory):
+    """
+    Teste qu'une rotation de jeton dans un bloc annulé ne valide ni la
+    révocation de l'ancien jeton ni l'émission du nouveau.
+    """
+    expires_at = datetime.utcnow() + timedelta(days=1)
+    with session_factory() as db:
+        user = UserRepository(User, db).create(obj_in={
+            "email": "rotate@example.com", "hashed_password": "x", "full_name": "Rotate"
+        })
+        repository = RefreshTokenRepository(RefreshToken, db)
+        repository.add(user_id=user.id, token_hash="a" * 64, expires_at=expires_at)
+
+        with pytest.raises(ValueError):
+            with unit_of_work(db):
+                assert repository.rotate(
+                    token_hash="a" * 64, user_id=user.id, new_token_hash="b" * 64, expires_at=expires_at
+                ) is not None
+                raise ValueError("Opération refusée")
+
+    with session_factory() as db:
+        assert db.scalar(select(RefreshToken.revoked_at).where(RefreshToken.token_hash == "a" * 64)) is None
+        assert db.scalar(select(RefreshToken.id).where(RefreshToken.token_hash == "b" * 64)) is None
@@ -0,0 +1,146 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import IntegrityError
+
+from src.db.writer import WriteCoordinator, run_write
+from src.models.base import Base
+from src.models.books import Book
+from src.utils.metrics import db_write_batch_size
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'writer.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return url
+
+
+def add_book(isbn: str, fail: bool = False, rollback: bool = False):
+    """
+    Opération d'écriture telle qu'un repository la ferait (add, commit, refresh).
+    """
+    def operation(session):
+        book = Book(title="Writer", author="Author", isbn=isbn, publication_year=2000, quantity=1)
+        session.add(book)
+        session.commit()
+        session.refresh(book)
+        if rollback:
+            session.rollback()
+        if fail:
+            raise ValueError("Opération refusée")
+        return book.id
+    return operation
+
+
+def stored_isbns(url):
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        isbns = conn.execute(select(Book.isbn).order_by(Book.isbn)).scalars().all()
+    engine.dispose()
+    return isbns
+
+
+def test_batch_commits_together_with_per_operation_errors(database_url):
+    """
+    Teste qu'un lot est validé en une transaction et que chaque requête
+    reçoit son propre résultat ou sa propre erreur.
+    """
+    coordinator = WriteCoordinator(create_engine(database_url), max_wait_ms=200)
+    operations = [
+        add_book("W1"),
+        add_book("W2", fail=True),
+        add_book("W3"),
+        add_book("W1"),  # doublon : IntegrityError au flush
+        add_book("W4", rollback=True),
+        add_book("W5"),
+    ]
+    batches = db_write_batch_size.get_count()
+    try:
+        with ThreadPoolExecutor(len(operations)) as executor:
+            futures = [executor.submit(coordinator.submit, operation) for operation in operations]
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except Exception as e:
+                outcomes.append(type(e))
+    finally:
+        coordinator.stop()
+
+    assert isinstance(outcomes[0], int) and isinstance(outcomes[2], int) and isinstance(outcomes[5], int)
+    assert outcomes[1] is ValueError
+    assert outcomes[3] is IntegrityError
+    assert stored_isbns(database_url) == ["W1", "W3", "W5"]
+    # Toutes les opérations soumises pendant l'attente tiennent dans un lot
+    assert db_write_batch_size.get_count() - batches <= 2
+
+
+def test_run_write_without_coordinator_uses_request_session(db_session):
+    """
+    Teste que run_write exécute l'opération sur la session de la requête
+    quand WRITE_COORDINATOR est désactivé.
+    """
+    book_id = run_write(db_session, add_book("9781111111111"))
+    assert db_session.get(Book, book_id).isbn == "9781111111111"
+
+
+def test_write_routes_go_through_run_write(client, db_session, auth_headers, monkeypatch):
+    """
+    Teste que toutes les routes d'écriture passent par run_write : avec
+    WRITE_COORDINATOR, aucune n'écrit sur la session de la requête.
+    """
+    from sqlalchemy.orm import sessionmaker
+
+    from src.config import settings
+    from src.db import writer
+    from src.models.users import User
+    from src.utils.security import pwd_context
+
+    # Coordinateur de test : une session par opération, fermée ensuite
+    # (les objets retournés sont détachés, comme avec le thread écrivain)
+    session_factory = sessionmaker(
+        bind=db_session.connection(), join_transaction_mode="create_savepoint", expire_on_commit=False
+    )
+    operations = []
+
+    class InlineCoordinator:
+        def submit(self, operation, timeout=None):
+            operations.append(operation)
+            with session_factory() as session:
+                result = operation(session)
+                session.commit()
+                return result
+
+    monkeypatch.setattr(settings, "WRITE_COORDINATOR", True)
+    monkeypatch.setattr(writer, "get_write_coordinator", InlineCoordinator)
+    headers = auth_headers("writer-admin@example.com", is_admin=True)
+    db_session.add(User(email="writer@example.com", hashed_password=pwd_context.hash("password123"), full_name="Writer"))
+    db_session.commit()
+
+    book = client.post("/api/v1/books/", headers=headers, json={
+        "title": "Writer", "author": "Author", "isbn": "9782222222222", "publication_year": 2000, "quantity": 1
+    })
+    assert book.status_code == 201
+    assert client.delete(f"/api/v1/books/{book.json()['id']}", headers=headers).json()["isbn"] == "9782222222222"
+    assert client.delete(f"/api/v1/books/{book.json()['id']}", headers=headers).status_code == 404
+
+    user = client.post("/api/v1/users/", headers=headers, json={
+        "email": "created@example.com", "full_name": "Created", "password": "password123"
+    })
+    assert user.status_code == 201
+    user_id = user.json()["id"]
+    assert client.put(f"/api/v1/users/{user_id}", headers=headers, json={"full_name": "Renamed"}).json()["full_name"] == "Renamed"
+    assert client.delete(f"/api/v1/users/{user_id}", headers=headers).status_code == 200
+
+    tokens = client.post("/api/v1/auth/login", data={"username": "writer@example.com", "password": "password123"}).json()
+    refreshed = client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert refreshed.status_code == 200
+    assert client.post("/api/v1/auth/logout", json={"refresh_token": refreshed.json()["refresh_token"]}).status_code == 204
+    # Jeton déjà utilisé : erreur retournée par l'opération, révocations conservées
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+    assert len(operations) == 10